@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 import logfire
 from fastapi import FastAPI
@@ -7,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 from sqlalchemy import text
 
+from api.routers.articles import router as articles_router
 from api.routers.auth import router as auth_router, oauth_router
 from api.routers.chat import router as chat_router
 from api.routers.contact import router as contact_router
@@ -20,6 +22,9 @@ from core.middleware import (
     RequestSizeLimitMiddleware,
     SecurityHeadersMiddleware,
 )
+from core.services.extraction_pool import shutdown_executor, warm_executor
+from core.services.scheduler import get_featured_scheduler
+from core.services.web_discovery import WebDiscovery
 
 from db import async_engine, create_all, seed_feature_presets
 from settings import settings
@@ -75,9 +80,19 @@ async def lifespan(app: FastAPI):
     # Ensure database schema and seeds are initialized (idempotent)
     await create_all()
     await seed_feature_presets()
+    # Launch warm browsers once instead of per crawl call, and spawn
+    # extraction workers alongside rather than on the first crawl
+    web_discovery = WebDiscovery()
+    await asyncio.gather(web_discovery.start(), warm_executor())
+    # Featured generation runs on a timer on the elected leader worker
+    scheduler = get_featured_scheduler()
+    scheduler.start()
     try:
         yield
     finally:
+        await scheduler.stop()
+        await web_discovery.close()
+        shutdown_executor()
         await async_engine.dispose()
 
 
@@ -111,6 +126,7 @@ app.include_router(auth_router)
 app.include_router(oauth_router)
 app.include_router(contact_router)
 app.include_router(featured_router)
+app.include_router(articles_router)
 
 # Protected routes (require authentication)
 app.include_router(chat_router)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import base64
+from typing import Optional
+from urllib.parse import urlparse
+from uuid import UUID
+
+from api.routers.models.responses import ArticleSearchItem, ArticleSearchResponse
+from core.repositories import ArticleRepository
+from db import AsyncSessionLocal
+from fastapi import APIRouter, HTTPException, Query
+
+router = APIRouter(prefix="/api/articles", tags=["articles"])
+
+
+def _encode_cursor(score: float, article_id: UUID) -> str:
+    raw = f"{score!r}:{article_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[float, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        score, article_id = raw.split(":", 1)
+        return float(score), UUID(article_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+@router.get("/search", response_model=ArticleSearchResponse)
+async def search_articles(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+) -> ArticleSearchResponse:
+    """Search stored articles, accent-insensitive, with keyset pagination."""
+    after = _decode_cursor(cursor) if cursor else None
+    async with AsyncSessionLocal() as session:
+        hits = await ArticleRepository(session).search(
+            q.strip(), limit=limit, after=after, category=category
+        )
+    items = [
+        ArticleSearchItem(
+            id=h.id,
+            title=h.title,
+            url=h.url,
+            image_url=h.image_url,
+            summary=h.summary,
+            source=urlparse(h.url).hostname or "",
+            category=h.category,
+            published_at=h.published_at,
+            score=h.score,
+        )
+        for h in hits
+    ]
+    next_cursor = _encode_cursor(hits[-1].score, hits[-1].id) if len(hits) == limit else None
+    return ArticleSearchResponse(items=items, next_cursor=next_cursor)
@@ -4,6 +4,7 @@ import asyncio
 from datetime import datetime, timezone
 from typing import Any, Dict
 
+from core.services.web_discovery import WebDiscovery
 from db import async_engine
 from fastapi import APIRouter, HTTPException, status
 from loguru import logger
@@ -80,8 +81,8 @@ async def detailed_health() -> DetailedHealthStatus:
         checks["database"] = {"status": "unhealthy", "error": str(e)}
         overall_status = "unhealthy"
 
-    # Memory and system checks could go here in the future
-    # For MVP, we'll keep it simple
+    # In-process crawl/search counters (pool, caches, coalesced calls)
+    checks["web_discovery"] = WebDiscovery().stats()
 
     current_time = datetime.now(timezone.utc)
     uptime = (current_time - startup_time).total_seconds()
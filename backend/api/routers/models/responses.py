@@ -1,3 +1,5 @@
+from datetime import datetime
+from typing import Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -7,3 +9,21 @@ class ConversationHistoryResponse(BaseModel):
     conversation_id: UUID
     # Use JSON-safe dicts to avoid bytes serialization issues
     messages: list[dict]
+
+
+class ArticleSearchItem(BaseModel):
+    id: UUID
+    title: str
+    url: str
+    image_url: Optional[str] = None
+    summary: str
+    source: str
+    category: Optional[str] = None
+    published_at: Optional[datetime] = None
+    score: float
+
+
+class ArticleSearchResponse(BaseModel):
+    items: list[ArticleSearchItem]
+    # Opaque keyset cursor for the next page; absent on the last page
+    next_cursor: Optional[str] = None
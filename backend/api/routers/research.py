@@ -115,7 +115,9 @@ async def run_research(payload: ResearchRequest, current_user: CurrentUser) -> S
                 # Step 2: Get content from top results
                 urls = [sr.url for sr in search_results[:3] if sr.url]
                 if urls:
-                    crawled_content = await web_discovery.crawl(urls=urls, pruned=True, ignore_images=True)
+                    crawled_content = await web_discovery.crawl(
+                        urls=urls, pruned=True, ignore_images=True, polite=False
+                    )
                     
                     # Step 3: Generate research report using basic model
                     model = settings.model
@@ -3,7 +3,8 @@ from pydantic_ai import Agent, RunContext
 
 from core.agents.chat.deps import ChatDeps
 from core.agents.chat.prompts import system_prompt
-from core.tools.search import fetch_url, search
+from core.services.retrieval import retrieve
+from core.tools.search import fetch_url, search_saved_articles
 from settings import settings
 
 # TODO: Improve the citation method to reduce the token usage.
@@ -42,7 +43,8 @@ async def search_web(query: str, n: int) -> list:
         n: Number of results to return. Increase this for complex topics.
     """
     logger.debug(f'Searching web for "{query}" with {n} results')
-    results = await search(query, n)
+    # Stored articles answer known stories without Brave or a crawl
+    results = await retrieve(query, n)
     return [w.model_dump() for w in results]
 
 
@@ -62,3 +64,20 @@ async def fetch_url_content(urls: list[str]) -> list[dict]:
     logger.debug(f"Fetching content from {len(urls)} URLs: {urls}")
     results = await fetch_url(urls, pruned=False)
     return results
+
+
+@chat_agent.tool_plain(
+    docstring_format="google",
+    require_parameter_descriptions=True,
+    retries=2,
+)
+async def search_saved(query: str, k: int) -> list[dict]:
+    """Semantic search over news articles already stored by the app
+
+    Args:
+        query: The topic or question to look for. Matches by meaning, so
+            paraphrases and related wording work.
+        k: Number of articles to return.
+    """
+    logger.debug(f'Searching saved articles for "{query}" ({k} results)')
+    return await search_saved_articles(query, k)
@@ -11,6 +11,9 @@ CONTENT RETRIEVAL TOOLS:
 1. search_web: Use when you need to find recent information or when the user
    asks about topics without providing specific URLs.
 2. fetch_url_content: Use when the user provides specific URLs they want analyzed.
+3. search_saved: Use to look up news the app has already collected; it is
+   instant and needs no web request. Prefer search_web when results are
+   missing or too old for the question.
 
 
 WHEN TO USE BOTH TOOLS:
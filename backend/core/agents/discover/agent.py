@@ -1,15 +1,27 @@
-import json
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from time import monotonic
 from typing import Optional
 
 import logfire
 from crawl4ai.deep_crawling import BFSDeepCrawlStrategy
 from crawl4ai.deep_crawling.filters import FilterChain, URLPatternFilter
+from loguru import logger
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 
-from core.agents.discover.prompts import discover_system_prompt
+from core.agents.discover.prompts import discover_batch_prompt, discover_system_prompt
+from core.repositories import ArticleRepository
+from core.services.crawl_scheduler import same_host
+from core.services.dedup import NearDuplicateFilter, parse_simhash, simhashes
+from core.services.extraction_pool import run_cpu_bound
+from core.services.feeds import FeedValidators
 from core.services.llm_invoker import llm_invoker
+from core.services.prompt_packer import PackedItems, compact_json, estimate_tokens, pack_items
+from core.services.seen_urls import get_seen_url_index
 from core.services.web_discovery import CrawlResult, WebDiscovery
+from db import AsyncSessionLocal
 from settings import settings
 
 
@@ -24,6 +36,30 @@ class SelectionResult(BaseModel):
     selected_articles: list[SelectedArticle]
 
 
+class SourceSelection(BaseModel):
+    source_id: int
+    selected_articles: list[SelectedArticle]
+
+
+class BatchSelectionResult(BaseModel):
+    sources: list[SourceSelection]
+
+
+discover_agent = Agent(
+    settings.discover_model,
+    output_type=SelectionResult,
+    retries=3,
+    name="discover_agent",
+)
+
+discover_batch_agent = Agent(
+    settings.discover_model,
+    output_type=BatchSelectionResult,
+    retries=3,
+    name="discover_batch_agent",
+)
+
+
 @logfire.instrument("discover.deep_crawl")
 async def deep_crawl(
     url: str,
@@ -56,6 +92,83 @@ async def deep_crawl(
     return results
 
 
+@logfire.instrument("discover.incremental_crawl")
+async def incremental_crawl(
+    url: str,
+    max_pages: int = 50,
+    patterns: Optional[list[str]] = None,
+    feeds: Optional[list[str]] = None,
+) -> tuple[list[CrawlResult], FeedValidators]:
+    """Fetch only the article links of a source that were not seen before.
+
+    Candidate links come from the source's feeds/news sitemaps when it has
+    any, else from one fetch of the listing page ``url``. They are filtered
+    by ``patterns`` and the seen-URL index; only new pages are downloaded.
+    Returns the pages and the feed validators to save. Callers mark the
+    pages as seen once processed and only then save the validators (see
+    ``_finish_incremental``). Validators are dropped when some new pages
+    were left out or failed, so the next poll fetches the feed in full.
+    """
+    svc = WebDiscovery()
+    polled = (
+        await svc.feeds.poll_source(url, feeds or []) if settings.discover_feeds_enabled else None
+    )
+    validators: FeedValidators = polled.validators if polled is not None else {}
+    if polled is not None:
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.discover_feed_max_age_hours)
+        links = [
+            e.url for e in polled.entries if e.published_at is None or e.published_at >= cutoff
+        ]
+    else:
+        links = await svc.discover_links(url)
+
+    url_filter = URLPatternFilter(patterns=patterns) if patterns else None
+    candidates = [
+        link
+        for link in links
+        if same_host(link, url)
+        and link.rstrip("/") != url.rstrip("/")
+        and (url_filter is None or url_filter.apply(link))
+    ]
+    index = get_seen_url_index()
+    fresh = await index.filter_new(candidates)
+    new_urls = fresh[:max_pages]
+    logfire.info(
+        "Incremental discover candidates",
+        url=url,
+        via="feeds" if polled is not None else "listing",
+        links=len(links),
+        candidates=len(candidates),
+        new=len(new_urls),
+    )
+    if len(fresh) > max_pages:
+        validators = {}
+    if not new_urls:
+        return [], validators
+
+    # Politeness spaces requests to one host, so allow time for the whole batch
+    deadline = max(
+        settings.crawl_deadline_seconds,
+        len(new_urls) * settings.crawl_url_timeout_seconds / settings.crawl_per_host_concurrency,
+    )
+    results = [
+        item async for item in svc.crawl_iter(new_urls, pruned=False, deadline=deadline)
+    ]
+    fetched = [r for r in results if r.get("content")]
+    if len(fetched) < len(new_urls):
+        validators = {}
+    return fetched, validators
+
+
+async def _finish_incremental(
+    source_url: str, fetched: list[CrawlResult], validators: FeedValidators
+) -> None:
+    # Validators only after mark_seen, else a 304 would hide unprocessed entries
+    if fetched:
+        await get_seen_url_index().mark_seen((item["url"] for item in fetched), source_url=source_url)
+    await WebDiscovery().feeds.save_validators(validators)
+
+
 def _truncate(text: str | None, max_chars: int = 4000) -> str:
     if not text:
         return ""
@@ -65,57 +178,43 @@ def _truncate(text: str | None, max_chars: int = 4000) -> str:
     return t[: max_chars - 3] + "..."
 
 
-@logfire.instrument("discover._select_for_source")
-async def _select_for_source(
-    *,
-    source_cfg: dict,
-    crawled: list[CrawlResult],
-) -> list[CrawlResult]:
-    # Build compact post list with indices for the LLM
-    posts_payload: list[dict] = []
-    for idx, item in enumerate(crawled):
-        posts_payload.append(
-            {
-                "index": idx,
-                "url": item.get("url", ""),
-                "title": item.get("title", ""),
-                "description": item.get("description", ""),
-                "content": _truncate(
-                    item.get("content", ""),
-                    3000,
-                ),
-            }
-        )
+def _pack_posts(crawled: list[CrawlResult]) -> PackedItems:
+    # Compact post list with indices for the LLM, fitted to the token budget
+    posts = [
+        {
+            "index": idx,
+            "url": item.get("url", ""),
+            "title": item.get("title", ""),
+            "description": _truncate(item.get("description", ""), 300),
+            "content": item.get("content", ""),
+        }
+        for idx, item in enumerate(crawled)
+    ]
+    return pack_items(
+        posts,
+        budget_tokens=settings.discover_prompt_token_budget,
+        max_text_chars=3000,
+        label="discover",
+    )
 
-    target_prompt = source_cfg.get(
+
+def _target_prompt(source_cfg: dict) -> str:
+    return source_cfg.get(
         "target_prompt",
         ("Select the most relevant, high-quality articles for this source."),
     )
-    prompt = discover_system_prompt.format(
-        target_prompt=target_prompt,
-        posts=json.dumps(
-            posts_payload,
-            ensure_ascii=False,
-            indent=2,
-        ),
-    )
 
-    # Create a lightweight agent for structured selection
-    agent = Agent(
-        settings.discover_model,
-        output_type=SelectionResult,
-        retries=3,
-        name="discover_agent",
-    )
-
-    result = await llm_invoker.run(lambda: agent.run(prompt))
-    selection: SelectionResult = result.output  # type: ignore[assignment]
 
+def _apply_selection(
+    source_cfg: dict,
+    crawled: list[CrawlResult],
+    selected_articles: list[SelectedArticle],
+) -> list[CrawlResult]:
     # Map back to crawled results using indices, override title with AI title
     selected: list[CrawlResult] = []
     seen_indices: set[int] = set()
     cfg_category = (source_cfg.get("category") or "").strip()
-    for sel in selection.selected_articles:
+    for sel in selected_articles:
         if sel.index in seen_indices:
             continue
         if sel.index < 0 or sel.index >= len(crawled):
@@ -137,45 +236,304 @@ async def _select_for_source(
     return selected
 
 
+@logfire.instrument("discover._select_for_source")
+async def _select_for_source(
+    *,
+    source_cfg: dict,
+    crawled: list[CrawlResult],
+) -> list[CrawlResult]:
+    prompt = discover_system_prompt.format(
+        target_prompt=_target_prompt(source_cfg),
+        posts=_pack_posts(crawled).text,
+    )
+
+    result = await llm_invoker.run(lambda: discover_agent.run(prompt))
+    selection: SelectionResult = result.output  # type: ignore[assignment]
+    return _apply_selection(source_cfg, crawled, selection.selected_articles)
+
+
+@dataclass
+class _PendingSelection:
+    source_cfg: dict
+    crawled: list[CrawlResult]
+    sources_json: dict
+    tokens: int
+    future: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+class _SelectionBatcher:
+    """Packs several sources' posts into one structured LLM call.
+
+    Sources queue up as their crawls finish. A worker takes the first one,
+    waits up to ``discover_batch_linger_seconds`` for more and adds them
+    while the estimated prompt stays within ``discover_batch_token_budget``.
+    Sources the batch call fails on, or leaves out, fall back to a
+    per-source call.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self._queue: asyncio.Queue[_PendingSelection] = asyncio.Queue()
+        self._carry: list[_PendingSelection] = []
+        self._workers = [asyncio.create_task(self._run()) for _ in range(max(1, workers))]
+
+    async def select(self, source_cfg: dict, crawled: list[CrawlResult]) -> list[CrawlResult]:
+        packed = _pack_posts(crawled)
+        target_prompt = _target_prompt(source_cfg)
+        pending = _PendingSelection(
+            source_cfg=source_cfg,
+            crawled=crawled,
+            sources_json={"target_prompt": target_prompt, "posts": packed.items},
+            tokens=packed.tokens + estimate_tokens(target_prompt),
+        )
+        await self._queue.put(pending)
+        return await pending.future
+
+    async def close(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+    async def _next_batch(self) -> list[_PendingSelection]:
+        first = self._carry.pop(0) if self._carry else await self._queue.get()
+        batch, tokens = [first], first.tokens
+        ends_at = monotonic() + settings.discover_batch_linger_seconds
+        while tokens < settings.discover_batch_token_budget:
+            remaining = ends_at - monotonic()
+            try:
+                item = (
+                    self._queue.get_nowait()
+                    if remaining <= 0
+                    else await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                )
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            if tokens + item.tokens > settings.discover_batch_token_budget:
+                self._carry.append(item)
+                break
+            batch.append(item)
+            tokens += item.tokens
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._select_batch(batch)
+            except Exception:
+                logger.exception("Batched discover selection failed; selecting per source")
+            for item in batch:
+                if item.future.done():
+                    continue
+                try:
+                    selected = await _select_for_source(
+                        source_cfg=item.source_cfg, crawled=item.crawled
+                    )
+                except Exception as exc:
+                    if not item.future.done():
+                        item.future.set_exception(exc)
+                else:
+                    if not item.future.done():
+                        item.future.set_result(selected)
+
+    @logfire.instrument("discover._select_batch")
+    async def _select_batch(self, batch: list[_PendingSelection]) -> None:
+        if len(batch) == 1:
+            # A lone source uses the regular per-source call in ``_run``
+            return
+
+        payload = [{"source_id": i, **item.sources_json} for i, item in enumerate(batch)]
+        prompt = discover_batch_prompt.format(sources=compact_json(payload))
+        result = await llm_invoker.run(lambda: discover_batch_agent.run(prompt))
+        output: BatchSelectionResult = result.output  # type: ignore[assignment]
+        by_source = {s.source_id: s.selected_articles for s in output.sources}
+        logfire.info(
+            "Batched discover selection",
+            sources=len(batch),
+            answered=len(by_source),
+            tokens_estimate=sum(item.tokens for item in batch),
+        )
+        for i, item in enumerate(batch):
+            if i in by_source and not item.future.done():
+                item.future.set_result(
+                    _apply_selection(item.source_cfg, item.crawled, by_source[i])
+                )
+
+
+async def _crawl_source(cfg: dict) -> tuple[list[CrawlResult], bool, FeedValidators]:
+    """Crawl one configured source.
+
+    Returns the results, whether the crawl was incremental and the feed
+    validators to save after the results are marked seen.
+    """
+    url = cfg.get("url", "")
+    max_depth = int(cfg.get("max_depth", 1))
+    max_pages = int(cfg.get("max_pages", 50))
+    patterns = cfg.get("patterns") or []
+    # Incremental mode only reads the listing page itself (depth 1)
+    incremental = settings.discover_incremental and max_depth <= 1
+    if incremental:
+        crawled, validators = await incremental_crawl(
+            url,
+            max_pages=max_pages,
+            patterns=patterns,
+            feeds=cfg.get("feeds") or [],
+        )
+        return crawled, True, validators
+    crawled = await deep_crawl(
+        url,
+        max_depth=max_depth,
+        max_pages=max_pages,
+        patterns=patterns,
+    )  # type: ignore[arg-type]
+    return crawled, False, {}
+
+
+async def _process_source(
+    cfg: dict,
+    crawl_semaphore: asyncio.Semaphore,
+    select_semaphore: asyncio.Semaphore,
+    batcher: Optional[_SelectionBatcher],
+    dup_filter: Optional[NearDuplicateFilter],
+) -> list[CrawlResult]:
+    url = cfg.get("url", "")
+    queued_at = monotonic()
+    async with crawl_semaphore:
+        crawl_started = monotonic()
+        with logfire.span("discover.crawl_source {url}", url=url):
+            fetched, incremental, validators = await _crawl_source(cfg)
+        crawl_done = monotonic()
+
+    crawled = fetched
+    if dup_filter is not None and fetched:
+        crawled = await _collapse_duplicates(url, fetched, dup_filter)
+    if not crawled:
+        if incremental:
+            await _finish_incremental(url, fetched, validators)
+        logfire.info(
+            "Discover source timings",
+            source=url,
+            crawl_wait_seconds=crawl_started - queued_at,
+            crawl_seconds=crawl_done - crawl_started,
+            crawled=0,
+        )
+        return []
+
+    if batcher is not None:
+        # The batcher bounds concurrent LLM calls with its worker count
+        select_started = monotonic()
+        selected = await batcher.select(cfg, crawled)
+        select_done = monotonic()
+    else:
+        async with select_semaphore:
+            select_started = monotonic()
+            selected = await _select_for_source(
+                source_cfg=cfg,
+                crawled=crawled,
+            )
+            select_done = monotonic()
+    if incremental:
+        # Mark after selection so a failed LLM call retries these pages
+        await _finish_incremental(url, fetched, validators)
+
+    logfire.info(
+        "Discover source timings",
+        source=url,
+        crawl_wait_seconds=crawl_started - queued_at,
+        crawl_seconds=crawl_done - crawl_started,
+        select_wait_seconds=select_started - crawl_done,
+        select_seconds=select_done - select_started,
+        crawled=len(crawled),
+        selected=len(selected),
+    )
+    return selected
+
+
+async def _collapse_duplicates(
+    source_url: str,
+    crawled: list[CrawlResult],
+    dup_filter: NearDuplicateFilter,
+) -> list[CrawlResult]:
+    texts = [f"{c.get('title') or ''}\n{c.get('content') or ''}" for c in crawled]
+    fingerprints = await run_cpu_bound(simhashes, texts)
+    kept = dup_filter.collapse(crawled, fingerprints)  # type: ignore[arg-type]
+    logfire.info(
+        "Collapsed near-duplicates",
+        source=source_url,
+        before=len(crawled),
+        after=len(kept),
+    )
+    return kept  # type: ignore[return-value]
+
+
+async def _load_duplicate_filter() -> NearDuplicateFilter:
+    """Filter seeded with fingerprints of recently stored articles."""
+    since = datetime.now(timezone.utc) - timedelta(days=settings.discover_dedup_lookback_days)
+    try:
+        async with AsyncSessionLocal() as session:
+            rows = await ArticleRepository(session).list_recent_fingerprints(since)
+    except Exception:
+        logger.exception("Failed to load article fingerprints; deduplicating within run only")
+        rows = []
+    known = [(u, fp) for u, raw in rows if (fp := parse_simhash(raw)) is not None]
+    return NearDuplicateFilter(known, max_distance=settings.discover_dedup_max_distance)
+
+
 @logfire.instrument("discover.discover_best_posts")
 async def discover_best_posts() -> list[CrawlResult]:
     """Crawl configured sources and select the best posts per source.
 
+    Sources run as a pipeline: up to ``discover_crawl_concurrency`` crawls
+    and ``discover_select_concurrency`` LLM selections at a time, so one
+    source's selection overlaps with another's crawl. With
+    ``discover_batch_selection`` sources that finish crawling close together
+    share one LLM call. Near-duplicate pages, within the run or of recently
+    stored articles, are collapsed before selection. A failing source is
+    logged and skipped.
+
     Returns:
         A flat list of selected posts (per CrawlResult schema) with titles
-        replaced by AI-generated short Vietnamese titles.
+        replaced by AI-generated short Vietnamese titles, in config order.
     """
-    cfg_list = settings.discover_sources_config
+    cfg_list = [
+        cfg
+        for cfg in settings.discover_sources_config or []
+        if isinstance(cfg, dict) and cfg.get("url")
+    ]
     if not cfg_list:
         return []
 
-    # Crawl and select sequentially per source (no parallelization)
-    final: list[CrawlResult] = []
-    for cfg in cfg_list:
-        if not isinstance(cfg, dict) or not cfg.get("url"):
-            continue
-        url = cfg.get("url", "")
-        max_depth = int(cfg.get("max_depth", 1))
-        max_pages = int(cfg.get("max_pages", 50))
-        patterns = cfg.get("patterns") or []
-        crawled = await deep_crawl(
-            url,
-            max_depth=max_depth,
-            max_pages=max_pages,
-            patterns=patterns,
-        )  # type: ignore[arg-type]
-        if not crawled:
-            continue
-        selected = await _select_for_source(
-            source_cfg=cfg,
-            crawled=crawled,
+    crawl_semaphore = asyncio.Semaphore(settings.discover_crawl_concurrency)
+    select_semaphore = asyncio.Semaphore(settings.discover_select_concurrency)
+    # Shared across sources so syndicated copies on other sites collapse too
+    dup_filter = await _load_duplicate_filter() if settings.discover_dedup_enabled else None
+    batcher = (
+        _SelectionBatcher(workers=settings.discover_select_concurrency)
+        if settings.discover_batch_selection
+        else None
+    )
+    try:
+        outcomes = await asyncio.gather(
+            *(
+                _process_source(cfg, crawl_semaphore, select_semaphore, batcher, dup_filter)
+                for cfg in cfg_list
+            ),
+            return_exceptions=True,
         )
-        final.extend(selected)
+    finally:
+        if batcher is not None:
+            await batcher.close()
 
+    final: list[CrawlResult] = []
+    for cfg, outcome in zip(cfg_list, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.opt(exception=outcome).error("Discover failed for {}", cfg.get("url"))
+            continue
+        final.extend(outcome)
     return final
 
 
 __all__ = [
     "deep_crawl",
     "discover_best_posts",
+    "incremental_crawl",
 ]
@@ -57,3 +57,71 @@ The list of articles for you to analyze is provided below:
 {posts}
 ---
 """
+
+
+discover_batch_prompt = """You are an expert content curator. You will curate articles for several news sources at once. Each source has its own curation goal and its own list of crawled articles.
+
+## Input Format
+You will receive a JSON list of sources. Each source object contains:
+```json
+[
+    {{
+        "source_id": <integer>,
+        "target_prompt": "<curation goal for this source>",
+        "posts": [
+            {{
+                "index": <integer>,
+                "url": "<string>",
+                "title": "<string>",
+                "description": "<string>",
+                "content": "<string>"
+            }},
+            // ... more articles of this source
+        ]
+    }},
+    // ... more sources
+]
+```
+
+## Task
+For **each source independently**:
+1.  **Analyze**: Read through the articles of that source only.
+2.  **Evaluate**: Judge each article against that source's `target_prompt`. Consider topic relevance, timeliness, depth, and uniqueness as specified in the goal.
+3.  **Select**: Identify at least 5 articles that best meet that source's goal (fewer only if the source has fewer suitable articles). Aim for quality over quantity.
+
+Never mix articles between sources: an `index` always refers to the `posts` list of the same `source_id`.
+
+## Output Requirements
+Your output must be a valid JSON object with a single key "sources". It holds one object per input source with its `source_id` and a "selected_articles" list. Each selected article contains its `index` and `title` (rewritten short title in Vietnamese, within 10 words).
+
+**Example Output:**
+```json
+{{
+    "sources": [
+        {{
+            "source_id": 0,
+            "selected_articles": [
+                {{"title": "An Example Title of a Highly Relevant Article", "index": 5}},
+                {{"title": "Another Great Post That Fits the Curation Goal", "index": 12}}
+            ]
+        }},
+        {{
+            "source_id": 1,
+            "selected_articles": [
+                {{"title": "A Relevant Article for the Second Source", "index": 3}}
+            ]
+        }}
+    ]
+}}
+```
+
+- Include every `source_id` from the input exactly once.
+- Ensure each `index` matches the index in that source's `posts` list exactly.
+- Do not include any other text or explanation outside of the JSON object.
+
+
+The sources for you to analyze are provided below:
+---
+{sources}
+---
+"""
@@ -14,7 +14,9 @@ from core.agents.research.prompts import (
     subagent_system_prompt,
 )
 from core.services.llm_invoker import llm_invoker
+from core.services.prompt_packer import compact_json, pack_items
 from core.services.web_discovery import WebDiscovery
+from core.tools.search import search_saved_articles
 from settings import settings
 from pydantic_ai import Agent, RunContext
 from pydantic_ai.messages import (
@@ -75,7 +77,11 @@ async def web_fetch(urls: list[str]) -> list[dict]:
         - Use for high-quality sources identified through web_search
     """
     svc = WebDiscovery()
-    crawled = await svc.crawl(urls=urls, pruned=False, ignore_images=True)
+    # Stream pages as they finish; stragglers come back with metadata["error"]
+    crawled = [
+        item
+        async for item in svc.crawl_iter(urls, pruned=False, ignore_images=True, polite=False)
+    ]
     return crawled
 
 
@@ -89,7 +95,7 @@ async def complete_task(report: str) -> str:
     return report
 
 
-base_toolset = FunctionToolset(tools=[web_search, web_fetch])
+base_toolset = FunctionToolset(tools=[web_search, web_fetch, search_saved_articles])
 
 
 subagent_model = settings.subagent_research_model
@@ -214,7 +220,9 @@ def messages_to_text(messages: list[ModelMessage], include_tools: bool = False)
     """Render a simple text view of messages for citation harvesting.
 
     When include_tools=True, also serialize tool calls and tool results so
-    URLs inside tool payloads are available to the citation agent.
+    URLs inside tool payloads are available to the citation agent. Fetched
+    pages are packed to ``citation_prompt_token_budget`` (URLs and titles
+    kept, content cut to lead paragraphs) and JSON is written compactly.
     """
     lines: list[str] = []
     for msg in messages:
@@ -230,9 +238,7 @@ def messages_to_text(messages: list[ModelMessage], include_tools: bool = False)
                     tn = getattr(part, "tool_name", "")
                     args = getattr(part, "args", None)
                     try:
-                        args_txt = (
-                            json.dumps(args, ensure_ascii=False) if args is not None else "{}"
-                        )
+                        args_txt = compact_json(args) if args is not None else "{}"
                     except Exception:
                         args_txt = str(args)
                     lines.append(f"[tool_call:{tn}] args={args_txt}")
@@ -240,8 +246,18 @@ def messages_to_text(messages: list[ModelMessage], include_tools: bool = False)
                     tn = getattr(part, "tool_name", "")
                     content = getattr(part, "content", None)
                     try:
-                        if isinstance(content, (dict, list)):
-                            c_txt = json.dumps(content, ensure_ascii=False)
+                        if (
+                            isinstance(content, list)
+                            and content
+                            and all(isinstance(c, dict) and "content" in c for c in content)
+                        ):
+                            c_txt = pack_items(
+                                content,
+                                budget_tokens=settings.citation_prompt_token_budget,
+                                label=f"citation:{tn}",
+                            ).text
+                        elif isinstance(content, (dict, list)):
+                            c_txt = compact_json(content)
                         else:
                             c_txt = str(content)
                     except Exception:
@@ -0,0 +1,28 @@
+import logfire
+from pydantic_ai import Agent
+
+from core.agents.summarizer.prompts import summary_prompt, system_prompt
+from core.services.llm_invoker import llm_invoker
+from settings import settings
+
+summarizer_agent = Agent(
+    settings.model,
+    output_type=str,
+    instructions=system_prompt,
+    retries=2,
+    name="history_summarizer",
+)
+
+
+@logfire.instrument("summarize_history")
+async def summarize_history(previous_summary: str, transcript: str) -> str:
+    """Fold ``transcript`` into ``previous_summary`` and return the new summary."""
+    prompt = summary_prompt.format(
+        previous_summary=previous_summary or "(none)",
+        transcript=transcript,
+    )
+    result = await llm_invoker.run(lambda: summarizer_agent.run(prompt))
+    return result.output.strip()
+
+
+__all__ = ["summarize_history", "summarizer_agent"]
@@ -5,7 +5,7 @@ from enum import Enum
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import Column, text
+from sqlalchemy import Column, DateTime, Index, LargeBinary, text
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TEXT
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, relationship
@@ -152,6 +152,22 @@ class ConversationMessageRun(SQLModel, table=True):
     )
 
 
+class ConversationSummary(SQLModel, table=True):
+    """Rolling summary of the leading turns of a conversation."""
+
+    __tablename__ = "conversation_summary"
+    conversation_id: UUID = Field(
+        foreign_key="conversation.id", primary_key=True, ondelete="CASCADE"
+    )
+    summary: str = Field(sa_column=Column(TEXT, nullable=False))
+    # Number of leading turns folded into the summary
+    covered_turns: int = 0
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, server_default=text("now()")),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
 class ArticleSource(SQLModel, table=True):
     __tablename__ = "article_source"
     id: UUID = Field(
@@ -209,8 +225,119 @@ class Article(SQLModel, table=True):
     )
 
 
+class CrawlCacheEntry(SQLModel, table=True):
+    """Shared cache of crawled pages keyed by normalized URL + crawl options."""
+
+    __tablename__ = "crawl_cache"
+    key: str = Field(primary_key=True)
+    url: str = Field(index=True)
+    # Stored as JSONB list of CrawlResult dicts
+    results: list = Field(
+        sa_column=Column(JSONB, nullable=False),
+        default_factory=list,
+    )
+    size_bytes: int
+    fetched_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, server_default=text("now()")),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True),
+    )
+
+
+class RateLimitState(SQLModel, table=True):
+    """GCRA state for limiters shared across processes (see PostgresRateLimiter)."""
+
+    __tablename__ = "rate_limit_state"
+    key: str = Field(primary_key=True)
+    # Theoretical arrival time of the next allowed request
+    tat: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+
+
+class DiscoveredUrl(SQLModel, table=True):
+    """Article URLs already fetched by discover, keyed by normalized URL."""
+
+    __tablename__ = "discovered_url"
+    url: str = Field(primary_key=True)
+    source_url: Optional[str] = None
+    first_seen_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, index=True, server_default=text("now()")
+        ),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
+class FeedState(SQLModel, table=True):
+    """Conditional GET validators for polled RSS/Atom feeds and sitemaps."""
+
+    __tablename__ = "feed_state"
+    url: str = Field(primary_key=True)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    checked_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, server_default=text("now()")),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
+class ArticleEmbedding(SQLModel, table=True):
+    """Embedding of one chunk of an article's text, per embedding model."""
+
+    __tablename__ = "article_embedding"
+    article_id: UUID = Field(foreign_key="article.id", primary_key=True, ondelete="CASCADE")
+    model: str = Field(primary_key=True)
+    chunk_index: int = Field(primary_key=True)
+    content: str = Field(sa_column=Column(TEXT, nullable=False))
+    # Little-endian float32, L2-normalized
+    embedding: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    created_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default=text("now()"), index=True
+        ),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
+class ArticleEmbeddingFailure(SQLModel, table=True):
+    """Failed embedding attempts for an article, so it is retried with backoff."""
+
+    __tablename__ = "article_embedding_failure"
+    article_id: UUID = Field(foreign_key="article.id", primary_key=True, ondelete="CASCADE")
+    model: str = Field(primary_key=True)
+    attempts: int = 1
+    error: str = Field(sa_column=Column(TEXT, nullable=False))
+    failed_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, server_default=text("now()")),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+    # NULL once the article is given up on
+    retry_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+
+
+class FeaturedSnapshot(SQLModel, table=True):
+    """Materialized ``GET /api/featured`` response for one suggestion day."""
+
+    __tablename__ = "featured_snapshot"
+    day: date = Field(primary_key=True)
+    payload: dict = Field(sa_column=Column(JSONB, nullable=False))
+    etag: str
+    built_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, server_default=text("now()")),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
 class DailySuggestion(SQLModel, table=True):
     __tablename__ = "daily_suggestion"
+    __table_args__ = (
+        Index("uq_daily_suggestion", "suggestion_date", "article_id", unique=True),
+    )
     id: UUID = Field(
         sa_column=Column(
             PGUUID(as_uuid=True),
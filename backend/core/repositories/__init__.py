@@ -1,13 +1,27 @@
-from .article import ArticleRepository
+from .article import ArticleCard, ArticleRepository, ArticleSearchHit
+from .article_embedding import ArticleEmbeddingRepository
 from .article_source import ArticleSourceRepository
+from .crawl_cache import CrawlCacheRepository
 from .conversation import ConversationRepository
+from .conversation_summary import ConversationSummaryRepository
 from .daily_suggestion import DailySuggestionRepository
+from .featured_snapshot import FeaturedSnapshotRepository
+from .feed_state import FeedStateRepository
 from .message import MessageRepository
+from .seen_url import SeenUrlRepository
 
 __all__ = [
     "ConversationRepository",
+    "ConversationSummaryRepository",
     "MessageRepository",
+    "ArticleCard",
     "ArticleRepository",
+    "ArticleSearchHit",
+    "ArticleEmbeddingRepository",
     "ArticleSourceRepository",
     "DailySuggestionRepository",
+    "CrawlCacheRepository",
+    "SeenUrlRepository",
+    "FeedStateRepository",
+    "FeaturedSnapshotRepository",
 ]
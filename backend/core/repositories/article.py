@@ -1,15 +1,91 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from typing import Iterable, Optional
 from uuid import UUID
 
 from core.models import Article
+from sqlalchemy import cast, func, literal_column, or_, tuple_
+from sqlalchemy.dialects.postgresql import JSONB, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import col, select
 
 from .base import BaseRepository
 
+# LEFT JOIN LATERAL exposing ``kw.keywords``: distinct normalized keywords of
+# article ``a`` from the common metadata keys (list or comma-separated text),
+# trimmed, lowercased and stripped of '#' and quotes
+ARTICLE_KEYWORDS_SQL = r"""
+LEFT JOIN LATERAL (
+    SELECT array_agg(DISTINCT n.norm) AS keywords
+    FROM (
+        SELECT btrim(btrim(lower(btrim(raw.value, E' \t\r\n#')), '"'), E' \t\r\n') AS norm
+        FROM unnest(
+            ARRAY['keywords', 'article:tag', 'news_keywords', 'og:keywords', 'tags']
+        ) AS k(key)
+        CROSS JOIN LATERAL (
+            SELECT jsonb_array_elements_text(a.metadata -> k.key) AS value
+            WHERE jsonb_typeof(a.metadata -> k.key) = 'array'
+            UNION ALL
+            SELECT regexp_split_to_table(a.metadata ->> k.key, ',')
+            WHERE jsonb_typeof(a.metadata -> k.key) IN ('string', 'number')
+        ) AS raw
+    ) AS n
+    WHERE n.norm <> ''
+) AS kw ON true
+"""
+
+# Card columns for article ``a`` joined with ``ARTICLE_KEYWORDS_SQL``; callers add ``summary``
+ARTICLE_CARD_COLUMNS_SQL = """
+    a.id, a.url, a.title, a.image_url,
+    nullif(btrim(a.category), '') AS category,
+    a.published_at,
+    coalesce(kw.keywords, '{}') AS keywords
+"""
+
+
+@dataclass(frozen=True)
+class ArticleCard:
+    """Columns needed to render an article card, without the full text."""
+
+    id: UUID
+    url: str
+    title: str
+    image_url: Optional[str]
+    category: Optional[str]
+    published_at: Optional[datetime]
+    summary: str
+    keywords: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_row(cls, row) -> "ArticleCard":
+        m = row._mapping
+        return cls(
+            id=m["id"],
+            url=m["url"],
+            title=m["title"] or "",
+            image_url=m["image_url"],
+            category=m["category"],
+            published_at=m["published_at"],
+            summary=m["summary"] or "",
+            keywords=list(m["keywords"] or []),
+        )
+
+
+@dataclass(frozen=True)
+class ArticleSearchHit:
+    id: UUID
+    url: str
+    title: str
+    image_url: Optional[str]
+    category: Optional[str]
+    published_at: Optional[datetime]
+    fetched_at: datetime
+    lang: str
+    summary: str
+    score: float
+
 
 class ArticleRepository(BaseRepository[Article]):
     def __init__(self, session: AsyncSession) -> None:
@@ -21,22 +97,46 @@ class ArticleRepository(BaseRepository[Article]):
         return result.scalars().first()
 
     async def upsert_many(self, articles: Iterable[Article]) -> list[Article]:
-        stored: list[Article] = []
+        """Insert new articles and fill empty fields of existing ones by URL.
+
+        Metadata is merged, with keys from the new row winning. One
+        ``INSERT ... ON CONFLICT (url) DO UPDATE ... RETURNING`` for the
+        whole batch; duplicate URLs within the batch keep the first item.
+        Returned rows are not in input order, so map them back by URL.
+        """
+        rows: dict[str, dict] = {}
         for a in articles:
-            existing = await self.get_by_url(a.url)
-            if existing:
-                # update minimal fields if missing
-                existing.title = existing.title or a.title
-                existing.author = existing.author or a.author
-                existing.image_url = existing.image_url or a.image_url
-                existing.published_at = existing.published_at or a.published_at
-                existing.content_text = existing.content_text or a.content_text
-                stored.append(existing)
-            else:
-                await self.add(a)
-                stored.append(a)
-        await self.flush()
-        return stored
+            if a.url not in rows:
+                rows[a.url] = a.model_dump(exclude={"id"})
+        if not rows:
+            return []
+
+        t = Article.__table__
+        stmt = insert(Article).values(list(rows.values()))
+
+        def fill(column: str):
+            # Keep the stored value unless it is NULL or empty
+            return func.coalesce(func.nullif(t.c[column], ""), stmt.excluded[column])
+
+        empty = cast("{}", JSONB)
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[t.c.url],
+            set_={
+                "title": fill("title"),
+                "author": fill("author"),
+                "image_url": fill("image_url"),
+                "content_text": fill("content_text"),
+                "published_at": func.coalesce(t.c.published_at, stmt.excluded.published_at),
+                "metadata": func.coalesce(t.c["metadata"], empty).op("||")(
+                    func.coalesce(stmt.excluded["metadata"], empty)
+                ),
+            },
+        ).returning(Article)
+        result = await self.session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        )
+        return list(result.all())
 
     async def list_by_day(self, target_day: date) -> list[Article]:
         start = datetime.combine(target_day, datetime.min.time())
@@ -49,6 +149,15 @@ class ArticleRepository(BaseRepository[Article]):
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def list_recent_fingerprints(self, since: datetime) -> list[tuple[str, str]]:
+        """``(url, simhash)`` of articles fetched since ``since`` that have one."""
+        stmt = select(Article.url, Article.metadata_["simhash"].astext).where(
+            col(Article.fetched_at) >= since,
+            Article.metadata_.has_key("simhash"),
+        )
+        result = await self.session.execute(stmt)
+        return [(url, fp) for url, fp in result.all() if fp]
+
     async def list_by_ids(self, ids: Iterable[UUID]) -> list[Article]:
         ids_list = list(ids)
         if not ids_list:
@@ -56,3 +165,71 @@ class ArticleRepository(BaseRepository[Article]):
         stmt = select(Article).where(Article.id.in_(ids_list))
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
+
+    async def search(
+        self,
+        query: str,
+        *,
+        limit: int = 20,
+        after: Optional[tuple[float, UUID]] = None,
+        since: Optional[datetime] = None,
+        category: Optional[str] = None,
+        summary_chars: int = 300,
+    ) -> list[ArticleSearchHit]:
+        """Rank articles for ``query`` by full-text and title-trigram match.
+
+        Matching is accent-insensitive (``f_unaccent``) and accepts web
+        search syntax (quotes, ``or``, ``-term``). The score is
+        ``ts_rank_cd`` (title weighted over body) plus title trigram
+        similarity. Results are ordered by ``(score, id)`` descending; pass
+        the last hit's ``(score, id)`` as ``after`` for the next page.
+        """
+        tsv = literal_column("article.tsv")
+        tsquery = func.websearch_to_tsquery("simple", func.f_unaccent(query))
+        title_norm = func.f_unaccent(func.lower(Article.title))
+        query_norm = func.f_unaccent(func.lower(query))
+        score = (
+            func.ts_rank_cd(tsv, tsquery, 32) + func.similarity(title_norm, query_norm)
+        ).label("score")
+
+        filters = [or_(tsv.op("@@")(tsquery), title_norm.op("%")(query_norm))]
+        if since is not None:
+            filters.append(col(Article.fetched_at) >= since)
+        if category:
+            filters.append(Article.category == category)
+        ranked = (
+            select(
+                Article.id,
+                Article.url,
+                Article.title,
+                Article.image_url,
+                Article.category,
+                Article.published_at,
+                Article.fetched_at,
+                Article.lang,
+                func.left(Article.content_text, summary_chars).label("summary"),
+                score,
+            )
+            .where(*filters)
+            .subquery()
+        )
+        stmt = select(ranked)
+        if after is not None:
+            stmt = stmt.where(tuple_(ranked.c.score, ranked.c.id) < tuple_(*after))
+        stmt = stmt.order_by(ranked.c.score.desc(), ranked.c.id.desc()).limit(limit)
+        result = await self.session.execute(stmt)
+        return [
+            ArticleSearchHit(
+                id=row.id,
+                url=row.url,
+                title=row.title or "",
+                image_url=row.image_url,
+                category=row.category,
+                published_at=row.published_at,
+                fetched_at=row.fetched_at,
+                lang=row.lang or "",
+                summary=row.summary or "",
+                score=float(row.score),
+            )
+            for row in result.all()
+        ]
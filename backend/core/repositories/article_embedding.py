@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+from core.models import Article, ArticleEmbedding, ArticleEmbeddingFailure
+from sqlalchemy import case, delete, func, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from .base import BaseRepository
+
+
+class ArticleEmbeddingRepository(BaseRepository[ArticleEmbedding]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    async def list_unembedded(self, model: str, limit: int) -> list[tuple[UUID, str, str]]:
+        """``(id, title, content_text)`` of the newest articles without chunks for ``model``.
+
+        Articles whose last attempt failed are skipped until their
+        ``retry_at``, and for good once it is NULL.
+        """
+        embedded = select(ArticleEmbedding.article_id).where(
+            ArticleEmbedding.article_id == Article.id,
+            ArticleEmbedding.model == model,
+        )
+        failure = ArticleEmbeddingFailure
+        backing_off = select(failure.article_id).where(
+            failure.article_id == Article.id,
+            failure.model == model,
+            or_(col(failure.retry_at).is_(None), col(failure.retry_at) > func.now()),
+        )
+        stmt = (
+            select(Article.id, Article.title, Article.content_text)
+            .where(~embedded.exists(), ~backing_off.exists(), Article.content_text != "")
+            .order_by(col(Article.fetched_at).desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    async def add_many(self, rows: Iterable[dict]) -> None:
+        values = list(rows)
+        if not values:
+            return
+        stmt = insert(ArticleEmbedding).values(values).on_conflict_do_nothing()
+        await self.session.execute(stmt)
+        article_ids = {v["article_id"] for v in values}
+        await self.session.execute(
+            delete(ArticleEmbeddingFailure).where(
+                col(ArticleEmbeddingFailure.article_id).in_(article_ids),
+                ArticleEmbeddingFailure.model == values[0]["model"],
+            )
+        )
+
+    async def record_failures(
+        self,
+        model: str,
+        article_ids: Iterable[UUID],
+        *,
+        error: str,
+        base_seconds: float,
+        max_attempts: int,
+    ) -> None:
+        """Count a failed attempt; the next retry waits ``base_seconds * 2^(attempts-1)``.
+
+        After ``max_attempts`` the article gets ``retry_at = NULL`` and is
+        not picked again. ``max_attempts=1`` gives up at once.
+        """
+        ids = list(dict.fromkeys(article_ids))
+        if not ids:
+            return
+        t = ArticleEmbeddingFailure.__table__
+
+        def backoff(seconds):
+            # make_interval(years, months, weeks, days, hours, mins, secs)
+            return func.now() + func.make_interval(0, 0, 0, 0, 0, 0, seconds)
+
+        first_retry = backoff(base_seconds) if max_attempts > 1 else None
+        stmt = insert(ArticleEmbeddingFailure).values(
+            [
+                {
+                    "article_id": i,
+                    "model": model,
+                    "attempts": 1,
+                    "error": error,
+                    "retry_at": first_retry,
+                }
+                for i in ids
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[t.c.article_id, t.c.model],
+            set_={
+                "attempts": t.c.attempts + 1,
+                "error": stmt.excluded.error,
+                "failed_at": func.now(),
+                "retry_at": case(
+                    (t.c.attempts + 1 >= max_attempts, None),
+                    else_=backoff(base_seconds * func.power(2, t.c.attempts)),
+                ),
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def list_vectors(
+        self, model: str, since: Optional[datetime] = None
+    ) -> list[tuple[UUID, int, bytes, datetime]]:
+        """``(article_id, chunk_index, embedding, created_at)`` for ``model``, oldest first."""
+        stmt = select(
+            ArticleEmbedding.article_id,
+            ArticleEmbedding.chunk_index,
+            ArticleEmbedding.embedding,
+            ArticleEmbedding.created_at,
+        ).where(ArticleEmbedding.model == model)
+        if since is not None:
+            stmt = stmt.where(col(ArticleEmbedding.created_at) > since)
+        stmt = stmt.order_by(col(ArticleEmbedding.created_at).asc())
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    async def get_chunks(
+        self, model: str, keys: list[tuple[UUID, int]]
+    ) -> dict[tuple[UUID, int], tuple[str, str, str, Optional[datetime]]]:
+        """``(content, title, url, published_at)`` for ``(article_id, chunk_index)`` keys."""
+        if not keys:
+            return {}
+        stmt = (
+            select(
+                ArticleEmbedding.article_id,
+                ArticleEmbedding.chunk_index,
+                ArticleEmbedding.content,
+                Article.title,
+                Article.url,
+                Article.published_at,
+            )
+            .join(Article, Article.id == ArticleEmbedding.article_id)
+            .where(
+                ArticleEmbedding.model == model,
+                tuple_(ArticleEmbedding.article_id, ArticleEmbedding.chunk_index).in_(keys),
+            )
+        )
+        result = await self.session.execute(stmt)
+        return {(row[0], row[1]): tuple(row[2:]) for row in result.all()}
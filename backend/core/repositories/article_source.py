@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from typing import Optional
+from datetime import datetime, timezone
+from typing import ClassVar, Iterable, Optional
+from uuid import UUID
 
 from core.models import ArticleSource
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -10,6 +14,9 @@ from .base import BaseRepository
 
 
 class ArticleSourceRepository(BaseRepository[ArticleSource]):
+    # Sources almost never change, so domain -> id is cached per process
+    _id_cache: ClassVar[dict[str, UUID]] = {}
+
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
 
@@ -33,3 +40,36 @@ class ArticleSourceRepository(BaseRepository[ArticleSource]):
         await self.flush()
         await self.refresh(src)
         return src
+
+    async def get_or_create_many(self, domains: Iterable[str]) -> dict[str, UUID]:
+        """Resolve source ids for ``domains``, creating missing sources.
+
+        Cached domains cost nothing. The rest take one ``INSERT ... ON
+        CONFLICT (domain) DO UPDATE ... RETURNING``, where the no-op update
+        makes existing rows come back too. Only rows that already existed
+        are cached, because rows inserted here may still roll back.
+        """
+        wanted = list(dict.fromkeys(d for d in domains if d))
+        resolved = {d: self._id_cache[d] for d in wanted if d in self._id_cache}
+        missing = [d for d in wanted if d not in resolved]
+        if not missing:
+            return resolved
+
+        now = datetime.now(timezone.utc)
+        stmt = insert(ArticleSource).values(
+            [{"domain": d, "name": d, "created_at": now} for d in missing]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ArticleSource.domain],
+            set_={"domain": stmt.excluded.domain},
+        ).returning(
+            ArticleSource.id,
+            ArticleSource.domain,
+            literal_column("xmax = 0").label("inserted"),
+        )
+        result = await self.session.execute(stmt)
+        for source_id, domain, inserted in result.all():
+            resolved[domain] = source_id
+            if not inserted:
+                self._id_cache[domain] = source_id
+        return resolved
@@ -11,7 +11,7 @@ from core.models import (
     Message,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from sqlmodel import col, select
 
 from .base import BaseRepository
 
@@ -126,3 +126,20 @@ class ConversationRepository(BaseRepository[Conversation]):
         )
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
+
+    async def list_message_run_ids(self, conversation_id: UUID) -> list[UUID]:
+        """Ids of a conversation's runs in order, without the messages."""
+        stmt = (
+            select(ConversationMessageRun.id)
+            .where(ConversationMessageRun.conversation_id == conversation_id)
+            .order_by(ConversationMessageRun.created_at.asc())
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def list_message_runs_by_ids(self, ids: list[UUID]) -> list[ConversationMessageRun]:
+        if not ids:
+            return []
+        stmt = select(ConversationMessageRun).where(col(ConversationMessageRun.id).in_(ids))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
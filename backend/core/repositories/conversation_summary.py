@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from core.models import ConversationSummary
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .base import BaseRepository
+
+
+class ConversationSummaryRepository(BaseRepository[ConversationSummary]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    async def get_by_conversation(self, conversation_id: UUID) -> Optional[ConversationSummary]:
+        return await self.session.get(ConversationSummary, conversation_id)
+
+    async def save(self, conversation_id: UUID, *, summary: str, covered_turns: int) -> None:
+        """Upsert the summary; a stored one covering more turns is kept."""
+        stmt = insert(ConversationSummary).values(
+            conversation_id=conversation_id,
+            summary=summary,
+            covered_turns=covered_turns,
+            updated_at=datetime.now(timezone.utc),
+        )
+        t = ConversationSummary.__table__
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[t.c.conversation_id],
+            set_={
+                "summary": stmt.excluded.summary,
+                "covered_turns": stmt.excluded.covered_turns,
+                "updated_at": stmt.excluded.updated_at,
+            },
+            where=t.c.covered_turns < stmt.excluded.covered_turns,
+        )
+        await self.session.execute(stmt)
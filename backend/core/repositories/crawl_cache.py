@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from core.models import CrawlCacheEntry
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from .base import BaseRepository
+
+
+class CrawlCacheRepository(BaseRepository[CrawlCacheEntry]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    async def get_fresh(self, key: str) -> Optional[CrawlCacheEntry]:
+        stmt = select(CrawlCacheEntry).where(
+            CrawlCacheEntry.key == key,
+            CrawlCacheEntry.expires_at > datetime.now(timezone.utc),
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().first()
+
+    async def put(
+        self,
+        *,
+        key: str,
+        url: str,
+        results: list,
+        size_bytes: int,
+        expires_at: datetime,
+    ) -> None:
+        stmt = insert(CrawlCacheEntry).values(
+            key=key,
+            url=url,
+            results=results,
+            size_bytes=size_bytes,
+            fetched_at=datetime.now(timezone.utc),
+            expires_at=expires_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CrawlCacheEntry.key],
+            set_={
+                "results": stmt.excluded.results,
+                "size_bytes": stmt.excluded.size_bytes,
+                "fetched_at": stmt.excluded.fetched_at,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def prune(self, max_bytes: int) -> int:
+        """Delete expired rows, then the oldest rows beyond the byte budget.
+
+        Uses a raw SQL window query to keep it to two statements.
+        """
+        expired = await self.session.execute(text("DELETE FROM crawl_cache WHERE expires_at <= now()"))
+        over_budget = await self.session.execute(
+            text(
+                """
+                DELETE FROM crawl_cache
+                WHERE key IN (
+                  SELECT key FROM (
+                    SELECT key, sum(size_bytes) OVER (ORDER BY fetched_at DESC, key) AS running
+                    FROM crawl_cache
+                  ) t
+                  WHERE t.running > :max_bytes
+                )
+                """
+            ),
+            {"max_bytes": max_bytes},
+        )
+        return (expired.rowcount or 0) + (over_budget.rowcount or 0)
@@ -5,10 +5,12 @@ from typing import Iterable, Optional
 from uuid import UUID
 
 from core.models import DailySuggestion
-from sqlalchemy import text
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from .article import ARTICLE_KEYWORDS_SQL, ARTICLE_CARD_COLUMNS_SQL, ArticleCard
 from .base import BaseRepository
 
 
@@ -34,18 +36,36 @@ class DailySuggestionRepository(BaseRepository[DailySuggestion]):
         return result.scalars().first()
 
     async def upsert_many(self, suggestions: Iterable[DailySuggestion]) -> list[DailySuggestion]:
-        stored: list[DailySuggestion] = []
+        """Insert suggestions, keeping the best rank per (day, article).
+
+        One ``INSERT ... ON CONFLICT (suggestion_date, article_id)`` for the
+        whole batch; an existing reason is kept.
+        """
+        rows: dict[tuple[date, UUID], dict] = {}
         for s in suggestions:
-            existing = await self.get_for_article_and_day(s.article_id, s.suggestion_date)
-            if existing:
-                existing.rank = min(existing.rank, s.rank)
-                existing.reason = existing.reason or s.reason
-                stored.append(existing)
+            key = (s.suggestion_date, s.article_id)
+            existing = rows.get(key)
+            if existing is None:
+                rows[key] = s.model_dump(exclude={"id"})
             else:
-                await self.add(s)
-                stored.append(s)
-        await self.flush()
-        return stored
+                existing["rank"] = min(existing["rank"], s.rank)
+                existing["reason"] = existing["reason"] or s.reason
+        if not rows:
+            return []
+
+        t = DailySuggestion.__table__
+        stmt = insert(DailySuggestion).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[t.c.suggestion_date, t.c.article_id],
+            set_={
+                "rank": func.least(t.c.rank, stmt.excluded.rank),
+                "reason": func.coalesce(t.c.reason, stmt.excluded.reason),
+            },
+        ).returning(DailySuggestion)
+        result = await self.session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        )
+        return list(result.all())
 
     async def get_last_day(self) -> Optional[date]:
         stmt = (
@@ -56,6 +76,13 @@ class DailySuggestionRepository(BaseRepository[DailySuggestion]):
         result = await self.session.execute(stmt)
         return result.scalars().first()
 
+    async def get_max_rank(self, d: date) -> int:
+        stmt = select(func.coalesce(func.max(DailySuggestion.rank), 0)).where(
+            DailySuggestion.suggestion_date == d
+        )
+        result = await self.session.execute(stmt)
+        return int(result.scalar_one())
+
     async def list_categories_for_day(self, d: date) -> list[str]:
         """Return distinct non-empty categories for a suggestion date.
 
@@ -73,3 +100,44 @@ class DailySuggestionRepository(BaseRepository[DailySuggestion]):
         res = await self.session.execute(sql, {"d": d})
         cats = [row[0] for row in res.all() if row[0]]
         return cats
+
+    async def list_cards_for_day(self, d: date, *, summary_chars: int = 300) -> list[ArticleCard]:
+        """Article cards for a suggestion date in rank order.
+
+        The summary is the suggestion reason, else the article text, cut to
+        ``summary_chars`` in SQL so full texts never leave the database.
+        """
+        sql = text(
+            f"""
+            SELECT {ARTICLE_CARD_COLUMNS_SQL},
+                   left(coalesce(nullif(s.reason, ''), a.content_text), :n) AS summary
+            FROM daily_suggestion s
+            JOIN article a ON a.id = s.article_id
+            {ARTICLE_KEYWORDS_SQL}
+            WHERE s.suggestion_date = :d
+            ORDER BY s.rank ASC
+            """
+        )
+        res = await self.session.execute(sql, {"d": d, "n": summary_chars})
+        return [ArticleCard.from_row(row) for row in res.all()]
+
+    async def top_keywords_for_day(self, d: date, limit: int = 10) -> list[tuple[str, int]]:
+        """Most frequent article keywords for a suggestion date, counted once per article.
+
+        Ties are broken by keyword in code point order.
+        """
+        sql = text(
+            f"""
+            SELECT t.keyword, count(*) AS cnt
+            FROM daily_suggestion s
+            JOIN article a ON a.id = s.article_id
+            {ARTICLE_KEYWORDS_SQL}
+            CROSS JOIN LATERAL unnest(kw.keywords) AS t(keyword)
+            WHERE s.suggestion_date = :d
+            GROUP BY t.keyword
+            ORDER BY cnt DESC, t.keyword COLLATE "C" ASC
+            LIMIT :limit
+            """
+        )
+        res = await self.session.execute(sql, {"d": d, "limit": limit})
+        return [(row[0], int(row[1])) for row in res.all()]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from core.models import FeaturedSnapshot
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from .base import BaseRepository
+
+
+class FeaturedSnapshotRepository(BaseRepository[FeaturedSnapshot]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    async def get_latest(self, on_or_before: date) -> Optional[FeaturedSnapshot]:
+        stmt = (
+            select(FeaturedSnapshot)
+            .where(FeaturedSnapshot.day <= on_or_before)
+            .order_by(FeaturedSnapshot.day.desc())
+            .limit(1)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().first()
+
+    async def save(self, day: date, *, payload: dict, etag: str) -> None:
+        stmt = insert(FeaturedSnapshot).values(
+            day=day,
+            payload=payload,
+            etag=etag,
+            built_at=datetime.now(timezone.utc),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FeaturedSnapshot.day],
+            set_={
+                "payload": stmt.excluded.payload,
+                "etag": stmt.excluded.etag,
+                "built_at": stmt.excluded.built_at,
+            },
+        )
+        await self.session.execute(stmt)
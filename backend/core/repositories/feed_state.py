@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from core.models import FeedState
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .base import BaseRepository
+
+
+class FeedStateRepository(BaseRepository[FeedState]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    async def get_by_url(self, url: str) -> Optional[FeedState]:
+        return await self.session.get(FeedState, url)
+
+    async def save(
+        self,
+        url: str,
+        *,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        stmt = insert(FeedState).values(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            checked_at=datetime.now(timezone.utc),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FeedState.url],
+            set_={
+                "etag": stmt.excluded.etag,
+                "last_modified": stmt.excluded.last_modified,
+                "checked_at": stmt.excluded.checked_at,
+            },
+        )
+        await self.session.execute(stmt)
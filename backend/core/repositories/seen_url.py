@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Optional
+
+from core.models import Article, DiscoveredUrl
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from .base import BaseRepository
+
+
+class SeenUrlRepository(BaseRepository[DiscoveredUrl]):
+    """Known article URLs: stored articles plus URLs fetched by discover."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    async def count_known_urls(self) -> int:
+        articles = await self.session.scalar(select(func.count()).select_from(Article))
+        discovered = await self.session.scalar(select(func.count()).select_from(DiscoveredUrl))
+        return (articles or 0) + (discovered or 0)
+
+    async def iter_known_urls(self, batch_size: int = 5000) -> AsyncIterator[str]:
+        """Stream every known URL through a server-side cursor, ``batch_size`` rows at a time."""
+        for column in (Article.url, DiscoveredUrl.url):
+            result = await self.session.stream_scalars(
+                select(column).execution_options(yield_per=batch_size)
+            )
+            async for url in result:
+                yield url
+
+    async def prune_discovered(self, older_than: datetime) -> int:
+        """Forget discovered URLs first seen before ``older_than``; returns rows deleted."""
+        result = await self.session.execute(
+            delete(DiscoveredUrl).where(col(DiscoveredUrl.first_seen_at) < older_than)
+        )
+        return result.rowcount or 0
+
+    async def find_existing(self, urls: Iterable[str]) -> set[str]:
+        """Return the subset of ``urls`` stored as article or discovered URLs."""
+        urls_list = list(dict.fromkeys(urls))
+        if not urls_list:
+            return set()
+        articles = await self.session.execute(
+            select(Article.url).where(col(Article.url).in_(urls_list))
+        )
+        discovered = await self.session.execute(
+            select(DiscoveredUrl.url).where(col(DiscoveredUrl.url).in_(urls_list))
+        )
+        return set(articles.scalars().all()) | set(discovered.scalars().all())
+
+    async def mark_seen(self, urls: Iterable[str], source_url: Optional[str] = None) -> None:
+        rows = [{"url": u, "source_url": source_url} for u in dict.fromkeys(urls)]
+        if not rows:
+            return
+        stmt = insert(DiscoveredUrl).values(rows).on_conflict_do_nothing(
+            index_elements=[DiscoveredUrl.url]
+        )
+        await self.session.execute(stmt)
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 import base64
+import sys
+from dataclasses import dataclass, fields, is_dataclass
 from typing import Optional
+from uuid import UUID
 
 import logfire
 from core.repositories.conversation import ConversationRepository
+from core.services.cache import LRUCache
+from core.services.history import compact_history
 from core.utils import extract_tool_return_parts
 from loguru import logger
 from pydantic import BaseModel
 from pydantic_ai import BinaryContent
 from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter
 from pydantic_core import to_jsonable_python
+from settings import settings
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -20,6 +26,30 @@ class BinaryContentIn(BaseModel):
     identifier: str | None = None
 
 
+@dataclass(frozen=True)
+class _ParsedHistory:
+    run_ids: tuple[UUID, ...]
+    messages: tuple[ModelMessage, ...]
+
+
+def _estimate_size(value: object) -> int:
+    """Approximate memory held by parsed messages, for the history cache budget."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, bytearray)):
+        return size
+    if isinstance(value, dict):
+        return size + sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return size + sum(_estimate_size(v) for v in value)
+    if is_dataclass(value):
+        return size + sum(_estimate_size(getattr(value, f.name)) for f in fields(value))
+    return size
+
+
+# Validated history per conversation; entries are replaced, never mutated
+_history_cache: LRUCache[_ParsedHistory] = LRUCache(max_bytes=settings.history_cache_max_bytes)
+
+
 class BaseConversationService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -29,23 +59,79 @@ class BaseConversationService:
         return await self.conversation_repo.get_by_id(conversation_id)
 
     async def load_message_history(self, conversation_id) -> list[ModelMessage]:
-        message_history: list[ModelMessage] = []
+        """Validated, compacted messages of all runs, reusing the parsed cache.
+
+        Only run ids are read up front; runs missing from the cached
+        version are loaded and validated. A cache whose run ids are not a
+        prefix of the stored ones (e.g. a rolled-back run) is rebuilt. The
+        full history stays cached; ``compact_history`` bounds what is
+        returned for the model.
+        """
         try:
-            runs = await self.conversation_repo.list_message_runs(conversation_id)
-            for r in runs:
-                msgs = ModelMessagesTypeAdapter.validate_python(r.messages)
-                logfire.info("Message history", msgs=msgs)
-                message_history.extend(msgs)
+            run_ids = tuple(await self.conversation_repo.list_message_run_ids(conversation_id))
+            entry = _history_cache.get(conversation_id)
+            cached = entry.value if entry is not None else None
+            size = entry.size if entry is not None else 0
+            if cached is None or run_ids[: len(cached.run_ids)] != cached.run_ids:
+                cached, size = _ParsedHistory(run_ids=(), messages=()), 0
+
+            new_ids = run_ids[len(cached.run_ids) :]
+            if new_ids:
+                runs = await self.conversation_repo.list_message_runs_by_ids(list(new_ids))
+                by_id = {r.id: r for r in runs}
+                messages = list(cached.messages)
+                for run_id in new_ids:
+                    if run_id in by_id:
+                        parsed = ModelMessagesTypeAdapter.validate_python(by_id[run_id].messages)
+                        size += _estimate_size(parsed)
+                        messages.extend(parsed)
+                cached = _ParsedHistory(run_ids=run_ids, messages=tuple(messages))
+                _history_cache.set(
+                    conversation_id,
+                    cached,
+                    size=size,
+                    ttl=settings.history_cache_ttl_seconds,
+                )
+            logfire.info(
+                "Message history",
+                conversation_id=str(conversation_id),
+                runs=len(run_ids),
+                parsed_runs=len(new_ids),
+                messages=len(cached.messages),
+            )
         except Exception:
             logger.exception(
                 ("Failed to load message history from runs; proceeding without history")
             )
-        return message_history
+            return []
+        try:
+            return await compact_history(conversation_id, list(cached.messages))
+        except Exception:
+            logger.exception("Failed to compact message history; sending it in full")
+            return list(cached.messages)
 
     async def persist_message_run(
         self, conversation: object, jsonable_messages: list | dict
     ) -> None:
-        await self.conversation_repo.add_message_run(conversation, jsonable_messages)
+        run = await self.conversation_repo.add_message_run(conversation, jsonable_messages)
+        # Extend a cached history in place of re-reading it on the next turn
+        entry = _history_cache.get(run.conversation_id)
+        if entry is None:
+            return
+        try:
+            msgs = ModelMessagesTypeAdapter.validate_python(run.messages)
+        except Exception:
+            _history_cache.pop(run.conversation_id)
+            return
+        _history_cache.set(
+            run.conversation_id,
+            _ParsedHistory(
+                run_ids=(*entry.value.run_ids, run.id),
+                messages=(*entry.value.messages, *msgs),
+            ),
+            size=entry.size + _estimate_size(msgs),
+            ttl=settings.history_cache_ttl_seconds,
+        )
 
     def to_jsonable_messages(self, messages: list[ModelMessage]) -> list | dict:
         return to_jsonable_python(messages, bytes_mode="base64")
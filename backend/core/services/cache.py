@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheEntry(Generic[V]):
+    value: V
+    size: int
+    fresh_until: float
+    stale_until: float
+
+    @property
+    def is_fresh(self) -> bool:
+        return monotonic() < self.fresh_until
+
+    @property
+    def ttl_remaining(self) -> float:
+        return max(self.fresh_until - monotonic(), 0.0)
+
+
+class LRUCache(Generic[V]):
+    """In-process LRU cache with per-entry TTL and a byte budget.
+
+    Entries stay readable until ``stale_until`` so callers can serve stale
+    values while refreshing them; ``CacheEntry.is_fresh`` tells them apart.
+    Not thread-safe; meant for use from a single event loop.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: Optional[int] = None) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, CacheEntry[V]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[CacheEntry[V]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if monotonic() >= entry.stale_until:
+            self.pop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(
+        self,
+        key: Hashable,
+        value: V,
+        *,
+        size: int,
+        ttl: float,
+        stale_ttl: float = 0.0,
+    ) -> None:
+        if size > self.max_bytes:
+            return
+        self.pop(key)
+        now = monotonic()
+        self._entries[key] = CacheEntry(
+            value=value,
+            size=size,
+            fresh_until=now + ttl,
+            stale_until=now + ttl + stale_ttl,
+        )
+        self._bytes += size
+        self._evict()
+
+    def pop(self, key: Hashable) -> Optional[CacheEntry[V]]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _evict(self) -> None:
+        # Least recently used entries sit at the front
+        while self._entries and (
+            self._bytes > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+
+
+__all__ = ["CacheEntry", "LRUCache"]
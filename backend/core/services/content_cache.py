@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from core.repositories.crawl_cache import CrawlCacheRepository
+from core.services.cache import LRUCache
+from core.utils import normalize_url
+from db import AsyncSessionLocal
+from loguru import logger
+from settings import settings
+
+# Prune the Postgres tier after this many writes
+_PRUNE_EVERY_N_WRITES = 50
+
+
+class ContentCache:
+    """Two-tier cache of crawled pages (in-process LRU, then Postgres).
+
+    Values are the list of ``CrawlResult`` dicts returned by ``crawl_one``.
+    Database errors are logged and treated as misses so crawling never
+    depends on the cache being available.
+    """
+
+    def __init__(self) -> None:
+        self._memory: LRUCache[list[dict]] = LRUCache(max_bytes=settings.crawl_cache_memory_bytes)
+        self._writes = 0
+
+    @staticmethod
+    def make_key(
+        url: str,
+        *,
+        pruned: bool,
+        ignore_links: bool,
+        ignore_images: bool,
+        escape_html: bool,
+    ) -> str:
+        raw = json.dumps(
+            [
+                normalize_url(url),
+                pruned,
+                ignore_links,
+                ignore_images,
+                escape_html,
+            ]
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[list[dict]]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            return [dict(r) for r in entry.value]
+
+        try:
+            async with AsyncSessionLocal() as session:
+                row = await CrawlCacheRepository(session).get_fresh(key)
+        except Exception:
+            logger.exception("Crawl cache lookup failed; treating as miss")
+            return None
+        if row is None:
+            return None
+
+        ttl = (row.expires_at - datetime.now(timezone.utc)).total_seconds()
+        self._memory.set(key, row.results, size=row.size_bytes, ttl=max(ttl, 0.0))
+        return [dict(r) for r in row.results]
+
+    async def put(self, key: str, url: str, results: list[dict]) -> None:
+        payload = [dict(r) for r in results]
+        size_bytes = len(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        ttl = settings.crawl_cache_ttl_seconds
+        self._memory.set(key, payload, size=size_bytes, ttl=ttl)
+
+        try:
+            async with AsyncSessionLocal() as session:
+                repo = CrawlCacheRepository(session)
+                await repo.put(
+                    key=key,
+                    url=normalize_url(url),
+                    results=payload,
+                    size_bytes=size_bytes,
+                    expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl),
+                )
+                self._writes += 1
+                if self._writes % _PRUNE_EVERY_N_WRITES == 0:
+                    removed = await repo.prune(settings.crawl_cache_db_bytes)
+                    logger.debug("Pruned {} crawl cache rows", removed)
+                await session.commit()
+        except Exception:
+            logger.exception("Failed to store crawl cache entry for {}", url)
+
+    def stats(self) -> dict:
+        return self._memory.stats()
+
+
+__all__ = ["ContentCache"]
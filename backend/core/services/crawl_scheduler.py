@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import AsyncIterator, Iterable, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+from core.services.cache import LRUCache
+from core.services.http_fetcher import HttpFetcher
+from core.services.singleflight import SingleFlight
+from loguru import logger
+from settings import settings
+
+
+def host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def same_host(url: str, other: str) -> bool:
+    """Whether two URLs share a host, treating ``www.`` as the bare host."""
+    return host_of(url).removeprefix("www.") == host_of(other).removeprefix("www.")
+
+
+def interleave_by_host(urls: Iterable[str]) -> list[str]:
+    """Reorder URLs round-robin across hosts, keeping per-host order."""
+    by_host: OrderedDict[str, list[str]] = OrderedDict()
+    for u in urls:
+        by_host.setdefault(host_of(u), []).append(u)
+    queues = list(by_host.values())
+    ordered: list[str] = []
+    while queues:
+        for q in queues:
+            ordered.append(q.pop(0))
+        queues = [q for q in queues if q]
+    return ordered
+
+
+@dataclass
+class _RobotsEntry:
+    parser: Optional[RobotFileParser]
+    expires_at: float
+    # Approximate memory held by the parsed rules
+    size: int = 256
+
+
+class RobotsCache:
+    """Caches robots.txt per origin; fetch errors are treated as allow-all.
+
+    Entries expire after their TTL and the least recently used origins are
+    evicted beyond ``crawl_robots_cache_max_entries`` or
+    ``crawl_robots_cache_max_bytes``.
+    """
+
+    def __init__(self, http: HttpFetcher) -> None:
+        self._http = http
+        self._entries: LRUCache[_RobotsEntry] = LRUCache(
+            max_bytes=settings.crawl_robots_cache_max_bytes,
+            max_entries=settings.crawl_robots_cache_max_entries,
+        )
+        self._flight = SingleFlight("robots")
+
+    async def get(self, url: str) -> Optional[RobotFileParser]:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        cached = self._entries.get(origin)
+        if cached is not None and cached.is_fresh:
+            return cached.value.parser
+        entry = await self._flight.do(origin, lambda: self._load(origin))
+        self._entries.set(
+            origin, entry, size=entry.size, ttl=max(entry.expires_at - monotonic(), 0.0)
+        )
+        return entry.parser
+
+    async def can_fetch(self, url: str) -> bool:
+        parser = await self.get(url)
+        return parser is None or parser.can_fetch(settings.crawl_robots_user_agent, url)
+
+    async def crawl_delay(self, url: str) -> Optional[float]:
+        parser = await self.get(url)
+        if parser is None:
+            return None
+        delay = parser.crawl_delay(settings.crawl_robots_user_agent)
+        return float(delay) if delay is not None else None
+
+    async def sitemaps(self, url: str) -> list[str]:
+        parser = await self.get(url)
+        return list((parser.site_maps() if parser else None) or [])
+
+    async def _load(self, origin: str) -> _RobotsEntry:
+        ttl = settings.crawl_robots_ttl_seconds
+        try:
+            session = await self._http.get_session()
+            async with session.get(f"{origin}/robots.txt") as response:
+                if response.status >= 500:
+                    # Transient server error: allow, but retry soon
+                    return _RobotsEntry(parser=None, expires_at=monotonic() + 300)
+                if response.status != 200:
+                    return _RobotsEntry(parser=None, expires_at=monotonic() + ttl)
+                body = await response.text(errors="replace")
+        except Exception as exc:
+            logger.debug("robots.txt unavailable for {}: {}", origin, exc)
+            return _RobotsEntry(parser=None, expires_at=monotonic() + 300)
+        parser = RobotFileParser()
+        parser.parse(body.splitlines())
+        return _RobotsEntry(parser=parser, expires_at=monotonic() + ttl, size=256 + len(body))
+
+
+@dataclass
+class _HostState:
+    semaphore: asyncio.Semaphore
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    next_allowed: float = 0.0
+
+
+class HostScheduler:
+    """Per-host politeness for crawls.
+
+    - Caps concurrent fetches per host (``crawl_per_host_concurrency``)
+    - Spaces requests to a host by its robots.txt Crawl-delay, falling back to
+      ``crawl_default_delay_seconds`` and capped at ``crawl_max_delay_seconds``
+    - Answers robots.txt allow checks from a cache
+    Callers should take a host slot before any global concurrency limit so a
+    queue on one busy host never holds capacity other hosts could use.
+    State is kept for at most ``crawl_host_state_max_entries`` hosts; the
+    least recently used idle hosts are dropped first.
+    """
+
+    def __init__(self, http: HttpFetcher) -> None:
+        self.robots = RobotsCache(http)
+        self._hosts: OrderedDict[str, _HostState] = OrderedDict()
+
+    async def allowed(self, url: str) -> bool:
+        if not settings.crawl_respect_robots:
+            return True
+        return await self.robots.can_fetch(url)
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        state = self._state(host_of(url))
+        async with state.semaphore:
+            delay = await self._delay_for(url)
+            async with state.lock:
+                now = monotonic()
+                wait_s = state.next_allowed - now
+                state.next_allowed = max(now, state.next_allowed) + delay
+            if wait_s > 0:
+                await asyncio.sleep(wait_s)
+            yield
+
+    def stats(self) -> dict:
+        return {
+            host: {"available": s.semaphore._value}  # noqa: SLF001
+            for host, s in self._hosts.items()
+        }
+
+    async def _delay_for(self, url: str) -> float:
+        delay = settings.crawl_default_delay_seconds
+        if settings.crawl_respect_robots:
+            robots_delay = await self.robots.crawl_delay(url)
+            if robots_delay is not None:
+                delay = max(delay, min(robots_delay, settings.crawl_max_delay_seconds))
+        return delay
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(semaphore=asyncio.Semaphore(settings.crawl_per_host_concurrency))
+            self._hosts[host] = state
+            self._evict(keep=host)
+        else:
+            self._hosts.move_to_end(host)
+        return state
+
+    def _evict(self, keep: str) -> None:
+        excess = len(self._hosts) - settings.crawl_host_state_max_entries
+        if excess <= 0:
+            return
+        now = monotonic()
+        # Hosts with fetches in flight or a pending delay must keep their state,
+        # as must the host being checked out; with none idle the table overshoots
+        idle = [
+            host
+            for host, s in self._hosts.items()
+            if host != keep
+            and s.semaphore._value == settings.crawl_per_host_concurrency  # noqa: SLF001
+            and not s.lock.locked()
+            and s.next_allowed <= now
+        ]
+        for host in idle[:excess]:
+            del self._hosts[host]
+
+
+__all__ = ["HostScheduler", "RobotsCache", "host_of", "interleave_by_host", "same_host"]
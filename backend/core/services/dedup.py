@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter, defaultdict
+from typing import Iterable, Optional
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+_BITS = 64
+_MASK = (1 << _BITS) - 1
+
+
+def simhash(
+    text: str,
+    *,
+    shingle_size: int = 3,
+    max_words: int = 1500,
+    min_words: int = 30,
+) -> Optional[int]:
+    """64-bit SimHash over word shingles; ``None`` for texts too short to compare."""
+    words = [w.casefold() for w in _WORD_RE.findall(text)][:max_words]
+    if len(words) < min_words:
+        return None
+    grams: Counter[int] = Counter(
+        int.from_bytes(
+            hashlib.blake2b(" ".join(words[i : i + shingle_size]).encode("utf-8"), digest_size=8).digest(),
+            "little",
+        )
+        for i in range(len(words) - shingle_size + 1)
+    )
+    total = sum(grams.values())
+    fp = 0
+    for bit in range(_BITS):
+        ones = sum(w for h, w in grams.items() if (h >> bit) & 1)
+        if 2 * ones > total:
+            fp |= 1 << bit
+    return fp
+
+
+def simhashes(texts: list[str]) -> list[Optional[int]]:
+    """Batch ``simhash`` so one executor round trip covers a whole source."""
+    return [simhash(t) for t in texts]
+
+
+def hamming(a: int, b: int) -> int:
+    return ((a ^ b) & _MASK).bit_count()
+
+
+def format_simhash(fp: int) -> str:
+    return f"{fp:016x}"
+
+
+def parse_simhash(value: object) -> Optional[int]:
+    try:
+        return int(str(value), 16)
+    except (TypeError, ValueError):
+        return None
+
+
+class SimHashIndex:
+    """LSH index over SimHash fingerprints for Hamming-distance lookups.
+
+    Fingerprints are split into ``max_distance + 1`` bands; by pigeonhole
+    two fingerprints within ``max_distance`` bits share at least one band
+    exactly, so only keys in matching buckets are compared.
+    """
+
+    def __init__(self, max_distance: int = 3) -> None:
+        self.max_distance = max_distance
+        self._n_bands = max_distance + 1
+        self._band_bits = _BITS // self._n_bands
+        self._buckets: list[dict[int, list[str]]] = [defaultdict(list) for _ in range(self._n_bands)]
+        self._fingerprints: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def add(self, key: str, fp: int) -> None:
+        if key in self._fingerprints:
+            return
+        self._fingerprints[key] = fp
+        for band, bucket in zip(self._bands(fp), self._buckets):
+            bucket[band].append(key)
+
+    def near(self, fp: int) -> list[tuple[str, int]]:
+        """Keys within ``max_distance`` of ``fp``, closest first."""
+        candidates: set[str] = set()
+        for band, bucket in zip(self._bands(fp), self._buckets):
+            candidates.update(bucket.get(band, ()))
+        matches = [(k, hamming(fp, self._fingerprints[k])) for k in candidates]
+        return sorted((m for m in matches if m[1] <= self.max_distance), key=lambda m: m[1])
+
+    def _bands(self, fp: int) -> Iterable[int]:
+        mask = (1 << self._band_bits) - 1
+        # The last band absorbs leftover bits when 64 is not evenly divisible
+        for i in range(self._n_bands):
+            shift = i * self._band_bits
+            if i == self._n_bands - 1:
+                yield fp >> shift
+            else:
+                yield (fp >> shift) & mask
+
+
+class NearDuplicateFilter:
+    """Collapses near-duplicate crawl results within a run and against history.
+
+    Seeded with fingerprints of recently stored articles, which are dropped
+    on match. Within the run, the first (longest, per batch) page of a
+    cluster is kept, tagged with ``metadata["simhash"]``, and lists the
+    collapsed URLs in ``metadata["duplicate_urls"]``.
+    """
+
+    def __init__(self, known: Iterable[tuple[str, int]] = (), max_distance: int = 3) -> None:
+        self._index = SimHashIndex(max_distance=max_distance)
+        for url, fp in known:
+            self._index.add(url, fp)
+        self._kept: dict[str, dict] = {}
+        self.dropped = 0
+
+    def collapse(self, items: list[dict], fingerprints: list[Optional[int]]) -> list[dict]:
+        by_length = sorted(
+            range(len(items)), key=lambda i: len(items[i].get("content") or ""), reverse=True
+        )
+        keep: set[int] = set()
+        for i in by_length:
+            item, fp = items[i], fingerprints[i]
+            if fp is None:
+                keep.add(i)
+                continue
+            matches = self._index.near(fp)
+            if matches:
+                self.dropped += 1
+                representative = self._kept.get(matches[0][0])
+                if representative is not None:
+                    representative["metadata"].setdefault("duplicate_urls", []).append(item.get("url", ""))
+                continue
+            meta = dict(item.get("metadata") or {})
+            meta["simhash"] = format_simhash(fp)
+            item["metadata"] = meta
+            url = item.get("url", "")
+            self._index.add(url, fp)
+            self._kept[url] = item
+            keep.add(i)
+        return [items[i] for i in range(len(items)) if i in keep]
+
+
+__all__ = [
+    "NearDuplicateFilter",
+    "SimHashIndex",
+    "format_simhash",
+    "hamming",
+    "parse_simhash",
+    "simhash",
+    "simhashes",
+]
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from datetime import datetime
+from time import monotonic
+from typing import Iterable, Optional
+from uuid import UUID
+
+import logfire
+import numpy as np
+from aiohttp import ClientSession, ClientTimeout
+from core.repositories import ArticleEmbeddingRepository
+from core.services.prompt_packer import lead_text
+from db import AsyncSessionLocal
+from loguru import logger
+from settings import settings
+
+_GOOGLE_EMBED_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:batchEmbedContents"
+
+
+def chunk_text(
+    text: str,
+    *,
+    max_chars: int = 1500,
+    overlap: int = 200,
+    max_chunks: int = 8,
+) -> list[str]:
+    """Split markdown ``text`` into paragraph-aligned chunks of about ``max_chars``.
+
+    Images, link URLs and blocks without prose are dropped first. Each
+    chunk after the first starts with the last ``overlap`` characters of
+    the previous one, so sentences on a boundary stay searchable.
+    """
+    clean = lead_text(text, 10**9)
+    chunks: list[str] = []
+    current = ""
+    for para in clean.split("\n"):
+        while len(para) > max_chars:
+            head, para = para[:max_chars], para[max_chars:]
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(head)
+        if current and len(current) + len(para) + 1 > max_chars:
+            chunks.append(current)
+            tail = current[-overlap:] if overlap else ""
+            # Start the overlap on a word boundary
+            current = re.sub(r"^\S*\s", "", tail) if " " in tail else ""
+        current = f"{current}\n{para}" if current else para
+        if len(chunks) >= max_chunks:
+            break
+    if current and len(chunks) < max_chunks:
+        chunks.append(current)
+    return chunks[:max_chunks]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+class EmbeddingClient:
+    """Batch text embeddings over HTTP (Gemini, OpenAI or an OpenAI-compatible server)."""
+
+    def __init__(self) -> None:
+        self.provider = settings.embedding_provider
+        self.model = settings.embedding_model
+        self.dimensions = settings.embedding_dimensions
+
+    async def embed(self, texts: list[str], *, query: bool = False) -> np.ndarray:
+        """L2-normalized float32 vectors, one row per text."""
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        rows: list[list[float]] = []
+        async with ClientSession(timeout=ClientTimeout(total=60)) as session:
+            for start in range(0, len(texts), settings.embedding_batch_size):
+                batch = texts[start : start + settings.embedding_batch_size]
+                if self.provider == "google":
+                    rows.extend(await self._embed_google(session, batch, query))
+                else:
+                    rows.extend(await self._embed_openai(session, batch))
+        return _normalize(np.asarray(rows, dtype=np.float32))
+
+    async def _embed_google(
+        self, session: ClientSession, texts: list[str], query: bool
+    ) -> list[list[float]]:
+        body = {
+            "requests": [
+                {
+                    "model": f"models/{self.model}",
+                    "content": {"parts": [{"text": t}]},
+                    "taskType": "RETRIEVAL_QUERY" if query else "RETRIEVAL_DOCUMENT",
+                    "outputDimensionality": self.dimensions,
+                }
+                for t in texts
+            ]
+        }
+        async with session.post(
+            _GOOGLE_EMBED_URL.format(model=self.model),
+            json=body,
+            headers={"x-goog-api-key": settings.google_api_key or ""},
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+        return [e["values"] for e in data["embeddings"]]
+
+    async def _embed_openai(self, session: ClientSession, texts: list[str]) -> list[list[float]]:
+        if self.provider == "ollama":
+            base_url, api_key = settings.ollama_base_url, "ollama"
+            body: dict = {"model": self.model, "input": texts}
+        else:
+            base_url, api_key = settings.embedding_base_url, settings.openai_api_key or ""
+            body = {"model": self.model, "input": texts, "dimensions": self.dimensions}
+        async with session.post(
+            f"{base_url.rstrip('/')}/embeddings",
+            json=body,
+            headers={"Authorization": f"Bearer {api_key}"},
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+        return [d["embedding"] for d in sorted(data["data"], key=lambda d: d["index"])]
+
+
+class EmbeddingIndex:
+    """Flat in-memory cosine index over ``article_embedding`` rows.
+
+    Vectors live in Postgres; each worker mirrors the rows for the
+    configured model into one NumPy matrix and loads new rows at most every
+    ``embedding_index_reload_seconds``. A query is a single matrix-vector
+    product, which stays in the low milliseconds up to ~10^5 chunks.
+    """
+
+    def __init__(self, client: Optional[EmbeddingClient] = None) -> None:
+        self.client = client or EmbeddingClient()
+        self._matrix = np.zeros((0, self.client.dimensions), dtype=np.float32)
+        self._keys: list[tuple[UUID, int]] = []
+        self._loaded_until: Optional[datetime] = None
+        self._fresh_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    async def refresh(self, *, force: bool = False) -> None:
+        if not force and monotonic() < self._fresh_until:
+            return
+        async with self._lock:
+            if not force and monotonic() < self._fresh_until:
+                return
+            async with AsyncSessionLocal() as session:
+                rows = await ArticleEmbeddingRepository(session).list_vectors(
+                    self.client.model, since=self._loaded_until
+                )
+            if rows:
+                vectors = np.frombuffer(b"".join(r[2] for r in rows), dtype="<f4").reshape(
+                    len(rows), -1
+                )
+                self._matrix = np.vstack([self._matrix, vectors]) if len(self._keys) else vectors
+                self._keys.extend((r[0], r[1]) for r in rows)
+                self._loaded_until = rows[-1][3]
+            self._fresh_until = monotonic() + settings.embedding_index_reload_seconds
+
+    @logfire.instrument("embeddings.index_pending")
+    async def index_pending(self, limit: Optional[int] = None) -> int:
+        """Chunk and embed the newest articles that have no vectors yet; returns chunks added.
+
+        Failures are recorded per article so they do not block newer ones:
+        articles with no prose are given up on, and a failed embedding call
+        backs off every article in the batch (``embedding_retry_base_seconds``,
+        doubling, at most ``embedding_max_attempts`` tries).
+        """
+        model = self.client.model
+        async with AsyncSessionLocal() as session:
+            pending = await ArticleEmbeddingRepository(session).list_unembedded(
+                model, limit or settings.embedding_index_batch_articles
+            )
+        chunks: list[tuple[UUID, int, str]] = []
+        empty: list[UUID] = []
+        for article_id, title, content in pending:
+            parts = chunk_text(
+                content,
+                max_chars=settings.embedding_chunk_chars,
+                overlap=settings.embedding_chunk_overlap,
+                max_chunks=settings.embedding_max_chunks_per_article,
+            )
+            if not parts:
+                empty.append(article_id)
+            # The title gives short chunks their topic
+            chunks.extend((article_id, i, f"{title}\n{p}" if title else p) for i, p in enumerate(parts))
+        if empty:
+            await self._record_failures(empty, "no text to embed", max_attempts=1)
+        if not chunks:
+            return 0
+
+        try:
+            vectors = await self.client.embed([c[2] for c in chunks])
+        except Exception as exc:
+            logger.exception("Embedding {} chunks failed", len(chunks))
+            await self._record_failures(
+                (c[0] for c in chunks), f"{type(exc).__name__}: {exc}"[:500]
+            )
+            return 0
+        async with AsyncSessionLocal() as session:
+            await ArticleEmbeddingRepository(session).add_many(
+                {
+                    "article_id": article_id,
+                    "model": model,
+                    "chunk_index": idx,
+                    "content": text,
+                    "embedding": vec.astype("<f4").tobytes(),
+                }
+                for (article_id, idx, text), vec in zip(chunks, vectors)
+            )
+            await session.commit()
+        logger.info("Embedded {} chunks from {} articles", len(chunks), len(pending))
+        await self.refresh(force=True)
+        return len(chunks)
+
+    async def _record_failures(
+        self, article_ids: Iterable[UUID], error: str, *, max_attempts: Optional[int] = None
+    ) -> None:
+        async with AsyncSessionLocal() as session:
+            await ArticleEmbeddingRepository(session).record_failures(
+                self.client.model,
+                article_ids,
+                error=error,
+                base_seconds=settings.embedding_retry_base_seconds,
+                max_attempts=max_attempts or settings.embedding_max_attempts,
+            )
+            await session.commit()
+
+    @logfire.instrument("embeddings.search")
+    async def search(self, query: str, k: int = 5) -> list[dict]:
+        """Top ``k`` articles by cosine similarity of their best chunk to ``query``."""
+        await self.refresh()
+        if not self._keys or not query.strip():
+            return []
+        qvec = (await self.client.embed([query], query=True))[0]
+        matrix, keys = self._matrix, self._keys
+        scores = await asyncio.to_thread(matrix.dot, qvec)
+
+        # Over-fetch chunks so several chunks of one article still leave k articles
+        n = min(len(keys), k * 4)
+        top = np.argpartition(-scores, n - 1)[:n]
+        best: dict[UUID, tuple[float, int]] = {}
+        for i in top[np.argsort(-scores[top])]:
+            article_id, chunk_index = keys[i]
+            if article_id not in best:
+                best[article_id] = (float(scores[i]), chunk_index)
+            if len(best) >= k:
+                break
+
+        async with AsyncSessionLocal() as session:
+            chunks = await ArticleEmbeddingRepository(session).get_chunks(
+                self.client.model, [(aid, idx) for aid, (_, idx) in best.items()]
+            )
+        results: list[dict] = []
+        for article_id, (score, chunk_index) in best.items():
+            found = chunks.get((article_id, chunk_index))
+            if found is None:
+                continue
+            content, title, url, published_at = found
+            results.append(
+                {
+                    "title": title,
+                    "url": url,
+                    "published_at": published_at.isoformat() if published_at else None,
+                    "score": round(score, 4),
+                    "content": content,
+                }
+            )
+        return results
+
+
+_index: Optional[EmbeddingIndex] = None
+
+
+def get_embedding_index() -> EmbeddingIndex:
+    global _index
+    if _index is None:
+        _index = EmbeddingIndex()
+    return _index
+
+
+__all__ = ["EmbeddingClient", "EmbeddingIndex", "chunk_text", "get_embedding_index"]
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import re
+from typing import Optional
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from crawl4ai.content_filter_strategy import PruningContentFilter
+from crawl4ai.markdown_generation_strategy import (
+    DefaultMarkdownGenerator,
+    MarkdownGenerationStrategy,
+)
+from crawl4ai.models import MarkdownGenerationResult
+from crawl4ai.utils import extract_metadata
+
+# Tags that never carry article text
+_NOISE_TAGS = ("script", "style", "noscript", "template", "svg", "iframe", "form")
+
+# Markers of pages that only render with JavaScript or sit behind a challenge
+_JS_ONLY_MARKERS = re.compile(
+    r"(enable javascript|bật javascript|javascript is (?:disabled|required)|"
+    r"cf-browser-verification|challenge-platform|just a moment\.\.\.|"
+    r"<div id=\"(?:root|app|__next)\">\s*</div>)",
+    re.IGNORECASE,
+)
+
+
+def build_markdown_generator(
+    *,
+    ignore_links: bool,
+    ignore_images: bool,
+    escape_html: bool,
+    pruned: bool,
+) -> DefaultMarkdownGenerator:
+    """Markdown generator shared by the browser and HTTP fetch paths."""
+    prune_filter = (
+        PruningContentFilter(
+            threshold=1.0,
+            threshold_type="fixed",
+            min_word_threshold=10,
+        )
+        if pruned
+        else None
+    )
+    return DefaultMarkdownGenerator(
+        options={
+            "ignore_links": ignore_links,
+            "ignore_images": ignore_images,
+            "escape_html": escape_html,
+        },
+        content_filter=prune_filter,
+    )
+
+
+class PassthroughMarkdownGenerator(MarkdownGenerationStrategy):
+    """Skips markdown generation inside crawl4ai.
+
+    The browser path extracts ``result.html`` afterwards via ``extract_page``
+    on the extraction executor instead of on the event loop.
+    """
+
+    def generate_markdown(
+        self,
+        input_html: str,
+        base_url: str = "",
+        html2text_options: Optional[dict] = None,
+        content_filter: Optional[object] = None,
+        citations: bool = True,
+        **kwargs,
+    ) -> MarkdownGenerationResult:
+        return MarkdownGenerationResult(
+            raw_markdown="",
+            markdown_with_citations="",
+            references_markdown="",
+            fit_markdown="",
+            fit_html="",
+        )
+
+
+def build_crawl_result(
+    url: str,
+    raw_markdown: str,
+    fit_markdown: str,
+    metadata: dict,
+) -> dict:
+    """Assemble a ``CrawlResult`` dict, preferring pruned markdown when present."""
+    content = fit_markdown if len(fit_markdown.replace("\n", "").strip()) > 1 else raw_markdown
+    image_url = metadata.get("og:image", metadata.get("twitter:image", "")) or ""
+    title = (
+        metadata.get(
+            "title",
+            metadata.get("og:title", metadata.get("twitter:title", "")),
+        )
+        or ""
+    )
+    description = (
+        metadata.get(
+            "description",
+            metadata.get("og:description", metadata.get("twitter:description", "")),
+        )
+        or ""
+    )
+    return {
+        "url": url,
+        "title": title,
+        "description": description,
+        "content": content,
+        "image_url": image_url,
+        "metadata": metadata,
+    }
+
+
+def extract_page(
+    html: str,
+    url: str,
+    *,
+    ignore_links: bool = True,
+    ignore_images: bool = False,
+    escape_html: bool = False,
+    pruned: bool = True,
+) -> dict:
+    """Turn a fetched HTML document into a ``CrawlResult`` dict without a browser.
+
+    Pure and CPU-bound: safe to run in a worker thread or process.
+    """
+    metadata = extract_metadata(html) or {}
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup(_NOISE_TAGS):
+        tag.decompose()
+    body = soup.body or soup
+    generator = build_markdown_generator(
+        ignore_links=ignore_links,
+        ignore_images=ignore_images,
+        escape_html=escape_html,
+        pruned=pruned,
+    )
+    markdown = generator.generate_markdown(input_html=str(body), base_url=url, citations=False)
+    return build_crawl_result(
+        url,
+        str(markdown.raw_markdown or ""),
+        str(markdown.fit_markdown or ""),
+        metadata,
+    )
+
+
+def extract_links(html: str, base_url: str) -> list[str]:
+    """Absolute http(s) links in ``html``, de-duplicated, fragments removed."""
+    soup = BeautifulSoup(html, "lxml")
+    links: dict[str, None] = {}
+    for a in soup.find_all("a", href=True):
+        href = urljoin(base_url, a["href"].strip()).split("#", 1)[0]
+        if href.startswith(("http://", "https://")):
+            links[href] = None
+    return list(links)
+
+
+def looks_incomplete(html: str, result: dict, *, min_content_chars: int) -> bool:
+    """Whether an HTTP-fetched page probably needs a real browser to render."""
+    text = re.sub(r"\s+", " ", result.get("content") or "").strip()
+    if len(text) < min_content_chars:
+        return True
+    # Short pages with JS-only markers are app shells or bot challenges
+    return bool(_JS_ONLY_MARKERS.search(html)) and len(text) < 4 * min_content_chars
+
+
+__all__ = [
+    "PassthroughMarkdownGenerator",
+    "build_crawl_result",
+    "build_markdown_generator",
+    "extract_links",
+    "extract_page",
+    "looks_incomplete",
+]
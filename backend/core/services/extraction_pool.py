@@ -0,0 +1,215 @@
+"""Run CPU-bound page extraction off the event loop.
+
+Benchmark event-loop lag per executor mode with::
+
+    python -m core.services.extraction_pool --pages 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from time import monotonic
+from typing import Callable, Optional, TypeVar
+
+from core.services.extraction import extract_links, extract_page
+from loguru import logger
+from settings import settings
+
+T = TypeVar("T")
+
+_executor: Optional[Executor] = None
+
+
+def _create_executor(mode: str, workers: int) -> Optional[Executor]:
+    if mode == "process":
+        # Spawn rather than fork: the parent runs threads and browser drivers
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    if mode == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract")
+    return None
+
+
+def get_executor() -> Optional[Executor]:
+    """Shared extraction executor, created on first use; ``None`` when inline."""
+    global _executor
+    if _executor is None and settings.extraction_executor != "inline":
+        _executor = _create_executor(settings.extraction_executor, settings.extraction_workers)
+        logger.info(
+            "Started {} extraction executor with {} workers",
+            settings.extraction_executor,
+            settings.extraction_workers,
+        )
+    return _executor
+
+
+async def warm_executor() -> None:
+    """Start the shared executor and load the extraction code in its workers.
+
+    Call from the app lifespan: process workers are spawned lazily and each
+    imports crawl4ai, which otherwise delays the first crawl by seconds.
+    """
+    executor = get_executor()
+    if executor is None:
+        return
+    started = monotonic()
+    await _warm(executor, settings.extraction_workers)
+    logger.info("Warmed extraction executor in {:.2f}s", monotonic() - started)
+
+
+async def _warm(executor: Executor, workers: int) -> None:
+    # One call per worker; spawn-mode pools start a process per pending call
+    call = partial(extract_links, "<a href='/'>x</a>", "https://example.com/")
+    await asyncio.gather(*(_run(executor, call) for _ in range(workers)))
+
+
+def shutdown_executor() -> None:
+    """Stop the shared executor; call from the app lifespan."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _discard_broken(executor: Executor) -> None:
+    # A worker died (e.g. OOM); rebuild the pool on next use
+    logger.warning("Extraction process pool broke; recreating")
+    if executor is _executor:
+        shutdown_executor()
+
+
+async def _run(executor: Optional[Executor], call: Callable[[], T]) -> T:
+    if executor is None:
+        return call()
+    try:
+        future = asyncio.get_running_loop().run_in_executor(executor, call)
+    except BrokenProcessPool:
+        _discard_broken(executor)
+        return call()
+    except RuntimeError:
+        # Submitted during or after shutdown_executor(), e.g. while the app stops
+        logger.debug("Extraction executor is shut down; extracting inline")
+        return call()
+    try:
+        return await future
+    except BrokenProcessPool:
+        _discard_broken(executor)
+        return call()
+
+
+async def run_extraction(
+    html: str,
+    url: str,
+    *,
+    ignore_links: bool = True,
+    ignore_images: bool = False,
+    escape_html: bool = False,
+    pruned: bool = True,
+) -> dict:
+    """``extract_page`` on the configured executor."""
+    call = partial(
+        extract_page,
+        html,
+        url,
+        ignore_links=ignore_links,
+        ignore_images=ignore_images,
+        escape_html=escape_html,
+        pruned=pruned,
+    )
+    return await _run(get_executor(), call)
+
+
+async def run_link_extraction(html: str, base_url: str) -> list[str]:
+    """``extract_links`` on the configured executor."""
+    return await _run(get_executor(), partial(extract_links, html, base_url))
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: object) -> T:
+    """Run a picklable module-level function on the extraction executor."""
+    return await _run(get_executor(), partial(func, *args))
+
+
+def _sample_html(paragraphs: int) -> str:
+    body = "".join(
+        f"<div class='item'><h3><a href='/tin-{i}'>Tiêu đề bài viết số {i}</a></h3>"
+        f"<p>{'Nội dung đoạn văn mô phỏng trang tin tức với nhiều chữ. ' * 12}</p>"
+        f"<img src='/img/{i}.jpg'/></div>"
+        for i in range(paragraphs)
+    )
+    return (
+        "<html><head><title>Trang chủ</title><meta property='og:title' content='Trang chủ'/>"
+        "<script>var x = 1;</script></head>"
+        f"<body><nav>Menu</nav><main>{body}</main><footer>Footer</footer></body></html>"
+    )
+
+
+async def _benchmark(mode: str, pages: int, paragraphs: int, workers: int, warm: bool) -> dict:
+    executor = _create_executor(mode, workers)
+    warmup = monotonic()
+    if warm and executor is not None:
+        await _warm(executor, workers)
+    warmup = monotonic() - warmup
+    html = _sample_html(paragraphs)
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def _monitor(interval: float = 0.01) -> None:
+        while not done.is_set():
+            started = monotonic()
+            await asyncio.sleep(interval)
+            lags.append(monotonic() - started - interval)
+
+    monitor = asyncio.create_task(_monitor())
+    started = monotonic()
+    await asyncio.gather(
+        *(
+            _run(executor, partial(extract_page, html, f"https://example.com/{i}"))
+            for i in range(pages)
+        )
+    )
+    elapsed = monotonic() - started
+    done.set()
+    await monitor
+    if executor is not None:
+        executor.shutdown()
+
+    lags.sort()
+    return {
+        "mode": mode,
+        "warmup_seconds": round(warmup, 2),
+        "seconds": round(elapsed, 2),
+        "max_lag_ms": round(lags[-1] * 1000, 1) if lags else 0.0,
+        "p99_lag_ms": round(lags[int(len(lags) * 0.99)] * 1000, 1) if lags else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Event-loop lag during page extraction")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--paragraphs", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=settings.extraction_workers)
+    parser.add_argument("--cold", action="store_true", help="skip warming the executor first")
+    args = parser.parse_args()
+    for mode in ("inline", "thread", "process"):
+        print(asyncio.run(_benchmark(mode, args.pages, args.paragraphs, args.workers, not args.cold)))
+
+
+__all__ = [
+    "get_executor",
+    "run_cpu_bound",
+    "run_extraction",
+    "run_link_extraction",
+    "shutdown_executor",
+    "warm_executor",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import date
+from time import monotonic
+from typing import Optional
+from urllib.parse import urlparse
+
+import logfire
+from core.agents.discover.agent import discover_best_posts
+from core.models import Article, DailySuggestion
+from core.repositories import (
+    ArticleRepository,
+    ArticleSourceRepository,
+    DailySuggestionRepository,
+    FeaturedSnapshotRepository,
+)
+from core.services.prompt_packer import compact_json
+from core.services.singleflight import SingleFlight
+from db import AsyncSessionLocal
+from loguru import logger
+from settings import settings
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+EMPTY_PAYLOAD: dict = {"items": [], "categories": [], "keywords": []}
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    day: date
+    body: bytes
+    etag: str
+
+
+def _encode(payload: dict) -> bytes:
+    return compact_json(payload).encode("utf-8")
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+async def build_payload(session: AsyncSession, day: date) -> dict:
+    """Featured response for ``day``: items in rank order, categories and top keywords.
+
+    Cards and keyword counts are projected in SQL, so article texts and
+    metadata are never loaded.
+    """
+    sug_repo = DailySuggestionRepository(session)
+    cards = await sug_repo.list_cards_for_day(day, summary_chars=settings.featured_summary_chars)
+    keywords = await sug_repo.top_keywords_for_day(day, limit=10)
+    items = [
+        {
+            "title": c.title,
+            "url": c.url,
+            "image_url": c.image_url,
+            "summary": c.summary,
+            "source": urlparse(c.url).hostname or "",
+            "published_at": (c.published_at.isoformat() if c.published_at else None),
+            "category": c.category,
+        }
+        for c in cards
+    ]
+    return {
+        "items": items,
+        "categories": sorted({c.category for c in cards if c.category}),
+        "keywords": [{"keyword": k, "count": n} for k, n in keywords],
+    }
+
+
+class FeaturedSnapshotCache:
+    """Serves the featured response from memory.
+
+    Snapshots live in ``featured_snapshot`` and are rebuilt by ``publish``
+    when generation completes. Each worker keeps the latest one in memory
+    and re-checks the table every ``featured_snapshot_ttl_seconds``, so a
+    snapshot published by another worker is picked up within that window.
+    If suggestions exist for a day that has no snapshot yet, the snapshot
+    is built on the first read.
+    """
+
+    def __init__(self) -> None:
+        self._current: Optional[Snapshot] = None
+        self._checked_day: Optional[date] = None
+        self._fresh_until = 0.0
+        self._flight = SingleFlight("featured_snapshot")
+
+    async def get(self, today: date, *, refresh: bool = False) -> Optional[Snapshot]:
+        """Latest snapshot for ``today`` or an earlier day, ``None`` if none exists."""
+        if not refresh and self._checked_day == today and monotonic() < self._fresh_until:
+            return self._current
+        return await self._flight.do(today, lambda: self._reload(today))
+
+    async def publish(self, day: date) -> Snapshot:
+        """Build the snapshot for ``day`` from stored suggestions and save it."""
+        with logfire.span("featured.publish_snapshot", day=day.isoformat()):
+            async with AsyncSessionLocal() as session:
+                payload = await build_payload(session, day)
+                body = _encode(payload)
+                etag = _etag(body)
+                await FeaturedSnapshotRepository(session).save(day, payload=payload, etag=etag)
+                await session.commit()
+        snapshot = Snapshot(day=day, body=body, etag=etag)
+        if self._current is None or day >= self._current.day:
+            self._current = snapshot
+        logger.info("Published featured snapshot for {} ({} bytes)", day, len(body))
+        return snapshot
+
+    async def _reload(self, today: date) -> Optional[Snapshot]:
+        async with AsyncSessionLocal() as session:
+            row = await FeaturedSnapshotRepository(session).get_latest(today)
+            last_day = await DailySuggestionRepository(session).get_last_day()
+
+        if last_day is not None and last_day <= today and (row is None or row.day < last_day):
+            snapshot: Optional[Snapshot] = await self.publish(last_day)
+        elif row is not None:
+            snapshot = Snapshot(day=row.day, body=_encode(row.payload), etag=row.etag)
+        else:
+            snapshot = None
+        self._current = snapshot
+        self._checked_day = today
+        self._fresh_until = monotonic() + settings.featured_snapshot_ttl_seconds
+        return snapshot
+
+
+_snapshots: Optional[FeaturedSnapshotCache] = None
+
+
+def get_featured_snapshots() -> FeaturedSnapshotCache:
+    global _snapshots
+    if _snapshots is None:
+        _snapshots = FeaturedSnapshotCache()
+    return _snapshots
+
+
+async def generate_today_featured(target_day: date) -> list[dict]:
+    """Discover posts, store them as suggestions for ``target_day`` and publish.
+
+    Runs under a per-day advisory lock; returns ``[]`` when another run
+    holds it. Repeated runs for the same day append new suggestions.
+    """
+    lock_key = f"featured:{target_day.isoformat()}"
+    async with AsyncSessionLocal() as lock_session:
+        async with lock_session.bind.connect() as conn:
+            res = await conn.execute(
+                text("SELECT pg_try_advisory_lock(hashtext(:k)::bigint)"),
+                {"k": lock_key},
+            )
+            acquired = bool(res.scalar())
+            if not acquired:
+                logger.info("Generator already running for {} — skipping.", target_day)
+                return []
+            try:
+                # Use discover agent to collect best posts from configured sources
+                discovered = await discover_best_posts()
+
+                # Deduplicate by URL while preserving order
+                seen_urls: set[str] = set()
+                items: list[dict] = []
+                for r in discovered:
+                    url = (r.get("url") or "").strip()
+                    if not url or url in seen_urls:
+                        continue
+                    seen_urls.add(url)
+                    items.append(
+                        {
+                            "url": url,
+                            "title": r.get("title") or "",
+                            "image_url": r.get("image_url") or None,
+                            "content": r.get("content") or "",
+                            "description": r.get("description") or "",
+                            "metadata": r.get("metadata") or {},
+                            "category": (r.get("category") or None),
+                        }
+                    )
+
+                # Persist all discovered items
+                async with AsyncSessionLocal() as session:
+                    src_repo = ArticleSourceRepository(session)
+                    art_repo = ArticleRepository(session)
+                    sug_repo = DailySuggestionRepository(session)
+
+                    articles_to_store: list[Article] = []
+                    suggestions_to_store: list[DailySuggestion] = []
+
+                    source_ids = await src_repo.get_or_create_many(
+                        urlparse(str(it["url"]).strip()).hostname or "" for it in items
+                    )
+                    for it in items:
+                        domain = urlparse(str(it["url"]).strip()).hostname or ""
+                        category = it.get("category") or None
+                        if isinstance(category, str):
+                            category = category.strip() or None
+                        art = Article(
+                            source_id=source_ids.get(domain),
+                            url=str(it["url"]),
+                            title=str(it.get("title") or ""),
+                            author=None,
+                            content_text=str(it.get("content") or it.get("description") or ""),
+                            content_html=None,
+                            lang="vi",
+                            category=category,
+                            tags=None,
+                            image_url=(str(it.get("image_url")) if it.get("image_url") else None),
+                            published_at=None,
+                            metadata_=it.get("metadata") or {},
+                        )
+                        articles_to_store.append(art)
+
+                    stored_articles = await art_repo.upsert_many(articles_to_store)
+                    # Refreshes later in the day rank after what is already there
+                    base_rank = await sug_repo.get_max_rank(target_day)
+
+                    # Map back to suggestions by URL
+                    by_url = {a.url: a for a in stored_articles}
+                    for idx, it in enumerate(items, start=base_rank + 1):
+                        a = by_url.get(str(it["url"]))
+                        if not a:
+                            continue
+                        suggestions_to_store.append(
+                            DailySuggestion(
+                                article_id=a.id,
+                                suggestion_date=target_day,
+                                rank=idx,
+                                # Fallback to the full content for reason
+                                reason=str(it.get("content") or it.get("description") or ""),
+                            )
+                        )
+
+                    await sug_repo.upsert_many(suggestions_to_store)
+                    await session.commit()
+
+                try:
+                    await get_featured_snapshots().publish(target_day)
+                except Exception:
+                    logger.exception("Failed to publish featured snapshot for {}", target_day)
+
+                return items
+            finally:
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(hashtext(:k)::bigint)"),
+                    {"k": lock_key},
+                )
+
+
+__all__ = [
+    "EMPTY_PAYLOAD",
+    "FeaturedSnapshotCache",
+    "Snapshot",
+    "build_payload",
+    "generate_today_featured",
+    "get_featured_snapshots",
+]
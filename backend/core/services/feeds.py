@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import gzip
+import html
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+import logfire
+from core.repositories.article_source import ArticleSourceRepository
+from core.repositories.feed_state import FeedStateRepository
+from core.services.crawl_scheduler import HostScheduler, host_of
+from core.services.http_fetcher import HttpFetcher, read_capped
+from db import AsyncSessionLocal
+from loguru import logger
+from settings import settings
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_IMG_SRC_RE = re.compile(r"<img[^>]+src=[\"']([^\"']+)", re.IGNORECASE)
+
+_FEED_ACCEPT = (
+    "application/rss+xml, application/atom+xml, application/xml;q=0.9, "
+    "text/xml;q=0.8, */*;q=0.5"
+)
+
+# ETag / Last-Modified per feed URL
+FeedValidators = dict[str, tuple[Optional[str], Optional[str]]]
+
+
+@dataclass
+class FeedEntry:
+    url: str
+    title: str = ""
+    description: str = ""
+    published_at: Optional[datetime] = None
+    image_url: str = ""
+
+
+@dataclass
+class ParsedFeed:
+    entries: list[FeedEntry] = field(default_factory=list)
+    # Child sitemaps listed by a sitemap index, with their lastmod
+    sitemaps: list[tuple[str, Optional[datetime]]] = field(default_factory=list)
+    # Validators of the fetched feeds, not yet saved
+    validators: FeedValidators = field(default_factory=dict)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child(el: ET.Element, name: str) -> Optional[ET.Element]:
+    for c in el:
+        if _local(c.tag) == name:
+            return c
+    return None
+
+
+def _text(el: ET.Element, name: str) -> str:
+    c = _child(el, name)
+    return (c.text or "").strip() if c is not None else ""
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            dt = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _plain(text: str) -> str:
+    return " ".join(html.unescape(_TAG_RE.sub(" ", text)).split())
+
+
+def _rss_item(item: ET.Element) -> Optional[FeedEntry]:
+    # Skip atom:link self-references, which carry no text
+    link = next(
+        ((c.text or "").strip() for c in item if _local(c.tag) == "link" and (c.text or "").strip()),
+        "",
+    ) or _text(item, "guid")
+    if not link.startswith(("http://", "https://")):
+        return None
+    description = _text(item, "description")
+    image = ""
+    for c in item:
+        name = _local(c.tag)
+        if name == "enclosure" and (c.get("type") or "").startswith("image"):
+            image = c.get("url") or ""
+        elif name in ("content", "thumbnail") and c.get("url"):
+            image = image or c.get("url") or ""
+    if not image:
+        m = _IMG_SRC_RE.search(description)
+        image = m.group(1) if m else ""
+    return FeedEntry(
+        url=link,
+        title=_plain(_text(item, "title")),
+        description=_plain(description),
+        published_at=_parse_date(_text(item, "pubDate") or _text(item, "date")),
+        image_url=image,
+    )
+
+
+def _atom_entry(entry: ET.Element) -> Optional[FeedEntry]:
+    link = ""
+    for c in entry:
+        if _local(c.tag) == "link" and c.get("rel", "alternate") == "alternate":
+            link = c.get("href") or ""
+            break
+    if not link.startswith(("http://", "https://")):
+        return None
+    return FeedEntry(
+        url=link,
+        title=_plain(_text(entry, "title")),
+        description=_plain(_text(entry, "summary") or _text(entry, "content")),
+        published_at=_parse_date(_text(entry, "published") or _text(entry, "updated")),
+    )
+
+
+def _sitemap_url(el: ET.Element) -> Optional[FeedEntry]:
+    loc = _text(el, "loc")
+    if not loc:
+        return None
+    news = _child(el, "news")
+    image = _child(el, "image")
+    return FeedEntry(
+        url=loc,
+        title=_text(news, "title") if news is not None else "",
+        published_at=_parse_date(
+            (_text(news, "publication_date") if news is not None else "") or _text(el, "lastmod")
+        ),
+        image_url=_text(image, "loc") if image is not None else "",
+    )
+
+
+def parse_feed(body: bytes) -> ParsedFeed:
+    """Parse RSS 2.0, Atom, sitemap and sitemap-index documents.
+
+    Raises ``xml.etree.ElementTree.ParseError`` for malformed XML.
+    """
+    if body[:2] == b"\x1f\x8b":
+        body = gzip.decompress(body)
+    root = ET.fromstring(body)
+    kind = _local(root.tag)
+    parsed = ParsedFeed()
+    if kind == "rss" or kind == "RDF":
+        items = [el for el in root.iter() if _local(el.tag) == "item"]
+        parsed.entries = [e for e in map(_rss_item, items) if e]
+    elif kind == "feed":
+        parsed.entries = [e for e in map(_atom_entry, (c for c in root if _local(c.tag) == "entry")) if e]
+    elif kind == "urlset":
+        parsed.entries = [e for e in map(_sitemap_url, (c for c in root if _local(c.tag) == "url")) if e]
+    elif kind == "sitemapindex":
+        parsed.sitemaps = [
+            (_text(c, "loc"), _parse_date(_text(c, "lastmod")))
+            for c in root
+            if _local(c.tag) == "sitemap" and _text(c, "loc")
+        ]
+    return parsed
+
+
+class FeedPoller:
+    """Polls RSS/Atom feeds and news sitemaps with conditional GET.
+
+    Feed URLs for a source come from its config, ``ArticleSource.rss_url``
+    and, for homepage sources, the sitemaps listed in robots.txt. ETag and
+    Last-Modified validators are kept in ``feed_state``, so an unchanged feed
+    costs one 304 response. They are returned with the entries and saved by
+    the caller via ``save_validators`` once the entries are marked seen, so
+    a 304 never hides entries that were fetched but not processed.
+    """
+
+    def __init__(self, http: HttpFetcher, scheduler: HostScheduler) -> None:
+        self._http = http
+        self._scheduler = scheduler
+
+    async def feed_urls(self, source_url: str, configured: Iterable[str] = ()) -> list[str]:
+        urls = list(configured)
+        host = host_of(source_url)
+        try:
+            async with AsyncSessionLocal() as session:
+                repo = ArticleSourceRepository(session)
+                source = await repo.get_by_domain(host) or await repo.get_by_domain(
+                    host.removeprefix("www.")
+                )
+        except Exception:
+            logger.exception("Failed to load article source for {}", host)
+            source = None
+        if source is not None and source.rss_url:
+            urls.append(source.rss_url)
+        # Site-wide sitemaps would leak other sections into section sources
+        if not urls and urlsplit(source_url).path in ("", "/"):
+            sitemaps = await self._scheduler.robots.sitemaps(source_url)
+            news = [s for s in sitemaps if "news" in s.lower()]
+            urls.extend(news or sitemaps[:2])
+        return list(dict.fromkeys(urls))
+
+    @logfire.instrument("feeds.poll_source")
+    async def poll_source(
+        self, source_url: str, configured: Iterable[str] = ()
+    ) -> Optional[ParsedFeed]:
+        """New-or-changed entries across a source's feeds, newest first.
+
+        Returns ``None`` when the source has no usable feed, so the caller
+        can fall back to crawling its listing page. Feeds answering 304
+        contribute no entries. The validators of every fetched feed come
+        back unsaved in ``validators``.
+        """
+        feed_urls = await self.feed_urls(source_url, configured)
+        if not feed_urls:
+            return None
+
+        entries: dict[str, FeedEntry] = {}
+        validators: FeedValidators = {}
+        any_ok = False
+        for feed_url in feed_urls:
+            parsed = await self.fetch(feed_url)
+            if parsed is None:
+                continue
+            any_ok = True
+            children = sorted(
+                parsed.sitemaps,
+                key=lambda s: s[1] or datetime.min.replace(tzinfo=timezone.utc),
+                reverse=True,
+            )[: settings.feed_max_child_sitemaps]
+            for child_url, _ in children:
+                child = await self.fetch(child_url)
+                if child is not None:
+                    parsed.entries.extend(child.entries)
+                    validators.update(child.validators)
+            validators.update(parsed.validators)
+            for e in parsed.entries:
+                entries.setdefault(e.url, e)
+
+        if not any_ok:
+            return None
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        ordered = sorted(entries.values(), key=lambda e: e.published_at or oldest, reverse=True)
+        logfire.info("Polled feeds", source=source_url, feeds=len(feed_urls), entries=len(ordered))
+        return ParsedFeed(entries=ordered, validators=validators)
+
+    async def save_validators(self, validators: FeedValidators) -> None:
+        """Persist validators returned by ``poll_source``."""
+        if not validators:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                repo = FeedStateRepository(db)
+                for url, (etag, last_modified) in validators.items():
+                    await repo.save(url, etag=etag, last_modified=last_modified)
+                await db.commit()
+        except Exception:
+            logger.exception("Failed to save feed state for {} feeds", len(validators))
+
+    async def fetch(self, url: str) -> Optional[ParsedFeed]:
+        """Conditional GET of one feed; empty on 304, ``None`` on failure.
+
+        New validators are returned in ``ParsedFeed.validators``, not saved.
+        """
+        if not await self._scheduler.allowed(url):
+            return None
+        try:
+            async with AsyncSessionLocal() as db:
+                state = await FeedStateRepository(db).get_by_url(url)
+        except Exception:
+            logger.exception("Failed to load feed state for {}", url)
+            state = None
+
+        headers = {"Accept": _FEED_ACCEPT}
+        if state is not None and state.etag:
+            headers["If-None-Match"] = state.etag
+        if state is not None and state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+
+        session = await self._http.get_session()
+        try:
+            async with self._scheduler.slot(url):
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304:
+                        logger.debug("Feed not modified: {}", url)
+                        return ParsedFeed()
+                    if response.status != 200:
+                        logger.info("Feed fetch failed for {}: {}", url, response.status)
+                        return None
+                    body, truncated = await read_capped(response, settings.feed_max_bytes)
+                    if truncated:
+                        # A cut-off document does not parse; don't store its validators
+                        logger.info("Feed larger than {} bytes: {}", settings.feed_max_bytes, url)
+                        return None
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+        except Exception as exc:
+            logger.info("Feed fetch failed for {}: {}", url, exc)
+            return None
+
+        try:
+            parsed = parse_feed(body)
+        except (ET.ParseError, OSError, EOFError) as exc:
+            logger.info("Feed parse failed for {}: {}", url, exc)
+            return None
+
+        if etag or last_modified:
+            parsed.validators[url] = (etag, last_modified)
+        return parsed
+
+
+__all__ = ["FeedEntry", "FeedPoller", "FeedValidators", "ParsedFeed", "parse_feed"]
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from typing import Any
+from uuid import UUID
+
+import logfire
+from core.agents.summarizer.agent import summarize_history
+from core.repositories import ConversationSummaryRepository
+from core.services.prompt_packer import compact_json
+from db import AsyncSessionLocal
+from loguru import logger
+from pydantic_ai import BinaryContent
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from settings import settings
+
+# Conversations with a summary refresh in flight, and the tasks themselves
+_refreshing: set[UUID] = set()
+_tasks: set[asyncio.Task] = set()
+
+
+def split_turns(messages: list[ModelMessage]) -> list[list[ModelMessage]]:
+    """Group messages into turns, each starting at a request with a user prompt."""
+    turns: list[list[ModelMessage]] = []
+    for message in messages:
+        starts_turn = isinstance(message, ModelRequest) and any(
+            isinstance(p, UserPromptPart) for p in message.parts
+        )
+        if starts_turn or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def _compact_payload(content: Any, max_chars: int) -> Any:
+    # Search/fetch results: keep what a citation needs, drop page bodies
+    if isinstance(content, list) and content and all(isinstance(i, dict) for i in content):
+        refs = [
+            {k: item[k] for k in ("title", "url") if item.get(k)}
+            for item in content
+            if item.get("url") or item.get("title")
+        ]
+        if refs:
+            return {"omitted": "content of earlier results", "results": refs}
+    text = content if isinstance(content, str) else compact_json(content)
+    if len(text) <= max_chars:
+        return content
+    return f"{text[:max_chars]}… [{len(text) - max_chars} chars omitted]"
+
+
+def _compact_user_content(content: Any) -> Any:
+    if isinstance(content, str):
+        return content
+    return [
+        f"[{item.media_type} attachment omitted]" if isinstance(item, BinaryContent) else item
+        for item in content
+    ]
+
+
+def compact_turn(turn: list[ModelMessage], max_chars: int) -> list[ModelMessage]:
+    """Copy of ``turn`` with tool returns shortened and attachments replaced by notes."""
+    out: list[ModelMessage] = []
+    for message in turn:
+        if not isinstance(message, ModelRequest):
+            out.append(message)
+            continue
+        parts = []
+        for part in message.parts:
+            if isinstance(part, ToolReturnPart):
+                part = replace(part, content=_compact_payload(part.content, max_chars))
+            elif isinstance(part, UserPromptPart):
+                part = replace(part, content=_compact_user_content(part.content))
+            parts.append(part)
+        out.append(replace(message, parts=parts))
+    return out
+
+
+def render_turn(turn: list[ModelMessage]) -> str:
+    """Plain-text transcript of one compacted turn for the summarizer."""
+    lines: list[str] = []
+    for message in compact_turn(turn, settings.history_tool_return_max_chars):
+        for part in message.parts:
+            if isinstance(part, UserPromptPart):
+                content = part.content
+                text = content if isinstance(content, str) else " ".join(map(str, content))
+                lines.append(f"User: {text}")
+            elif isinstance(part, TextPart) and isinstance(message, ModelResponse):
+                lines.append(f"Assistant: {part.content}")
+            elif isinstance(part, ToolCallPart):
+                lines.append(f"Tool call {part.tool_name}: {part.args_as_json_str()}")
+            elif isinstance(part, ToolReturnPart):
+                lines.append(f"Tool result {part.tool_name}: {compact_json(part.content)}")
+    return "\n".join(lines)
+
+
+def _with_summary(messages: list[ModelMessage], summary: str) -> list[ModelMessage]:
+    part = SystemPromptPart(content=f"Summary of the earlier conversation:\n{summary}")
+    first = messages[0]
+    if isinstance(first, ModelRequest):
+        return [replace(first, parts=[part, *first.parts]), *messages[1:]]
+    return [ModelRequest(parts=[part]), *messages]
+
+
+async def compact_history(conversation_id: UUID, messages: list[ModelMessage]) -> list[ModelMessage]:
+    """Bound the history sent to the model, whatever the conversation length.
+
+    The last ``history_keep_turns`` turns are kept verbatim. Turns covered
+    by the stored rolling summary are replaced by that summary, which is
+    prepended as a system prompt part. The turns in between keep their
+    text, but tool returns shrink to title/URL references or a short prefix
+    and attachments become notes. Once ``history_summary_min_turns`` such
+    turns pile up, the summary is refreshed in the background; the current
+    turn does not wait for it.
+    """
+    turns = split_turns(messages)
+    keep = max(settings.history_keep_turns, 1)
+    if len(turns) <= keep:
+        return messages
+
+    older = len(turns) - keep
+    summary_text, covered = "", 0
+    if settings.history_summary_enabled:
+        try:
+            async with AsyncSessionLocal() as session:
+                stored = await ConversationSummaryRepository(session).get_by_conversation(
+                    conversation_id
+                )
+            if stored is not None:
+                summary_text, covered = stored.summary, min(stored.covered_turns, older)
+        except Exception:
+            logger.exception("Failed to load conversation summary for {}", conversation_id)
+
+    compacted: list[ModelMessage] = []
+    for turn in turns[covered:older]:
+        compacted.extend(compact_turn(turn, settings.history_tool_return_max_chars))
+    for turn in turns[older:]:
+        compacted.extend(turn)
+    if summary_text and covered:
+        compacted = _with_summary(compacted, summary_text)
+
+    pending = turns[covered:older]
+    if settings.history_summary_enabled and len(pending) >= settings.history_summary_min_turns:
+        _schedule_refresh(conversation_id, summary_text, covered, pending)
+
+    logfire.info(
+        "History compacted",
+        conversation_id=str(conversation_id),
+        turns=len(turns),
+        summarized_turns=covered,
+        trimmed_turns=len(pending),
+        messages_before=len(messages),
+        messages_after=len(compacted),
+    )
+    return compacted
+
+
+def _schedule_refresh(
+    conversation_id: UUID,
+    previous: str,
+    covered: int,
+    pending: list[list[ModelMessage]],
+) -> None:
+    if conversation_id in _refreshing:
+        return
+    _refreshing.add(conversation_id)
+    task = asyncio.create_task(_refresh_summary(conversation_id, previous, covered, pending))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _refresh_summary(
+    conversation_id: UUID,
+    previous: str,
+    covered: int,
+    pending: list[list[ModelMessage]],
+) -> None:
+    try:
+        # Fold as many whole turns as fit; the rest wait for the next refresh
+        chunks: list[str] = []
+        used = 0
+        for turn in pending:
+            text = render_turn(turn)
+            if chunks and used + len(text) > settings.history_summary_max_chars:
+                break
+            chunks.append(text[: settings.history_summary_max_chars])
+            used += len(text)
+        summary = await summarize_history(previous, "\n\n".join(chunks))
+        if not summary:
+            return
+        covered += len(chunks)
+        async with AsyncSessionLocal() as session:
+            await ConversationSummaryRepository(session).save(
+                conversation_id, summary=summary, covered_turns=covered
+            )
+            await session.commit()
+        logger.info("Conversation {} summary now covers {} turns", conversation_id, covered)
+    except Exception:
+        logger.exception("Failed to refresh summary for conversation {}", conversation_id)
+    finally:
+        _refreshing.discard(conversation_id)
+
+
+__all__ = ["compact_history", "compact_turn", "render_turn", "split_turns"]
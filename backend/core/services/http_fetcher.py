@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Optional
+from urllib.parse import urlsplit
+
+import logfire
+from aiohttp import ClientResponse, ClientSession, ClientTimeout, TCPConnector
+from core.services.extraction import looks_incomplete
+from core.services.extraction_pool import run_extraction
+from loguru import logger
+from settings import settings
+
+
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+async def read_capped(response: ClientResponse, max_bytes: int) -> tuple[bytes, bool]:
+    """Read the body to EOF or ``max_bytes``; the flag is set when it was cut off."""
+    buf = bytearray()
+    async for chunk in response.content.iter_chunked(_READ_CHUNK_BYTES):
+        buf.extend(chunk)
+        if len(buf) > max_bytes:
+            return bytes(buf[:max_bytes]), True
+    return bytes(buf), False
+
+
+@dataclass
+class _DomainStats:
+    http_ok: int = 0
+    http_incomplete: int = 0
+    since: float = 0.0
+
+
+class DomainFetchPolicy:
+    """Learns per host whether plain HTTP is enough or a browser is needed.
+
+    A host is sent straight to the browser once HTTP fetches were incomplete
+    at least twice and more often than they succeeded. Stats are forgotten
+    after ``http_fetch_domain_memory_seconds`` so hosts get re-probed, and
+    for the least recently used hosts beyond ``http_fetch_domain_max_entries``.
+    """
+
+    def __init__(self) -> None:
+        self._stats: OrderedDict[str, _DomainStats] = OrderedDict()
+
+    def needs_browser(self, host: str) -> bool:
+        stats = self._get(host)
+        return stats.http_incomplete >= 2 and stats.http_incomplete > stats.http_ok
+
+    def record(self, host: str, *, complete: bool) -> None:
+        stats = self._get(host)
+        if complete:
+            stats.http_ok += 1
+        else:
+            stats.http_incomplete += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        return {
+            host: {"http_ok": s.http_ok, "http_incomplete": s.http_incomplete}
+            for host, s in self._stats.items()
+        }
+
+    def _get(self, host: str) -> _DomainStats:
+        now = monotonic()
+        stats = self._stats.get(host)
+        if stats is None or now - stats.since > settings.http_fetch_domain_memory_seconds:
+            stats = _DomainStats(since=now)
+            self._stats[host] = stats
+        self._stats.move_to_end(host)
+        while len(self._stats) > settings.http_fetch_domain_max_entries:
+            self._stats.popitem(last=False)
+        return stats
+
+
+class HttpFetcher:
+    """Pooled aiohttp client that fetches and extracts pages without a browser.
+
+    ``fetch`` returns ``None`` when the page looks empty or JS-dependent so the
+    caller can escalate to headless Chromium.
+    """
+
+    def __init__(self) -> None:
+        self._session: Optional[ClientSession] = None
+        self._session_lock = asyncio.Lock()
+        self.policy = DomainFetchPolicy()
+
+    async def get_session(self) -> ClientSession:
+        if self._session is None or self._session.closed:
+            async with self._session_lock:
+                if self._session is None or self._session.closed:
+                    self._session = ClientSession(
+                        connector=TCPConnector(
+                            limit=settings.http_fetch_pool_size,
+                            ttl_dns_cache=300,
+                        ),
+                        timeout=ClientTimeout(total=settings.http_fetch_timeout_seconds),
+                        headers={
+                            "User-Agent": settings.http_user_agent,
+                            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                            "Accept-Language": "vi,en;q=0.8",
+                        },
+                    )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def should_try(self, url: str) -> bool:
+        return not self.policy.needs_browser(_host(url))
+
+    async def fetch_html(self, url: str) -> Optional[tuple[str, str, bool]]:
+        """Return ``(final_url, html, truncated)`` for a 200 HTML response, else ``None``.
+
+        ``truncated`` is set when the body exceeded ``http_fetch_max_bytes``
+        and only its head was read.
+        """
+        session = await self.get_session()
+        try:
+            async with session.get(url, allow_redirects=True) as response:
+                content_type = response.headers.get("Content-Type", "")
+                if response.status != 200 or "html" not in content_type.lower():
+                    logger.debug("HTTP fetch skipped {}: {} {}", url, response.status, content_type)
+                    return None
+                body, truncated = await read_capped(response, settings.http_fetch_max_bytes)
+                html = body.decode(response.charset or "utf-8", errors="replace")
+                return str(response.url), html, truncated
+        except Exception as exc:
+            logger.debug("HTTP fetch failed for {}: {}", url, exc)
+            return None
+
+    @logfire.instrument("http_fetcher.fetch")
+    async def fetch(
+        self,
+        url: str,
+        *,
+        ignore_links: bool = True,
+        ignore_images: bool = False,
+        escape_html: bool = False,
+        pruned: bool = True,
+    ) -> Optional[dict]:
+        """Fetch and extract ``url``; ``None`` means the browser is needed."""
+        host = _host(url)
+        fetched = await self.fetch_html(url)
+        if fetched is None:
+            self.policy.record(host, complete=False)
+            return None
+        final_url, html, truncated = fetched
+        if truncated:
+            # A cut-off page would extract (and be cached) incomplete
+            logfire.info("HTTP fetch truncated; escalating to browser", url=url)
+            return None
+        result = await run_extraction(
+            html,
+            final_url,
+            ignore_links=ignore_links,
+            ignore_images=ignore_images,
+            escape_html=escape_html,
+            pruned=pruned,
+        )
+        # Report under the requested URL so callers can match results to inputs
+        result["url"] = url
+        if looks_incomplete(html, result, min_content_chars=settings.http_fetch_min_content_chars):
+            self.policy.record(host, complete=False)
+            logfire.info("HTTP fetch incomplete; escalating to browser", url=url)
+            return None
+        self.policy.record(host, complete=True)
+        return result
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+__all__ = ["DomainFetchPolicy", "HttpFetcher", "read_capped"]
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import logfire
+
+# Rough average for mixed Vietnamese/English text on current tokenizers
+_CHARS_PER_TOKEN = 3.5
+
+_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_LINK_RE = re.compile(r"\[([^\]]*)\]\((?:[^()]|\([^)]*\))*\)")
+# Blocks that carry no prose once images/links are gone: rules, bullets, pipes
+_NOISE_BLOCK_RE = re.compile(r"^[\W_]*$")
+
+_tokens_saved_counter = logfire.metric_counter(
+    "prompt_packer.tokens_saved",
+    unit="1",
+    description="Estimated prompt tokens saved by packing, by label",
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return int(len(text) / _CHARS_PER_TOKEN) + 1
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def lead_text(text: str, max_chars: int) -> str:
+    """Leading paragraphs of markdown ``text`` within ``max_chars``.
+
+    Drops images, keeps link text without URLs, collapses whitespace and
+    skips blocks without prose. The last paragraph is cut with an ellipsis.
+    """
+    if max_chars <= 0 or not text:
+        return ""
+    text = _LINK_RE.sub(r"\1", _IMAGE_RE.sub("", text))
+    out: list[str] = []
+    used = 0
+    for block in re.split(r"\n\s*\n", text):
+        para = " ".join(block.split())
+        if not para or _NOISE_BLOCK_RE.match(para):
+            continue
+        if used + len(para) > max_chars:
+            remaining = max_chars - used
+            if remaining > 80:
+                out.append(para[: remaining - 1].rstrip() + "…")
+            break
+        out.append(para)
+        used += len(para) + 1
+    return "\n".join(out)
+
+
+@dataclass
+class PackedItems:
+    items: list[dict]
+    text: str
+    tokens: int
+    tokens_saved: int
+    dropped: int
+
+
+def pack_items(
+    items: list[dict],
+    *,
+    budget_tokens: int,
+    text_key: str = "content",
+    max_text_chars: Optional[int] = None,
+    min_text_chars: int = 200,
+    label: str = "prompt",
+) -> PackedItems:
+    """Fit a list of dict items into ``budget_tokens`` as compact JSON.
+
+    Every field except ``text_key`` is kept as-is (titles, URLs, indices).
+    The text field is reduced to its lead paragraphs. The character budget
+    is shared so short items leave room for long ones. If even
+    ``min_text_chars`` per item does not fit, trailing items are dropped.
+    Savings are measured against ``json.dumps(items, indent=2)``, and are
+    logged and counted per ``label``.
+    """
+    baseline = estimate_tokens(json.dumps(items, ensure_ascii=False, indent=2, default=str))
+    raw_texts = [str(item.get(text_key) or "") for item in items]
+    texts = [lead_text(t, max_text_chars or 10**9) for t in raw_texts]
+    skeletons = [{**item, text_key: ""} for item in items]
+
+    kept = len(items)
+    while kept:
+        overhead = estimate_tokens(compact_json(skeletons[:kept]))
+        # Small margin for JSON escapes and ellipses added after budgeting
+        char_budget = int((budget_tokens - overhead) * _CHARS_PER_TOKEN * 0.95)
+        if char_budget >= kept * min_text_chars or kept == 1:
+            break
+        kept -= 1
+
+    # Water-fill: short texts keep everything, the rest share what is left
+    limits = [0] * kept
+    remaining = max(0, char_budget) if kept else 0
+    order = sorted(range(kept), key=lambda i: len(texts[i]))
+    for pos, i in enumerate(order):
+        share = remaining // (kept - pos)
+        limits[i] = min(len(texts[i]), share)
+        remaining -= limits[i]
+
+    packed = [
+        {
+            **item,
+            text_key: lead_text(raw_texts[i], limits[i]) if limits[i] < len(texts[i]) else texts[i],
+        }
+        for i, item in enumerate(items[:kept])
+    ]
+    text = compact_json(packed)
+    tokens = estimate_tokens(text)
+    saved = max(0, baseline - tokens)
+    _tokens_saved_counter.add(saved, {"label": label})
+    logfire.info(
+        "Prompt packed",
+        label=label,
+        items=len(items),
+        dropped=len(items) - kept,
+        tokens=tokens,
+        tokens_saved=saved,
+    )
+    return PackedItems(
+        items=packed,
+        text=text,
+        tokens=tokens,
+        tokens_saved=saved,
+        dropped=len(items) - kept,
+    )
+
+
+__all__ = ["PackedItems", "compact_json", "estimate_tokens", "lead_text", "pack_items"]
@@ -9,6 +9,9 @@ from time import monotonic
 from typing import Callable, Deque, Dict
 
 from google.genai.errors import ClientError
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
 from tenacity import (
     AsyncRetrying,
     RetryCallState,
@@ -53,6 +56,61 @@ class SlidingWindowRateLimiter:
             await asyncio.sleep(max(wait_time, 0.01))
 
 
+class PostgresRateLimiter:
+    """Cross-process rate limiter backed by GCRA state in Postgres.
+
+    Each ``acquire`` reserves the next slot with one atomic upsert on
+    ``rate_limit_state`` (the row lock serializes workers and replicas), then
+    sleeps until that slot. ``burst`` allows that many back-to-back calls.
+    If the database is unreachable the call proceeds, so callers should keep
+    a local limiter as a first line of defense.
+    """
+
+    _RESERVE_SQL = text(
+        """
+        INSERT INTO rate_limit_state AS s (key, tat)
+        VALUES (:key, clock_timestamp() + :interval * interval '1 second')
+        ON CONFLICT (key) DO UPDATE
+        SET tat = GREATEST(s.tat, clock_timestamp()) + :interval * interval '1 second'
+        RETURNING
+          EXTRACT(EPOCH FROM (s.tat - clock_timestamp()))::float8 - :interval - :tolerance
+        """
+    )
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        key: str,
+        *,
+        min_interval: float,
+        burst: int = 1,
+    ) -> None:
+        self._engine = engine
+        self.key = key
+        self.min_interval = min_interval
+        self.tolerance = max(burst - 1, 0) * min_interval
+
+    async def acquire(self) -> None:
+        """Wait until this process owns the next slot for ``key``."""
+        try:
+            async with self._engine.begin() as conn:
+                res = await conn.execute(
+                    self._RESERVE_SQL,
+                    {
+                        "key": self.key,
+                        "interval": float(self.min_interval),
+                        "tolerance": float(self.tolerance),
+                    },
+                )
+                wait_s = float(res.scalar() or 0.0)
+        except Exception:
+            logger.warning("Distributed rate limiter unavailable for {}; skipping", self.key)
+            return
+        if wait_s > 0:
+            logger.debug("Distributed throttle {}: wait {:.2f}s", self.key, wait_s)
+            await asyncio.sleep(wait_s)
+
+
 class RateLimiterRegistry:
     """Registry of named process-wide limiters."""
 
@@ -285,6 +343,7 @@ async def run_with_quota_and_retry(
 
 __all__ = [
     "SlidingWindowRateLimiter",
+    "PostgresRateLimiter",
     "RateLimiterRegistry",
     "run_with_quota_and_retry",
     "wait_llm_retry",
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+import logfire
+from core.repositories import ArticleRepository, ArticleSearchHit
+from core.services.web_discovery import SearchResult, WebDiscovery
+from db import AsyncSessionLocal
+from loguru import logger
+from settings import settings
+
+_retrieval_counter = logfire.metric_counter(
+    "retrieval.requests",
+    unit="1",
+    description="search_web requests, by where results came from (local/web/mixed)",
+)
+
+
+# Recency phrases the chat prompt asks the model to add to web queries; they
+# rarely occur in article text and would make the AND-ed full-text query miss
+_RECENCY_RE = re.compile(
+    r"\b(tin tức( về)?|mới nhất|hôm nay|gần đây|cập nhật|latest|news( about)?|today)\b",
+    re.IGNORECASE,
+)
+
+
+def _local_query(query: str) -> str:
+    stripped = " ".join(_RECENCY_RE.sub(" ", query).split())
+    return stripped or query
+
+
+def _to_search_result(hit: ArticleSearchHit) -> SearchResult:
+    host = urlparse(hit.url).hostname or ""
+    published = hit.published_at or hit.fetched_at
+    return SearchResult(
+        title=hit.title,
+        url=hit.url,
+        description=" ".join(hit.summary[:300].split()),
+        page_age=published.isoformat() if published else None,
+        profile={"name": host, "url": f"https://{host}"},
+        language=hit.lang or "vi",
+        family_friendly=True,
+        type="search_result",
+        subtype="local_article",
+        is_live=False,
+        meta_url={"hostname": host},
+        content=hit.summary,
+        image_url=hit.image_url,
+    )
+
+
+async def search_local(query: str, count: int) -> list[ArticleSearchHit]:
+    """Fresh stored articles matching ``query`` above ``retrieval_min_score``."""
+    since = datetime.now(timezone.utc) - timedelta(hours=settings.retrieval_max_age_hours)
+    try:
+        async with AsyncSessionLocal() as session:
+            hits = await ArticleRepository(session).search(
+                _local_query(query),
+                limit=count,
+                since=since,
+                summary_chars=settings.retrieval_content_chars,
+            )
+    except Exception:
+        logger.exception("Local article search failed for {!r}", query)
+        return []
+    return [h for h in hits if h.score >= settings.retrieval_min_score]
+
+
+@logfire.instrument("retrieve")
+async def retrieve(query: str, count: int = 5) -> list[SearchResult]:
+    """Search results for ``query``, from the local article store when possible.
+
+    Stored articles (collected by the discover pipeline) answer the
+    query when at least ``retrieval_min_results`` of them, or ``count`` if
+    smaller, are fresh and relevant enough. Otherwise live web search runs
+    and local hits are kept ahead of its results.
+    """
+    local: list[ArticleSearchHit] = []
+    if settings.retrieval_local_enabled:
+        local = await search_local(query, count)
+    if local and len(local) >= min(count, settings.retrieval_min_results):
+        _retrieval_counter.add(1, {"source": "local"})
+        logfire.info("Retrieval served locally", query=query, results=len(local))
+        return [_to_search_result(h) for h in local]
+
+    web = await WebDiscovery().discover(query=query, count=count)
+    local_urls = {h.url for h in local}
+    results = [_to_search_result(h) for h in local]
+    results.extend(r for r in web if r.url not in local_urls)
+    _retrieval_counter.add(1, {"source": "mixed" if local else "web"})
+    return results[:count]
+
+
+__all__ = ["retrieve", "search_local"]
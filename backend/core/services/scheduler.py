@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from time import monotonic
+from typing import Optional
+
+import logfire
+from core.repositories import DailySuggestionRepository
+from core.services.embeddings import get_embedding_index
+from core.services.featured import generate_today_featured
+from core.services.seen_urls import prune_seen_urls
+from db import AsyncSessionLocal, async_engine
+from loguru import logger
+from settings import settings
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+_LEADER_KEY = "featured:scheduler"
+
+_runs_counter = logfire.metric_counter(
+    "featured.scheduler.runs",
+    unit="1",
+    description="Scheduled featured generation runs, by kind and status",
+)
+
+
+class FeaturedScheduler:
+    """Generates the featured feed on a timer instead of on user requests.
+
+    One worker across all processes is leader: it holds a session-level
+    advisory lock on a dedicated connection and runs the jobs. Other
+    workers retry the lock on every tick and take over if the leader dies.
+    The full run starts at ``featured_generate_time`` so the feed is ready
+    before the 06:00 cutoff. It runs immediately if the process starts
+    later and today's feed is still missing. After that, refreshes every
+    ``featured_refresh_interval_minutes`` add newly published articles
+    until ``featured_refresh_until_hour``. The leader also embeds newly
+    stored articles on each tick and prunes old discovered URLs hourly.
+    """
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+        self._conn: Optional[AsyncConnection] = None
+        self._generated_day: Optional[date] = None
+        self._last_run_at = 0.0
+        self._retry_at = 0.0
+        self._pruned_at: Optional[float] = None
+        self._running: Optional[dict] = None
+        self._history: deque[dict] = deque(maxlen=20)
+
+    @property
+    def is_leader(self) -> bool:
+        return self._conn is not None
+
+    def start(self) -> None:
+        if self._task is None and settings.featured_scheduler_enabled:
+            self._task = asyncio.create_task(self._loop(), name="featured-scheduler")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._release_leadership()
+
+    def status(self) -> dict:
+        return {
+            "enabled": settings.featured_scheduler_enabled,
+            "leader": self.is_leader,
+            "generated_day": self._generated_day.isoformat() if self._generated_day else None,
+            "next_full_run": self.next_full_run(datetime.now()).isoformat(),
+            "running": dict(self._running) if self._running else None,
+            "runs": list(self._history),
+        }
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                if await self._ensure_leadership():
+                    kind = await self._due(datetime.now())
+                    if kind is not None:
+                        await self._run(kind, datetime.now().date())
+                    if settings.embedding_enabled:
+                        await self._embed_pending()
+                    await self._prune_seen_urls()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Featured scheduler tick failed")
+            await asyncio.sleep(settings.featured_scheduler_tick_seconds)
+
+    async def _ensure_leadership(self) -> bool:
+        if self._conn is not None:
+            try:
+                await self._conn.execute(text("SELECT 1"))
+                await self._conn.commit()
+                return True
+            except Exception:
+                logger.warning("Featured scheduler lost its leader connection")
+                await self._release_leadership()
+
+        conn = await async_engine.connect()
+        try:
+            res = await conn.execute(
+                text("SELECT pg_try_advisory_lock(hashtext(:k)::bigint)"),
+                {"k": _LEADER_KEY},
+            )
+            acquired = bool(res.scalar())
+            # Session-level locks do not end with a transaction
+            await conn.commit()
+        except Exception:
+            await conn.close()
+            raise
+        if not acquired:
+            await conn.close()
+            return False
+        self._conn = conn
+        logger.info("Featured scheduler elected leader")
+        return True
+
+    async def _release_leadership(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            await conn.execute(
+                text("SELECT pg_advisory_unlock(hashtext(:k)::bigint)"),
+                {"k": _LEADER_KEY},
+            )
+            await conn.commit()
+            await conn.close()
+        except Exception:
+            # Drop the connection so the lock goes with its backend session
+            await conn.invalidate()
+            await conn.close()
+
+    async def _due(self, now: datetime) -> Optional[str]:
+        today = now.date()
+        if now.time() < settings.featured_generate_time or monotonic() < self._retry_at:
+            return None
+        if self._generated_day != today:
+            async with AsyncSessionLocal() as session:
+                last_day = await DailySuggestionRepository(session).get_last_day()
+            if last_day != today:
+                return "full"
+            # Generated earlier, e.g. before a restart or by a previous leader
+            self._generated_day = today
+            self._last_run_at = monotonic()
+            return None
+        interval = settings.featured_refresh_interval_minutes * 60
+        if (
+            interval > 0
+            and now.hour < settings.featured_refresh_until_hour
+            and monotonic() - self._last_run_at >= interval
+        ):
+            return "refresh"
+        return None
+
+    async def _run(self, kind: str, day: date) -> None:
+        record: dict = {
+            "kind": kind,
+            "day": day.isoformat(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "status": "running",
+        }
+        self._running = record
+        started = monotonic()
+        try:
+            with logfire.span("featured.scheduled_run", kind=kind, day=day.isoformat()):
+                items = await generate_today_featured(day)
+            record["items"] = len(items)
+            if kind == "full" and not items:
+                # Nothing stored (sources down or another run holds the day lock)
+                record["status"] = "empty"
+                self._retry_at = monotonic() + settings.featured_retry_minutes * 60
+            else:
+                record["status"] = "ok"
+                self._generated_day = day
+                self._last_run_at = monotonic()
+        except Exception:
+            # Details go to the log only; status() is served over HTTP
+            logger.exception("Featured {} run for {} failed", kind, day)
+            record["status"] = "error"
+            self._retry_at = monotonic() + settings.featured_retry_minutes * 60
+        finally:
+            record["duration_seconds"] = round(monotonic() - started, 1)
+            self._running = None
+            self._history.appendleft(record)
+            _runs_counter.add(1, {"kind": kind, "status": record["status"]})
+        logger.info(
+            "Featured {} run for {}: {} in {}s",
+            kind,
+            day,
+            record["status"],
+            record["duration_seconds"],
+        )
+
+    async def _embed_pending(self) -> None:
+        try:
+            await get_embedding_index().index_pending()
+        except Exception:
+            logger.exception("Embedding new articles failed")
+
+    async def _prune_seen_urls(self) -> None:
+        if self._pruned_at is not None and monotonic() - self._pruned_at < 3600:
+            return
+        self._pruned_at = monotonic()
+        try:
+            await prune_seen_urls()
+        except Exception:
+            logger.exception("Pruning discovered URLs failed")
+
+    def next_full_run(self, now: datetime) -> datetime:
+        at = datetime.combine(now.date(), settings.featured_generate_time)
+        return at if now < at else at + timedelta(days=1)
+
+
+_scheduler: Optional[FeaturedScheduler] = None
+
+
+def get_featured_scheduler() -> FeaturedScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = FeaturedScheduler()
+    return _scheduler
+
+
+__all__ = ["FeaturedScheduler", "get_featured_scheduler"]
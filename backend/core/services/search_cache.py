@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import TYPE_CHECKING, Optional
+
+from core.services.cache import CacheEntry, LRUCache
+from settings import settings
+
+if TYPE_CHECKING:
+    from core.services.web_discovery import SearchResult
+
+# Queries about recent events should expire quickly
+_NEWS_QUERY_RE = re.compile(
+    r"(tin tức|tin tuc|mới nhất|moi nhat|hôm nay|hom nay|hôm qua|hom qua|tuần này|"
+    r"vừa|nóng|khẩn|trực tiếp|giá vàng|tỷ giá|chứng khoán|thời tiết|"
+    r"news|latest|breaking|today|yesterday|live|"
+    r"\b(19|20)\d{2}\b|\b\d{1,2}/\d{1,2}\b)",
+    re.IGNORECASE,
+)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query for cache keys.
+
+    Applies NFC, case folding, whitespace collapsing and strips surrounding
+    punctuation, so "Giá vàng hôm nay?" and " giá  vàng hôm nay" match.
+    """
+    q = unicodedata.normalize("NFC", query).casefold()
+    q = " ".join(q.split())
+    return q.strip(" \t\"'?!.,;:")
+
+
+def is_news_query(query: str) -> bool:
+    return bool(_NEWS_QUERY_RE.search(query))
+
+
+class SearchResultCache:
+    """In-process cache of Brave search results with stale-while-revalidate.
+
+    News-like queries get ``search_cache_news_ttl_seconds`` and everything
+    else ``search_cache_ttl_seconds``. Expired entries remain servable for
+    ``search_cache_stale_seconds`` while the caller refreshes them.
+    """
+
+    def __init__(self) -> None:
+        self._cache: LRUCache[list["SearchResult"]] = LRUCache(
+            max_bytes=settings.search_cache_memory_bytes
+        )
+
+    @staticmethod
+    def make_key(
+        query: str,
+        count: int,
+        *,
+        country: Optional[str],
+        search_lang: Optional[str],
+    ) -> tuple:
+        return (normalize_query(query), count, country or "", search_lang or "")
+
+    def get(self, key: tuple) -> Optional[CacheEntry[list["SearchResult"]]]:
+        return self._cache.get(key)
+
+    def set(self, key: tuple, results: list["SearchResult"]) -> None:
+        if not results:
+            return
+        ttl = (
+            settings.search_cache_news_ttl_seconds
+            if is_news_query(key[0])
+            else settings.search_cache_ttl_seconds
+        )
+        size = sum(len(r.model_dump_json()) for r in results)
+        self._cache.set(
+            key,
+            results,
+            size=size,
+            ttl=ttl,
+            stale_ttl=settings.search_cache_stale_seconds,
+        )
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+__all__ = ["SearchResultCache", "is_news_query", "normalize_query"]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from typing import Iterable, Optional
+
+from core.repositories.seen_url import SeenUrlRepository
+from core.utils import normalize_url
+from db import AsyncSessionLocal
+from loguru import logger
+from settings import settings
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        capacity = max(1, capacity)
+        self.n_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.n_bits + 7) // 8)
+        self.count = 0
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.n_bits for i in range(self.n_hashes))
+
+
+class SeenUrlIndex:
+    """Answers "have we fetched this article URL before?" cheaply.
+
+    A Bloom filter over normalized known URLs (stored articles plus URLs
+    fetched by discover) rules out most new URLs without a query. Bloom hits
+    are confirmed against the database, since they may be false positives.
+    The filter is rebuilt every ``discover_seen_reload_seconds``; discovered
+    URLs are kept for ``discover_seen_retention_days`` (see ``prune_seen_urls``).
+    """
+
+    def __init__(self) -> None:
+        self._bloom: Optional[BloomFilter] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def filter_new(self, urls: Iterable[str]) -> list[str]:
+        """Return the URLs not seen before, preserving order."""
+        candidates = {normalize_url(u): u for u in urls}
+        if not candidates:
+            return []
+        bloom = await self._ensure_loaded()
+        maybe_seen = [n for n in candidates if n in bloom]
+        known: set[str] = set()
+        if maybe_seen:
+            # Articles are stored under the crawled URL, so check both forms
+            lookup = maybe_seen + [candidates[n] for n in maybe_seen]
+            async with AsyncSessionLocal() as session:
+                existing = await SeenUrlRepository(session).find_existing(lookup)
+            known = {normalize_url(u) for u in existing}
+        fresh = [raw for norm, raw in candidates.items() if norm not in known]
+        logger.info(
+            "Seen-URL index: {} candidates, {} bloom hits, {} new",
+            len(candidates),
+            len(maybe_seen),
+            len(fresh),
+        )
+        return fresh
+
+    async def mark_seen(self, urls: Iterable[str], source_url: Optional[str] = None) -> None:
+        normalized = list(dict.fromkeys(normalize_url(u) for u in urls))
+        if not normalized:
+            return
+        async with AsyncSessionLocal() as session:
+            await SeenUrlRepository(session).mark_seen(normalized, source_url=source_url)
+            await session.commit()
+        bloom = await self._ensure_loaded()
+        for u in normalized:
+            bloom.add(u)
+
+    async def _ensure_loaded(self) -> BloomFilter:
+        if self._bloom is not None and monotonic() - self._loaded_at < settings.discover_seen_reload_seconds:
+            return self._bloom
+        async with self._lock:
+            if self._bloom is None or monotonic() - self._loaded_at >= settings.discover_seen_reload_seconds:
+                async with AsyncSessionLocal() as session:
+                    repo = SeenUrlRepository(session)
+                    # Headroom so the false-positive rate holds as URLs are added
+                    bloom = BloomFilter(capacity=2 * await repo.count_known_urls() + 10_000)
+                    # Streamed so only one batch of URLs is in memory at a time
+                    async for u in repo.iter_known_urls():
+                        bloom.add(normalize_url(u))
+                self._bloom = bloom
+                self._loaded_at = monotonic()
+                logger.info("Loaded seen-URL index with {} URLs", bloom.count)
+        return self._bloom
+
+
+async def prune_seen_urls() -> int:
+    """Delete discovered URLs older than the retention window; 0 keeps them forever."""
+    days = settings.discover_seen_retention_days
+    if days <= 0:
+        return 0
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    async with AsyncSessionLocal() as session:
+        deleted = await SeenUrlRepository(session).prune_discovered(cutoff)
+        await session.commit()
+    if deleted:
+        logger.info("Pruned {} discovered URLs first seen before {}", deleted, cutoff.date())
+    return deleted
+
+
+_index: Optional[SeenUrlIndex] = None
+
+
+def get_seen_url_index() -> SeenUrlIndex:
+    global _index
+    if _index is None:
+        _index = SeenUrlIndex()
+    return _index
+
+
+__all__ = ["BloomFilter", "SeenUrlIndex", "get_seen_url_index", "prune_seen_urls"]
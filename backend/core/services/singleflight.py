@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+import logfire
+
+T = TypeVar("T")
+
+_calls_counter = logfire.metric_counter(
+    "singleflight.calls",
+    unit="1",
+    description="Calls through a single-flight group, by outcome (executed/coalesced)",
+)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the operation; callers arriving while it
+    is in flight await the same task. A waiter being cancelled does not cancel
+    the shared task, unless ``cancel_abandoned`` is set and it was the last
+    waiter. Results are shared as-is, so callers must copy mutable values
+    before modifying them.
+    """
+
+    def __init__(self, name: str, *, cancel_abandoned: bool = False) -> None:
+        self.name = name
+        self.cancel_abandoned = cancel_abandoned
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, operation: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(operation())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_done(k, t))
+            self.executed += 1
+            outcome = "executed"
+        else:
+            self.coalesced += 1
+            outcome = "coalesced"
+        _calls_counter.add(1, {"group": self.name, "outcome": outcome})
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            left = self._waiters.pop(task) - 1
+            if left:
+                self._waiters[task] = left
+            elif self.cancel_abandoned and not task.done():
+                # Every waiter gave up (cancelled or timed out): stop the work
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+__all__ = ["SingleFlight"]
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from time import monotonic
-from typing import Iterable, Optional, TypedDict
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional, TypedDict
 
 
 import logfire
 from aiohttp import ClientSession
+from core.services.content_cache import ContentCache
+from core.services.crawl_scheduler import HostScheduler, interleave_by_host, same_host
+from core.services.extraction import PassthroughMarkdownGenerator, build_crawl_result
+from core.services.extraction_pool import run_extraction, run_link_extraction
+from core.services.feeds import FeedPoller
+from core.services.http_fetcher import HttpFetcher
+from core.services.ratelimit import PostgresRateLimiter
+from core.services.search_cache import SearchResultCache
+from core.services.singleflight import SingleFlight
+from db import async_engine
 from settings import settings
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
-from crawl4ai.content_filter_strategy import PruningContentFilter
 from crawl4ai.deep_crawling import BFSDeepCrawlStrategy, DeepCrawlStrategy
-from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
 from loguru import logger
 from pydantic import BaseModel
 
@@ -48,13 +58,180 @@ class CrawlResult(TypedDict):
     image_url: str
     metadata: dict
     category: Optional[str]
-    
+
+
+@dataclass
+class _PooledCrawler:
+    crawler: AsyncWebCrawler
+    pages: int = 0
+    leases: int = 0
+    retiring: bool = False
+
+
+class CrawlerPool:
+    """Pool of warm ``AsyncWebCrawler`` instances shared across requests.
+
+    - Launches browsers lazily (or eagerly via ``start``) up to ``size``
+    - Several callers may share one browser; crawl4ai opens a page per run
+    - Replaces browsers that fail a health check
+    - Recycles a browser once it has served ``max_pages`` pages
+    """
+
+    def __init__(self, size: int, max_pages: int) -> None:
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self._entries: list[_PooledCrawler] = []
+        self._lock = asyncio.Lock()
+        # Signalled when a launch finishes or the pool closes
+        self._changed = asyncio.Condition(self._lock)
+        # Slots reserved by browsers being launched outside the lock
+        self._launching = 0
+        self._closed = False
+
+    async def start(self) -> None:
+        """Warm up the pool by launching all browsers upfront."""
+        async with self._lock:
+            self._closed = False
+            missing = self.size - len(self._entries) - self._launching
+            self._launching += max(missing, 0)
+        await asyncio.gather(*(self._launch_reserved(lease=False) for _ in range(missing)))
+
+    async def close(self) -> None:
+        """Close every browser, including ones still leased."""
+        async with self._lock:
+            self._closed = True
+            entries, self._entries = self._entries, []
+            self._changed.notify_all()
+        for entry in entries:
+            await self._shutdown(entry)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[AsyncWebCrawler]:
+        """Lease the least busy healthy crawler for the duration of the block."""
+        entry = await self._checkout()
+        try:
+            yield entry.crawler
+        finally:
+            await self._release(entry)
+
+    def record_pages(self, crawler: AsyncWebCrawler, n_pages: int) -> None:
+        """Count pages served by a pooled crawler and mark it for recycling."""
+        for entry in self._entries:
+            if entry.crawler is crawler:
+                entry.pages += n_pages
+                if entry.pages >= self.max_pages:
+                    entry.retiring = True
+                return
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "live": len(self._entries),
+            "leased": sum(e.leases for e in self._entries),
+            "pages": [e.pages for e in self._entries],
+        }
+
+    async def _checkout(self) -> _PooledCrawler:
+        stale: list[_PooledCrawler] = []
+        chosen: Optional[_PooledCrawler] = None
+        async with self._lock:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Crawler pool is closed")
+                for entry in list(self._entries):
+                    if not entry.retiring and not self._is_healthy(entry):
+                        logger.warning("Pooled crawler failed health check; replacing")
+                        entry.retiring = True
+                    if entry.retiring and entry.leases == 0:
+                        self._entries.remove(entry)
+                        stale.append(entry)
+
+                candidates = [e for e in self._entries if not e.retiring]
+                idle = [e for e in candidates if e.leases == 0]
+                if idle:
+                    chosen = idle[0]
+                elif len(candidates) + self._launching < self.size:
+                    # Reserve the slot; the browser starts outside the lock
+                    self._launching += 1
+                elif candidates:
+                    chosen = min(candidates, key=lambda e: e.leases)
+                else:
+                    # Every slot is a launch in progress; share one once ready
+                    await self._changed.wait()
+                    continue
+                if chosen is not None:
+                    chosen.leases += 1
+                break
+
+        for entry in stale:
+            await self._shutdown(entry)
+        return chosen if chosen is not None else await self._launch_reserved()
+
+    async def _launch_reserved(self, lease: bool = True) -> _PooledCrawler:
+        """Launch a browser into a slot reserved under the lock and publish it."""
+        try:
+            entry = await self._launch()
+        except BaseException:
+            async with self._lock:
+                self._launching -= 1
+                self._changed.notify_all()
+            raise
+        async with self._lock:
+            self._launching -= 1
+            self._changed.notify_all()
+            closed = self._closed
+            if not closed:
+                entry.leases += int(lease)
+                self._entries.append(entry)
+        if closed:
+            await self._shutdown(entry)
+            raise RuntimeError("Crawler pool is closed")
+        return entry
+
+    async def _release(self, entry: _PooledCrawler) -> None:
+        drop = False
+        async with self._lock:
+            entry.leases -= 1
+            if entry.leases == 0 and entry.retiring and entry in self._entries:
+                self._entries.remove(entry)
+                drop = True
+        if drop:
+            await self._shutdown(entry)
+
+    @staticmethod
+    def _is_healthy(entry: _PooledCrawler) -> bool:
+        crawler = entry.crawler
+        if not getattr(crawler, "ready", True):
+            return False
+        try:
+            browser = crawler.crawler_strategy.browser_manager.browser
+        except AttributeError:
+            return True
+        return browser is None or browser.is_connected()
+
+    @staticmethod
+    async def _launch() -> _PooledCrawler:
+        crawler = AsyncWebCrawler()
+        await crawler.start()
+        logger.info("Launched pooled crawler")
+        return _PooledCrawler(crawler=crawler)
+
+    @staticmethod
+    async def _shutdown(entry: _PooledCrawler) -> None:
+        try:
+            await entry.crawler.close()
+            logger.info("Closed pooled crawler after {} pages", entry.pages)
+        except Exception:
+            logger.exception("Failed to close pooled crawler")
+
 
 class WebDiscovery:
     """Singleton service for web discovery (search + crawl).
 
-    - Reuses a single crawler per batch
-    - Limits concurrency with a semaphore
+    - Fetches pages over pooled HTTP first, escalating to the browser
+    - Borrows warm crawlers from a shared ``CrawlerPool``
+    - Caps and spaces requests per host, honouring robots.txt
+    - Limits overall concurrency with a semaphore
     """
 
     _instance: Optional["WebDiscovery"] = None
@@ -64,6 +241,26 @@ class WebDiscovery:
         if getattr(self, "_initialized", False):
             return
         self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pool = CrawlerPool(
+            size=settings.crawler_pool_size,
+            max_pages=settings.crawler_pool_max_pages,
+        )
+        self._content_cache = ContentCache()
+        self._search_cache = SearchResultCache()
+        self._http = HttpFetcher()
+        self._scheduler = HostScheduler(self._http)
+        self.feeds = FeedPoller(self._http, self._scheduler)
+        self._brave_limiter = PostgresRateLimiter(
+            async_engine,
+            "brave_api",
+            min_interval=settings.brave_min_interval_seconds,
+        )
+        # Strong references to background revalidation tasks
+        self._background_tasks: set[asyncio.Task] = set()
+        # Coalesce identical in-flight searches and crawls
+        self._search_flight = SingleFlight("brave_search")
+        # Cancel a crawl nobody waits for, so a timeout frees its host slot
+        self._crawl_flight = SingleFlight("crawl", cancel_abandoned=True)
         self._initialized = True
 
     def __new__(cls, *args, **kwargs) -> "WebDiscovery":
@@ -77,20 +274,98 @@ class WebDiscovery:
             cls._instance = instance
         return cls._instance
 
+    async def start(self) -> None:
+        """Warm up shared resources; call from the app lifespan."""
+        try:
+            await self._pool.start()
+        except Exception:
+            # Not fatal: the pool launches browsers lazily on first use
+            logger.exception("Failed to warm up crawler pool")
+
+    async def close(self) -> None:
+        """Release shared resources; call from the app lifespan."""
+        await self._pool.close()
+        await self._http.close()
+
+    def stats(self) -> dict:
+        """Counters for health/monitoring endpoints."""
+        return {
+            "crawler_pool": self._pool.stats(),
+            "content_cache": self._content_cache.stats(),
+            "search_cache": self._search_cache.stats(),
+            "search_flight": self._search_flight.stats(),
+            "crawl_flight": self._crawl_flight.stats(),
+            "browser_domains": self._http.policy.snapshot(),
+            "hosts": self._scheduler.stats(),
+        }
+
     @logfire.instrument("web_discovery.fetch_search_results")
     async def fetch_search_results(
-        self, query: str, count: int = 5
+        self,
+        query: str,
+        count: int = 5,
+        country: Optional[str] = None,
+        search_lang: Optional[str] = None,
     ) -> list[SearchResult]:
         """Return raw Brave search results without crawling.
 
+        Results are cached per normalized query, count and locale. A stale
+        entry is returned immediately while a background refresh runs.
+
         Args:
             query: Search query string.
             count: Max number of results to fetch.
+            country: Brave country code; defaults to ``settings.brave_country``.
+            search_lang: Brave language code; defaults to ``settings.brave_search_lang``.
         """
         if not settings.brave_api_key:
             raise ValueError("Brave API key is not set")
 
         query = query.strip()
+        country = country or settings.brave_country
+        search_lang = search_lang or settings.brave_search_lang
+        key = SearchResultCache.make_key(query, count, country=country, search_lang=search_lang)
+
+        async def _load() -> list[SearchResult]:
+            return await self._search_flight.do(
+                key,
+                lambda: self._request_search_results(query, count, country, search_lang),
+            )
+
+        entry = self._search_cache.get(key) if settings.search_cache_enabled else None
+        if entry is not None:
+            if not entry.is_fresh:
+                self._revalidate_in_background(_load)
+            logfire.info("Search cache hit", query=query, fresh=entry.is_fresh)
+            results = entry.value
+        else:
+            results = await _load()
+        return [r.model_copy(deep=True) for r in results]
+
+    def _revalidate_in_background(self, load: Callable[[], Awaitable[object]]) -> None:
+        async def _run() -> None:
+            try:
+                await load()
+            except Exception:
+                logger.exception("Background search revalidation failed")
+
+        task = asyncio.create_task(_run())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _request_search_results(
+        self,
+        query: str,
+        count: int,
+        country: Optional[str],
+        search_lang: Optional[str],
+    ) -> list[SearchResult]:
+        """Call the Brave API once under the process-wide throttle and cache the result."""
+        params: dict[str, str | int] = {"q": query, "count": count}
+        if country:
+            params["country"] = country
+        if search_lang:
+            params["search_lang"] = search_lang
 
         self._n_running += 1
         logger.debug(
@@ -108,7 +383,7 @@ class WebDiscovery:
                         "Accept-Encoding": "gzip",
                         "x-subscription-token": settings.brave_api_key,
                     },
-                    params={"q": query, "count": count},
+                    params=params,
                 ) as response:
                     payload = await response.json()
         finally:
@@ -118,22 +393,32 @@ class WebDiscovery:
         if not web_results:
             return []
 
-        return [SearchResult.model_validate(result) for result in web_results]
+        results = [SearchResult.model_validate(result) for result in web_results]
+        if settings.search_cache_enabled:
+            key = SearchResultCache.make_key(
+                query, count, country=country, search_lang=search_lang
+            )
+            self._search_cache.set(key, results)
+        return results
 
     async def _throttle_brave_api(self) -> None:
-        """Ensure at most one Brave API request per second.
+        """Ensure at most one Brave API request per ``brave_min_interval_seconds``.
 
         Uses a shared lock and the last-call timestamp so that concurrent
-        callers queue and respect the minimum interval across the process.
+        callers queue and respect the minimum interval across the process,
+        then reserves a slot in the Postgres-backed limiter so the interval
+        also holds across workers and replicas.
         """
         async with self._api_lock:
             now = monotonic()
-            min_interval_seconds = 1.1
+            min_interval_seconds = settings.brave_min_interval_seconds
             elapsed = now - self._last_brave_call_ts
             if elapsed < min_interval_seconds:
                 wait_s = min_interval_seconds - elapsed
                 logger.debug("Brave API throttling: wait {:.2f}s", wait_s)
                 await asyncio.sleep(wait_s)
+            if settings.brave_distributed_throttle:
+                await self._brave_limiter.acquire()
             # Update after any required wait to mark the time of this call
             self._last_brave_call_ts = monotonic()
 
@@ -149,33 +434,33 @@ class WebDiscovery:
             max_depth=1, include_external=False, max_pages=100
         ),
         crawler: Optional[AsyncWebCrawler] = None,
+        polite: bool = True,
     ) -> list[CrawlResult]:
-        # Build pruning filter per call
-        if pruned:
-            logger.debug("Use pruning filter")
-            prune_filter = PruningContentFilter(
-                threshold=1.0,
-                threshold_type="fixed",
-                min_word_threshold=10,
+        # Single-page crawls are keyed for caching and request coalescing
+        request_key: Optional[str] = None
+        if not deep:
+            request_key = ContentCache.make_key(
+                url,
+                pruned=pruned,
+                ignore_links=ignore_links,
+                ignore_images=ignore_images,
+                escape_html=escape_html,
             )
-        else:
-            logger.debug("Don't use pruning filter")
-            prune_filter = None
-
-        md_generator = DefaultMarkdownGenerator(
-            options={
-                "ignore_links": ignore_links,
-                "ignore_images": ignore_images,
-                "escape_html": escape_html,
-            },
-            content_filter=prune_filter,
-        )
+        if request_key is not None and settings.crawl_cache_enabled:
+            cached = await self._content_cache.get(request_key)
+            if cached is not None:
+                logfire.info("Crawl cache hit", url=url)
+                return cached  # type: ignore[return-value]
+
         config = CrawlerRunConfig(
-            markdown_generator=md_generator,
+            # Markdown and pruning run afterwards on the extraction executor
+            markdown_generator=PassthroughMarkdownGenerator(),
             exclude_external_links=True,
             exclude_internal_links=True,
             exclude_social_media_links=True,
             deep_crawl_strategy=deep_crawl_strategy if deep else None,
+            # Pages found while deep crawling are checked against robots.txt too
+            check_robots_txt=deep and polite and settings.crawl_respect_robots,
         )
 
         async def _run_with_crawler(
@@ -190,82 +475,128 @@ class WebDiscovery:
                 underlying_results = (
                     crawl_result if isinstance(crawl_result, list) else [crawl_result]
                 )
-
-                normalized: list[CrawlResult] = []
-                for r in underlying_results:
-                    if getattr(r, "success", False):
-                        raw_markdown = str(r.markdown.raw_markdown)
-                        fit_markdown = str(r.markdown.fit_markdown)
-                        content = (
-                            fit_markdown
-                            if len(fit_markdown.replace("\n", "").strip()) > 1
-                            else raw_markdown
-                        )
-                        metadata = getattr(r, "metadata", {}) or {}
-                        image_url = (
-                            metadata.get(
-                                "og:image",
-                                metadata.get("twitter:image", ""),
-                            )
-                            or ""
-                        )
-                        title = (
-                            metadata.get(
-                                "title",
-                                metadata.get(
-                                    "og:title",
-                                    metadata.get("twitter:title", ""),
-                                ),
-                            )
-                            or ""
-                        )
-                        description = (
-                            metadata.get(
-                                "description",
-                                metadata.get(
-                                    "og:description",
-                                    metadata.get("twitter:description", ""),
-                                ),
-                            )
-                            or ""
-                        )
-                        page_url = getattr(r, "url", url) or url
-                        logfire.info(
-                            "Crawl success",
-                            url=page_url,
-                            title=title,
-                            description=description,
-                            image_url=image_url,
-                            content=content,
-                            fit_markdown=fit_markdown,
-                            raw_markdown=raw_markdown,
-                        )
-                    else:
-                        page_url = getattr(r, "url", url) or url
-                        title = ""
-                        description = ""
-                        content = ""
-                        image_url = ""
-                        metadata = {}
-                        logfire.info("Crawl failed", url=page_url)
-
-                    normalized.append(
-                        CrawlResult(
-                            url=page_url,
-                            title=title,
-                            description=description,
-                            content=content,
-                            image_url=image_url,
-                            metadata=metadata,
+                self._pool.record_pages(active_crawler, len(underlying_results))
+
+            async def _extract(r) -> CrawlResult:
+                page_url = getattr(r, "url", url) or url
+                if not getattr(r, "success", False) or not r.html:
+                    logfire.info("Crawl failed", url=page_url)
+                    return CrawlResult(**build_crawl_result(page_url, "", "", {}))
+                item = await run_extraction(
+                    r.html,
+                    page_url,
+                    ignore_links=ignore_links,
+                    ignore_images=ignore_images,
+                    escape_html=escape_html,
+                    pruned=pruned,
+                )
+                logfire.info(
+                    "Crawl success",
+                    url=page_url,
+                    title=item["title"],
+                    description=item["description"],
+                    image_url=item["image_url"],
+                    content=item["content"],
+                )
+                return CrawlResult(**item)
+
+            # Extraction runs outside the semaphore, which only bounds browser work
+            return list(await asyncio.gather(*(_extract(r) for r in underlying_results)))
+
+        async def _fetch() -> list[CrawlResult]:
+            # Robots rules and host pacing govern our own crawling; a page a
+            # user asked for (polite=False) is fetched the way a browser would
+            if not polite:
+                return await _fetch_and_cache()
+            if not await self._scheduler.allowed(url):
+                logfire.info("Crawl disallowed by robots.txt", url=url)
+                return [_failed_result(url, "robots_disallowed")]
+            # Host slot first, so a busy host never holds global capacity
+            async with self._scheduler.slot(url):
+                return await _fetch_and_cache()
+
+        async def _fetch_and_cache() -> list[CrawlResult]:
+            # Cheap HTTP tier first; escalate to the browser when it falls short
+            results: Optional[list[CrawlResult]] = None
+            if (
+                request_key is not None
+                and crawler is None
+                and settings.http_fetch_enabled
+                and self._http.should_try(url)
+            ):
+                page = await self._http.fetch(
+                    url,
+                    ignore_links=ignore_links,
+                    ignore_images=ignore_images,
+                    escape_html=escape_html,
+                    pruned=pruned,
+                )
+                if page is not None:
+                    results = [CrawlResult(**page)]
+
+            if results is None:
+                if crawler is None:
+                    async with self._pool.acquire() as pooled_crawler:
+                        results = await _run_with_crawler(pooled_crawler)
+                else:
+                    results = await _run_with_crawler(crawler)
+
+            # Only cache complete successes; failures should be retried next time
+            if (
+                request_key is not None
+                and settings.crawl_cache_enabled
+                and results
+                and all(r["content"] for r in results)
+            ):
+                await self._content_cache.put(request_key, url, list(results))
+            return results
+
+        if request_key is None:
+            return await _fetch()
+        shared = await self._crawl_flight.do(request_key, _fetch)
+        return [CrawlResult(**r) for r in shared]
+
+    @logfire.instrument("web_discovery.discover_links")
+    async def discover_links(self, url: str) -> list[str]:
+        """Return absolute same-host links found on ``url``, e.g. a source homepage.
+
+        Fetches over plain HTTP and falls back to the browser when the page
+        yields no links (JS-rendered listings). Both paths keep only links
+        on the host of ``url``, with or without ``www.``.
+        """
+        if not await self._scheduler.allowed(url):
+            logfire.info("Link discovery disallowed by robots.txt", url=url)
+            return []
+        links: list[str] = []
+        async with self._scheduler.slot(url):
+            if settings.http_fetch_enabled and self._http.should_try(url):
+                fetched = await self._http.fetch_html(url)
+                if fetched is not None:
+                    # Links from the head of an oversized page are still usable
+                    final_url, html, _ = fetched
+                    found = await run_link_extraction(html, final_url)
+                    links = [link for link in found if same_host(link, url)]
+            if not links:
+                config = CrawlerRunConfig(
+                    markdown_generator=PassthroughMarkdownGenerator(),
+                    exclude_external_links=True,
+                    exclude_social_media_links=True,
+                )
+                async with self._pool.acquire() as crawler:
+                    async with self._semaphore:
+                        r = await crawler.arun(url=url, config=config)
+                    self._pool.record_pages(crawler, 1)
+                if getattr(r, "success", False):
+                    internal = (getattr(r, "links", None) or {}).get("internal", [])
+                    links = list(
+                        dict.fromkeys(
+                            l["href"]
+                            for l in internal
+                            if l.get("href") and same_host(l["href"], url)
                         )
                     )
-
-            return normalized
-
-        if crawler is None:
-            async with AsyncWebCrawler() as own_crawler:
-                return await _run_with_crawler(own_crawler)
-        return await _run_with_crawler(crawler)
+        logfire.info("Discovered links", url=url, count=len(links))
+        return links
 
     @logfire.instrument("web_discovery.crawl")
     async def crawl(
@@ -279,11 +610,12 @@ class WebDiscovery:
         deep_crawl_strategy: DeepCrawlStrategy = BFSDeepCrawlStrategy(
             max_depth=1, include_external=False, max_pages=100
         ),
+        polite: bool = True,
     ) -> list[CrawlResult]:
         """Crawl a list of URLs and extract markdown and a preview image.
 
         Applies the same configuration to all URLs. Internally delegates
-        each URL to ``crawl_one`` and reuses a single crawler for efficiency.
+        each URL to ``crawl_one``, which tries plain HTTP before the browser.
 
         Args:
             urls: Iterable of absolute URLs to crawl.
@@ -293,31 +625,117 @@ class WebDiscovery:
             pruned: Whether to enable the pruning content filter.
             deep: Whether to enable deep crawling (follow in-site links).
             deep_crawl_strategy: Strategy to use when deep crawling.
+            polite: Apply robots.txt and per-host pacing; pass ``False`` for
+                pages a user asked for.
 
         Returns:
             List of dicts (one per URL) with keys: 'url', 'title',
             'description', 'content', and 'image_url'.
         """
-        async with AsyncWebCrawler() as crawler:
-            tasks = [
-                self.crawl_one(
-                    url=u,
-                    ignore_links=ignore_links,
-                    ignore_images=ignore_images,
-                    escape_html=escape_html,
-                    pruned=pruned,
-                    deep=deep,
-                    deep_crawl_strategy=deep_crawl_strategy,
-                    crawler=crawler,
+        # Each URL goes HTTP-first and only leases a pooled browser if needed
+        tasks = [
+            self.crawl_one(
+                url=u,
+                ignore_links=ignore_links,
+                ignore_images=ignore_images,
+                escape_html=escape_html,
+                pruned=pruned,
+                deep=deep,
+                deep_crawl_strategy=deep_crawl_strategy,
+                polite=polite,
+            )
+            for u in interleave_by_host(urls)
+        ]
+        per_url_lists = await asyncio.gather(*tasks)
+        # Flatten list[list[CrawlResult]] -> list[CrawlResult]
+        flattened: list[CrawlResult] = [item for sublist in per_url_lists for item in sublist]
+        return flattened
+
+    async def crawl_iter(
+        self,
+        urls: Iterable[str],
+        ignore_links: bool = True,
+        ignore_images: bool = False,
+        escape_html: bool = False,
+        pruned: bool = True,
+        per_url_timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        category: Optional[str] = None,
+        polite: bool = True,
+    ) -> AsyncIterator[CrawlResult]:
+        """Crawl URLs concurrently and yield results in completion order.
+
+        Unlike ``crawl`` this never waits for the slowest page: each URL gets
+        ``per_url_timeout`` seconds and the whole batch ``deadline`` seconds.
+        URLs that time out, fail or miss the deadline are still yielded, with
+        empty content and ``metadata["error"]`` set, so callers can report
+        them as failures. A URL that times out has its crawl cancelled, which
+        releases its host slot and browser capacity.
+
+        Args:
+            urls: Iterable of absolute URLs to crawl.
+            ignore_links: Whether to omit links in generated markdown.
+            ignore_images: Whether to omit images in generated markdown.
+            escape_html: Whether to escape HTML in generated markdown.
+            pruned: Whether to enable the pruning content filter.
+            per_url_timeout: Seconds allowed per URL; defaults to settings.
+            deadline: Seconds allowed for the whole batch; defaults to settings.
+            category: Category for yielded results that have none.
+            polite: Apply robots.txt and per-host pacing; pass ``False`` for
+                pages a user asked for.
+        """
+        if per_url_timeout is None:
+            per_url_timeout = settings.crawl_url_timeout_seconds
+        if deadline is None:
+            deadline = settings.crawl_deadline_seconds
+
+        async def _one(u: str) -> list[CrawlResult]:
+            try:
+                results = await asyncio.wait_for(
+                    self.crawl_one(
+                        url=u,
+                        ignore_links=ignore_links,
+                        ignore_images=ignore_images,
+                        escape_html=escape_html,
+                        pruned=pruned,
+                        polite=polite,
+                    ),
+                    timeout=per_url_timeout,
                 )
-                for u in urls
-            ]
-            per_url_lists = await asyncio.gather(*tasks)
-            # Flatten list[list[CrawlResult]] -> list[CrawlResult]
-            flattened: list[CrawlResult] = [
-                item for sublist in per_url_lists for item in sublist
-            ]
-            return flattened
+            except asyncio.TimeoutError:
+                logfire.info("Crawl timed out", url=u, timeout=per_url_timeout)
+                return [_failed_result(u, "timeout", category)]
+            except Exception:
+                logger.exception("Crawl failed for {}", u)
+                return [_failed_result(u, "error", category)]
+            for r in results:
+                r["category"] = r.get("category") or category
+            return results
+
+        # Round-robin across hosts so one large site does not crowd out the rest
+        tasks = {
+            asyncio.create_task(_one(u)): u for u in interleave_by_host(dict.fromkeys(urls))
+        }
+        pending = set(tasks)
+        ends_at = monotonic() + deadline
+        try:
+            while pending:
+                remaining = ends_at - monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    for item in task.result():
+                        yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+        for task in pending:
+            logfire.info("Crawl missed deadline", url=tasks[task], deadline=deadline)
+            yield _failed_result(tasks[task], "deadline_exceeded", category)
 
     @logfire.instrument("web_discovery.discover")
     async def discover(
@@ -340,15 +758,20 @@ class WebDiscovery:
             return []
         # Build SearchResult models
         results = [SearchResult.model_validate(r) for r in raw_results]
-        # Crawl URLs and merge content into results by URL
+        # Crawl URLs and merge content into results by URL; these answer a
+        # user's query, so they skip crawler politeness
         url_list = [r.url for r in results]
-        crawled = await self.crawl(
-            url_list,
-            pruned=pruned,
-            ignore_links=ignore_links,
-            ignore_images=ignore_images,
-            escape_html=escape_html,
-        )
+        crawled = [
+            item
+            async for item in self.crawl_iter(
+                url_list,
+                pruned=pruned,
+                ignore_links=ignore_links,
+                ignore_images=ignore_images,
+                escape_html=escape_html,
+                polite=False,
+            )
+        ]
         data_by_url = {item.get("url"): item for item in crawled}
         for r in results:
             data = data_by_url.get(r.url) or {}
@@ -357,4 +780,16 @@ class WebDiscovery:
         return results
 
 
-__all__ = ["SearchResult", "WebDiscovery"]
\ No newline at end of file
+def _failed_result(url: str, reason: str, category: Optional[str] = None) -> CrawlResult:
+    return CrawlResult(
+        url=url,
+        title="",
+        description="",
+        content="",
+        image_url="",
+        metadata={"error": reason},
+        category=category,
+    )
+
+
+__all__ = ["CrawlerPool", "SearchResult", "WebDiscovery"]
\ No newline at end of file
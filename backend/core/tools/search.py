@@ -1,5 +1,7 @@
 import logfire
+from core.services.embeddings import get_embedding_index
 from core.services.web_discovery import SearchResult, WebDiscovery
+from settings import settings
 
 
 @logfire.instrument("search")
@@ -19,6 +21,9 @@ async def fetch_url(
 ) -> list[dict]:
     """Fetch content directly from a list of URLs.
 
+    Pages that time out or miss the batch deadline are returned with empty
+    content and ``metadata["error"]`` instead of stalling the whole call.
+
     Args:
         urls: List of URLs to fetch content from.
 
@@ -26,16 +31,39 @@ async def fetch_url(
         List of dictionaries, each containing the URL, content (markdown), and image_url if found.
     """
     svc = WebDiscovery()
-    results = await svc.crawl(
-        urls,
-        ignore_links=ignore_links,
-        ignore_images=ignore_images,
-        escape_html=escape_html,
-        pruned=pruned,
-    )
+    results = [
+        item
+        async for item in svc.crawl_iter(
+            urls,
+            ignore_links=ignore_links,
+            ignore_images=ignore_images,
+            escape_html=escape_html,
+            pruned=pruned,
+            # Requested by the user, so not subject to crawler politeness
+            polite=False,
+        )
+    ]
 
     return results
 
+
+async def search_saved_articles(query: str, k: int = 5) -> list[dict]:
+    """Semantic search over articles already stored by the app.
+
+    Finds stored news articles whose meaning matches the query, even
+    without shared keywords, with no web request. Each result has the
+    title, URL, publish date, similarity score and the best-matching
+    passage. Use web search when results are missing or outdated.
+
+    Args:
+        query: What to look for, phrased as a question or topic.
+        k: Number of articles to return.
+    """
+    if not settings.embedding_enabled:
+        return []
+    return await get_embedding_index().search(query, k=k)
+
+
 if __name__ == "__main__":
     import asyncio
 
@@ -1,3 +1,5 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 import logfire
 from pydantic_ai.messages import (
     BuiltinToolReturnPart,
@@ -45,3 +47,35 @@ def extract_tool_return_parts(
                 logfire.info("Tool found", part=part)
                 tool_return_parts.append(part)
     return tool_return_parts
+
+
+_TRACKING_PARAM_PREFIXES = ("utm_",)
+_TRACKING_PARAMS = {"fbclid", "gclid", "zarsrc", "mc_cid", "mc_eid", "ref", "ref_src"}
+
+
+def normalize_url(url: str) -> str:
+    """Return a canonical form of ``url`` for cache keys and de-duplication.
+
+    Lowercases scheme and host, drops ``www.``, default ports, fragments and
+    tracking parameters, sorts the query and strips trailing slashes.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    netloc = host
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        netloc = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if k.lower() not in _TRACKING_PARAMS
+            and not k.lower().startswith(_TRACKING_PARAM_PREFIXES)
+        )
+    )
+    return urlunsplit((scheme, netloc, path, query, ""))
@@ -49,6 +49,83 @@ async def create_all() -> None:
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
         await conn.run_sync(SQLModel.metadata.create_all)
+        # Bulk suggestion upserts rely on this unique index; tables created
+        # before it existed may hold duplicates, so drop those first
+        await conn.execute(
+            text(
+                """
+                DO $$
+                BEGIN
+                  IF to_regclass('uq_daily_suggestion') IS NULL THEN
+                    DELETE FROM daily_suggestion a
+                    USING daily_suggestion b
+                    WHERE a.suggestion_date = b.suggestion_date
+                      AND a.article_id = b.article_id
+                      AND (a.rank, a.id) > (b.rank, b.id);
+                    CREATE UNIQUE INDEX uq_daily_suggestion
+                      ON daily_suggestion (suggestion_date, article_id);
+                  END IF;
+                END $$;
+                """
+            )
+        )
+        # unaccent() is only STABLE; generated columns and index expressions
+        # need an IMMUTABLE wrapper pinned to the default dictionary
+        await conn.execute(
+            text(
+                """
+                CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+                LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS
+                $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+                """
+            )
+        )
+        # Full-text search over articles: unaccented so queries typed without
+        # Vietnamese diacritics still match; title weighs more than body.
+        # Databases created before the weights keep an unweighted ``tsv``
+        # that ADD COLUMN IF NOT EXISTS would leave alone, so drop it first
+        # (its index goes with it). Adding the column rewrites the table once.
+        await conn.execute(
+            text(
+                """
+                DO $$
+                BEGIN
+                  IF EXISTS (
+                    SELECT 1
+                    FROM pg_attribute a
+                    LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+                    WHERE a.attrelid = 'article'::regclass
+                      AND a.attname = 'tsv'
+                      AND NOT a.attisdropped
+                      AND position('setweight' in coalesce(pg_get_expr(d.adbin, d.adrelid), '')) = 0
+                  ) THEN
+                    ALTER TABLE article DROP COLUMN tsv;
+                  END IF;
+                END $$;
+                """
+            )
+        )
+        await conn.execute(
+            text(
+                """
+                ALTER TABLE article
+                  ADD COLUMN IF NOT EXISTS tsv tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple', f_unaccent(coalesce(title, ''))), 'A') ||
+                    setweight(
+                      to_tsvector('simple', f_unaccent(left(coalesce(content_text, ''), 200000))),
+                      'B'
+                    )
+                  ) STORED
+                """
+            )
+        )
+        for ddl in (
+            "CREATE INDEX IF NOT EXISTS idx_article_tsv ON article USING gin (tsv)",
+            "CREATE INDEX IF NOT EXISTS idx_article_title_unaccent_trgm ON article "
+            "USING gin (f_unaccent(lower(title)) gin_trgm_ops)",
+            "CREATE INDEX IF NOT EXISTS idx_article_url_trgm ON article USING gin (url gin_trgm_ops)",
+        ):
+            await conn.execute(text(ddl))
         # Create or replace trigger function to touch conversation.updated_at
         await conn.execute(
             text(
@@ -50,6 +50,14 @@ CREATE TABLE IF NOT EXISTS conversation_message_run (
 );
 CREATE INDEX IF NOT EXISTS idx_conv_run_conversation_time ON conversation_message_run (conversation_id, created_at);
 
+-- Rolling summary of older conversation turns (history compaction)
+CREATE TABLE IF NOT EXISTS conversation_summary (
+  conversation_id  uuid PRIMARY KEY REFERENCES conversation(id) ON DELETE CASCADE,
+  summary          text NOT NULL,
+  covered_turns    int  NOT NULL DEFAULT 0,
+  updated_at       timestamptz NOT NULL DEFAULT now()
+);
+
 -- Sources
 CREATE TABLE IF NOT EXISTS article_source (
   id            uuid PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -77,15 +85,73 @@ CREATE TABLE IF NOT EXISTS article (
   fetched_at    timestamptz NOT NULL DEFAULT now(),
   metadata      jsonb
 );
-CREATE INDEX IF NOT EXISTS idx_article_title_trgm ON article USING gin (title gin_trgm_ops);
+
+-- unaccent() is STABLE; generated columns and indexes need an IMMUTABLE wrapper
+CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS
+$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+
+CREATE INDEX IF NOT EXISTS idx_article_title_unaccent_trgm
+  ON article USING gin (f_unaccent(lower(title)) gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS idx_article_url_trgm   ON article USING gin (url gin_trgm_ops);
 
+-- Replace the unweighted tsv of older databases with the weighted one
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1
+    FROM pg_attribute a
+    LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    WHERE a.attrelid = 'article'::regclass
+      AND a.attname = 'tsv'
+      AND NOT a.attisdropped
+      AND position('setweight' in coalesce(pg_get_expr(d.adbin, d.adrelid), '')) = 0
+  ) THEN
+    ALTER TABLE article DROP COLUMN tsv;
+  END IF;
+END $$;
+
 ALTER TABLE article
   ADD COLUMN IF NOT EXISTS tsv tsvector GENERATED ALWAYS AS (
-    to_tsvector('simple', unaccent(coalesce(title,'') || ' ' || coalesce(content_text,'')))
+    setweight(to_tsvector('simple', f_unaccent(coalesce(title, ''))), 'A') ||
+    setweight(to_tsvector('simple', f_unaccent(left(coalesce(content_text, ''), 200000))), 'B')
   ) STORED;
 CREATE INDEX IF NOT EXISTS idx_article_tsv ON article USING gin (tsv);
 
+-- Crawled page cache (keyed by normalized URL + crawl options)
+CREATE TABLE IF NOT EXISTS crawl_cache (
+  key           text PRIMARY KEY,
+  url           text NOT NULL,
+  results       jsonb NOT NULL,
+  size_bytes    int  NOT NULL,
+  fetched_at    timestamptz NOT NULL DEFAULT now(),
+  expires_at    timestamptz NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_crawl_cache_url ON crawl_cache (url);
+CREATE INDEX IF NOT EXISTS idx_crawl_cache_expires ON crawl_cache (expires_at);
+
+-- Shared rate limiter state (GCRA theoretical arrival time per key)
+CREATE TABLE IF NOT EXISTS rate_limit_state (
+  key  text PRIMARY KEY,
+  tat  timestamptz NOT NULL
+);
+
+-- URLs already fetched by the incremental discover pass (normalized)
+CREATE TABLE IF NOT EXISTS discovered_url (
+  url            text PRIMARY KEY,
+  source_url     text,
+  first_seen_at  timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_discovered_url_first_seen ON discovered_url (first_seen_at);
+
+-- Conditional GET state for polled feeds and sitemaps
+CREATE TABLE IF NOT EXISTS feed_state (
+  url            text PRIMARY KEY,
+  etag           text,
+  last_modified  text,
+  checked_at     timestamptz NOT NULL DEFAULT now()
+);
+
 -- Daily suggestions
 CREATE TABLE IF NOT EXISTS daily_suggestion (
   id               uuid PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -97,6 +163,37 @@ CREATE TABLE IF NOT EXISTS daily_suggestion (
 CREATE UNIQUE INDEX IF NOT EXISTS uq_daily_suggestion ON daily_suggestion (suggestion_date, article_id);
 CREATE INDEX IF NOT EXISTS idx_daily_suggestion_rank ON daily_suggestion (suggestion_date, rank);
 
+-- Chunk embeddings for semantic search (float32, L2-normalized)
+CREATE TABLE IF NOT EXISTS article_embedding (
+  article_id   uuid NOT NULL REFERENCES article(id) ON DELETE CASCADE,
+  model        text NOT NULL,
+  chunk_index  int  NOT NULL,
+  content      text NOT NULL,
+  embedding    bytea NOT NULL,
+  created_at   timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (article_id, model, chunk_index)
+);
+CREATE INDEX IF NOT EXISTS ix_article_embedding_created_at ON article_embedding (created_at);
+
+-- Failed embedding attempts; retry_at NULL means given up
+CREATE TABLE IF NOT EXISTS article_embedding_failure (
+  article_id  uuid NOT NULL REFERENCES article(id) ON DELETE CASCADE,
+  model       text NOT NULL,
+  attempts    int  NOT NULL DEFAULT 1,
+  error       text NOT NULL,
+  failed_at   timestamptz NOT NULL DEFAULT now(),
+  retry_at    timestamptz,
+  PRIMARY KEY (article_id, model)
+);
+
+-- Materialized featured responses, one per suggestion day
+CREATE TABLE IF NOT EXISTS featured_snapshot (
+  day       date PRIMARY KEY,
+  payload   jsonb NOT NULL,
+  etag      text NOT NULL,
+  built_at  timestamptz NOT NULL DEFAULT now()
+);
+
 -- Citations
 CREATE TABLE IF NOT EXISTS message_citation (
   id           uuid PRIMARY KEY DEFAULT gen_random_uuid(),
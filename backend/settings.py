@@ -1,3 +1,4 @@
+from datetime import time as dt_time
 from typing import Literal, Optional
 
 from dotenv import load_dotenv
@@ -19,6 +20,8 @@ class Settings(BaseSettings):
     # For deep research
     lead_research_llm_model: str = "gemini-2.5-flash"
     subagent_research_llm_model: str = "gemini-2.5-flash"
+    # Prompt tokens of fetched pages handed to the citation agent
+    citation_prompt_token_budget: int = 24_000
 
     google_api_key: Optional[str] = None
     openai_api_key: Optional[str] = None
@@ -30,6 +33,13 @@ class Settings(BaseSettings):
     # Web Search
     brave_api_key: Optional[str] = None
     brave_search_url: str = "https://api.search.brave.com/res/v1/web/search"
+    # Optional locale hints forwarded to Brave (e.g. "vn", "vi")
+    brave_country: Optional[str] = None
+    brave_search_lang: Optional[str] = None
+    # Minimum spacing between Brave calls, enforced per process and,
+    # when enabled, across all workers/replicas through Postgres
+    brave_min_interval_seconds: float = 1.1
+    brave_distributed_throttle: bool = True
 
     # Telemetry
     logfire_token: Optional[str] = None
@@ -164,6 +174,10 @@ class Settings(BaseSettings):
             "patterns": [
                 ".html",
             ],
+            # RSS/Atom feeds or news sitemaps polled instead of the homepage
+            "feeds": [
+                "https://vnexpress.net/rss/tin-moi-nhat.rss",
+            ],
             "category": "Thời sự",
             "target_prompt": "Curate top-impact, breaking news from VnExpress focusing on Current Affairs (Thời sự), World (Thế giới), Business (Kinh doanh), and Law (Pháp luật). Prioritize articles with significant national or international implications, major policy changes, or market-moving business developments. Exclude soft news, local-only stories, sports, and entertainment unless of major national importance.",
         },
@@ -189,10 +203,155 @@ class Settings(BaseSettings):
         },
     ]
 
+    # Incremental discover: only fetch article URLs not seen before
+    discover_incremental: bool = True
+    # Rebuild the in-memory seen-URL Bloom filter from the database this often
+    discover_seen_reload_seconds: int = 6 * 3600
+    # Forget discovered (not stored) URLs after this many days; 0 keeps them
+    discover_seen_retention_days: int = 90
+    # Prefer RSS/Atom feeds and news sitemaps over crawling listing pages
+    discover_feeds_enabled: bool = True
+    # Ignore feed entries older than this (sitemaps can list years of articles)
+    discover_feed_max_age_hours: int = 48
+    feed_max_bytes: int = 10 * 1024 * 1024
+    # Child sitemaps to follow from a sitemap index, newest first
+    feed_max_child_sitemaps: int = 2
+    # Discover pipeline: sources crawled / LLM-selected at the same time
+    discover_crawl_concurrency: int = 2
+    discover_select_concurrency: int = 2
+    # Select for several sources in one LLM call (saves requests under RPM limits)
+    discover_batch_selection: bool = True
+    # Near-duplicate collapsing (SimHash, Hamming distance) before selection
+    discover_dedup_enabled: bool = True
+    discover_dedup_max_distance: int = 3
+    # Also skip pages near-identical to articles stored in the last N days
+    discover_dedup_lookback_days: int = 7
+    # Prompt tokens for one source's posts (lead paragraphs are kept first).
+    # Token budgets are estimated by prompt_packer at 3.5 chars per token
+    discover_prompt_token_budget: int = 12_000
+    discover_batch_token_budget: int = 60_000
+    # How long a ready source waits for others to join its batch
+    discover_batch_linger_seconds: float = 5.0
+
+    # Featured snapshot: how often a worker re-checks the DB for a newer one
+    featured_snapshot_ttl_seconds: int = 60
+    # Cache-Control max-age for GET /api/featured
+    featured_cache_max_age_seconds: int = 60
+    # Summary snippet length on featured cards (cut in SQL)
+    featured_summary_chars: int = 400
+    # Featured scheduler: daily run ahead of the 06:00 cutoff (local time)
+    featured_scheduler_enabled: bool = True
+    featured_scheduler_tick_seconds: int = 60
+    featured_generate_time: dt_time = dt_time(5, 30)
+    # Incremental refreshes during the day (0 disables)
+    featured_refresh_interval_minutes: int = 180
+    featured_refresh_until_hour: int = 22
+    # Back-off after a failed or empty daily run
+    featured_retry_minutes: int = 15
+
+    # Chat search_web answers from stored articles when enough fresh, relevant
+    # ones exist (score = ts_rank_cd + title similarity); otherwise Brave + crawl
+    retrieval_local_enabled: bool = True
+    retrieval_max_age_hours: int = 48
+    retrieval_min_score: float = 0.1
+    retrieval_min_results: int = 3
+    # Article text returned per local hit
+    retrieval_content_chars: int = 4000
+
+    # Semantic search over stored articles (chunk embeddings, in-memory flat index)
+    embedding_enabled: bool = True
+    # "openai" also covers OpenAI-compatible servers via embedding_base_url
+    embedding_provider: Literal["google", "openai", "ollama"] = "google"
+    embedding_model: str = "gemini-embedding-001"
+    embedding_dimensions: int = 768
+    embedding_base_url: str = "https://api.openai.com/v1"
+    embedding_batch_size: int = 64
+    embedding_chunk_chars: int = 1500
+    embedding_chunk_overlap: int = 200
+    embedding_max_chunks_per_article: int = 8
+    # Articles embedded per scheduler tick
+    embedding_index_batch_articles: int = 100
+    # How often a worker loads chunks embedded elsewhere
+    embedding_index_reload_seconds: int = 300
+    # Failed articles are retried after base * 2^(attempts-1), then given up
+    embedding_retry_base_seconds: int = 15 * 60
+    embedding_max_attempts: int = 8
+
+    # Parsed chat history kept per conversation (validated ModelMessage lists)
+    history_cache_max_bytes: int = 64 * 1024 * 1024
+    history_cache_ttl_seconds: int = 3600
+    # History compaction: the last N turns go to the model verbatim, older
+    # tool returns are trimmed, and turns beyond that fold into a summary
+    history_keep_turns: int = 6
+    history_tool_return_max_chars: int = 600
+    history_summary_enabled: bool = True
+    # Refresh the summary once this many trimmed turns are not in it yet
+    history_summary_min_turns: int = 4
+    # Transcript size sent to the summarizer per refresh
+    history_summary_max_chars: int = 40_000
+
     # RPM
     gemini_flash_rpm: int = 5
     gemini_pro_rpm: int = 3
 
+    # Crawler pool (warm headless browsers shared by all crawl calls)
+    crawler_pool_size: int = 2
+    # Recycle a browser after it has served this many pages
+    crawler_pool_max_pages: int = 200
+
+    # Streaming crawls: per-URL timeout and overall deadline per batch
+    crawl_url_timeout_seconds: float = 30.0
+    crawl_deadline_seconds: float = 60.0
+
+    # Per-host crawl politeness
+    crawl_per_host_concurrency: int = 2
+    crawl_default_delay_seconds: float = 0.5
+    # Cap on a robots.txt Crawl-delay so one site cannot stall a batch
+    crawl_max_delay_seconds: float = 10.0
+    crawl_respect_robots: bool = True
+    # Product token matched against robots.txt User-agent groups; requests
+    # still send ``http_user_agent``
+    crawl_robots_user_agent: str = "OpenAIHayBot"
+    crawl_robots_ttl_seconds: int = 24 * 3600
+    # Bounds on per-origin robots.txt and per-host state kept in memory
+    crawl_robots_cache_max_entries: int = 5000
+    crawl_robots_cache_max_bytes: int = 32 * 1024 * 1024
+    crawl_host_state_max_entries: int = 5000
+
+    # Where HTML-to-markdown extraction runs: a process pool keeps the event
+    # loop responsive, "thread" avoids worker start-up, "inline" disables offloading
+    extraction_executor: Literal["process", "thread", "inline"] = "process"
+    extraction_workers: int = 2
+
+    # HTTP-first fetch tier (escalates to the browser when a page looks
+    # empty or JS-dependent)
+    http_fetch_enabled: bool = True
+    http_fetch_timeout_seconds: float = 15.0
+    http_fetch_pool_size: int = 32
+    http_fetch_max_bytes: int = 5 * 1024 * 1024
+    http_fetch_min_content_chars: int = 400
+    # How long to remember that a domain needs the browser
+    http_fetch_domain_memory_seconds: int = 24 * 3600
+    # Bound on hosts whose HTTP-vs-browser stats are kept in memory
+    http_fetch_domain_max_entries: int = 5000
+    http_user_agent: str = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+    )
+
+    # Crawled page cache (in-process LRU + Postgres)
+    crawl_cache_enabled: bool = True
+    crawl_cache_ttl_seconds: int = 6 * 3600
+    crawl_cache_memory_bytes: int = 64 * 1024 * 1024
+    crawl_cache_db_bytes: int = 512 * 1024 * 1024
+
+    # Brave search result cache (stale-while-revalidate)
+    search_cache_enabled: bool = True
+    search_cache_news_ttl_seconds: int = 10 * 60
+    search_cache_ttl_seconds: int = 24 * 3600
+    search_cache_stale_seconds: int = 3600
+    search_cache_memory_bytes: int = 16 * 1024 * 1024
+
     @property
     def model(self) -> Model:
         if self.llm_provider == "openai":
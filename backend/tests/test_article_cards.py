@@ -0,0 +1,38 @@
+import asyncio
+import re
+from datetime import date
+from types import SimpleNamespace
+from uuid import uuid4
+
+from conftest import RecordingSession
+from core.repositories import ArticleCard, DailySuggestionRepository
+
+
+def test_card_from_row_fills_empty_fields():
+    article_id = uuid4()
+    row = SimpleNamespace(
+        _mapping={
+            "id": article_id,
+            "url": "https://a.vn/1",
+            "title": None,
+            "image_url": None,
+            "category": None,
+            "published_at": None,
+            "summary": None,
+            "keywords": None,
+        }
+    )
+    card = ArticleCard.from_row(row)
+    assert (card.id, card.title, card.summary, card.keywords) == (article_id, "", "", [])
+
+
+def test_day_cards_never_select_full_text_or_metadata():
+    session = RecordingSession()
+    asyncio.run(DailySuggestionRepository(session).list_cards_for_day(date(2025, 10, 6), summary_chars=200))
+    sql = str(session.statements[0])
+    select_list = sql.split("FROM daily_suggestion", 1)[0]
+    assert "left(coalesce(nullif(s.reason, ''), a.content_text), :n) AS summary" in select_list
+    # content_text only appears inside left(); metadata only inside the keyword lateral
+    assert len(re.findall(r"a\.content_text", select_list)) == 1
+    assert "a.metadata" not in select_list
+    assert "ORDER BY s.rank ASC" in sql
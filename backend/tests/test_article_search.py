@@ -0,0 +1,45 @@
+import asyncio
+import base64
+from uuid import uuid4
+
+import pytest
+from api.routers.articles import _decode_cursor, _encode_cursor
+from conftest import RecordingSession, compile_pg
+from core.repositories.article import ArticleRepository
+from fastapi import HTTPException
+
+
+@pytest.mark.parametrize("score", [0.0, 0.1, 1 / 3, 12.345678901234567])
+def test_cursor_round_trips_exactly(score):
+    article_id = uuid4()
+    cursor = _encode_cursor(score, article_id)
+    assert "=" not in cursor
+    assert _decode_cursor(cursor) == (score, article_id)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["", "!!!", base64.urlsafe_b64encode(b"0.5").decode(), base64.urlsafe_b64encode(b"x:not-a-uuid").decode()],
+)
+def test_invalid_cursor_is_a_client_error(cursor):
+    with pytest.raises(HTTPException) as exc:
+        _decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def _search_sql(**kwargs):
+    session = RecordingSession()
+    asyncio.run(ArticleRepository(session).search("giá vàng", **kwargs))
+    return compile_pg(session.statements[0])
+
+
+def test_search_pages_by_score_then_id():
+    sql = _search_sql(limit=10, after=(0.42, uuid4()))
+    assert "(anon_1.score, anon_1.id) < (" in sql
+    assert "ORDER BY anon_1.score DESC, anon_1.id DESC" in sql
+
+
+def test_first_page_has_no_keyset_condition():
+    sql = _search_sql(category="kinh-doanh")
+    assert ") < (" not in sql
+    assert "article.category = " in sql
@@ -0,0 +1,72 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from conftest import compile_pg
+from core.repositories.article_source import ArticleSourceRepository
+
+
+class _Rows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class _SourceSession:
+    """Answers the bulk upsert with ``(id, domain, inserted)`` rows."""
+
+    def __init__(self, existing):
+        self.existing = existing
+        self.statements = []
+        self.ids = {}
+
+    async def execute(self, stmt, *args, **kwargs):
+        self.statements.append(stmt)
+        params = stmt.compile().params
+        domains = [v for k, v in params.items() if k.startswith("domain_m")]
+        rows = []
+        for d in domains:
+            self.ids.setdefault(d, uuid4())
+            rows.append((self.ids[d], d, d not in self.existing))
+        return _Rows(rows)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(ArticleSourceRepository, "_id_cache", {})
+
+
+def test_one_statement_resolves_existing_and_new_domains():
+    session = _SourceSession(existing={"vnexpress.net"})
+    domains = ["vnexpress.net", "new.vn", "", "new.vn"]
+    resolved = asyncio.run(ArticleSourceRepository(session).get_or_create_many(domains))
+    assert set(resolved) == {"vnexpress.net", "new.vn"}
+    (stmt,) = session.statements
+    sql = compile_pg(stmt)
+    # The no-op update makes existing rows come back from RETURNING
+    assert "ON CONFLICT (domain) DO UPDATE SET domain = excluded.domain" in sql
+    assert "xmax = 0 AS inserted" in sql
+
+
+def test_only_preexisting_sources_are_cached():
+    session = _SourceSession(existing={"vnexpress.net"})
+    repo = ArticleSourceRepository(session)
+    first = asyncio.run(repo.get_or_create_many(["vnexpress.net", "new.vn"]))
+    # A row inserted in this transaction may still roll back
+    assert ArticleSourceRepository._id_cache == {"vnexpress.net": first["vnexpress.net"]}
+
+    second = asyncio.run(repo.get_or_create_many(["vnexpress.net", "new.vn"]))
+    assert second == first
+    params = session.statements[-1].compile().params
+    assert [v for k, v in params.items() if k.startswith("domain_m")] == ["new.vn"]
+
+
+def test_fully_cached_lookup_skips_the_database():
+    source_id = uuid4()
+    ArticleSourceRepository._id_cache["vnexpress.net"] = source_id
+    session = _SourceSession(existing=set())
+    resolved = asyncio.run(ArticleSourceRepository(session).get_or_create_many(["vnexpress.net"]))
+    assert resolved == {"vnexpress.net": source_id}
+    assert session.statements == []
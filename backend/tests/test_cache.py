@@ -0,0 +1,61 @@
+import pytest
+from core.services import cache as cache_module
+from core.services.cache import LRUCache
+
+
+@pytest.fixture(autouse=True)
+def _frozen_time(monkeypatch, clock):
+    monkeypatch.setattr(cache_module, "monotonic", clock)
+
+
+def test_entry_is_fresh_then_stale_then_gone(clock):
+    cache: LRUCache[str] = LRUCache(max_bytes=1000)
+    cache.set("k", "v", size=10, ttl=10, stale_ttl=5)
+
+    entry = cache.get("k")
+    assert entry is not None and entry.is_fresh and entry.value == "v"
+
+    clock.advance(12)
+    entry = cache.get("k")
+    assert entry is not None and not entry.is_fresh
+
+    clock.advance(4)
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache: LRUCache[str] = LRUCache(max_bytes=100)
+    cache.set("a", "a", size=40, ttl=60)
+    cache.set("b", "b", size=40, ttl=60)
+    # Touch "a" so "b" is the least recently used
+    assert cache.get("a") is not None
+    cache.set("c", "c", size=40, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["bytes"] == 80
+
+
+def test_max_entries_bound():
+    cache: LRUCache[int] = LRUCache(max_bytes=10**6, max_entries=2)
+    for i in range(3):
+        cache.set(i, i, size=1, ttl=60)
+    assert cache.get(0) is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_oversized_value_is_not_stored():
+    cache: LRUCache[str] = LRUCache(max_bytes=10)
+    cache.set("big", "x", size=11, ttl=60)
+    assert cache.get("big") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_replacing_a_key_keeps_byte_count_exact():
+    cache: LRUCache[str] = LRUCache(max_bytes=100)
+    cache.set("k", "v1", size=30, ttl=60)
+    cache.set("k", "v2", size=20, ttl=60)
+    assert cache.stats()["bytes"] == 20
+    assert cache.get("k").value == "v2"
@@ -0,0 +1,127 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from core.services import base
+from core.services.base import BaseConversationService, _estimate_size
+from core.services.cache import LRUCache
+from pydantic_ai.messages import (
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    UserPromptPart,
+)
+from pydantic_core import to_jsonable_python
+from settings import settings
+
+
+def _run_messages(text):
+    return to_jsonable_python(
+        [
+            ModelRequest(parts=[UserPromptPart(content=text)]),
+            ModelResponse(parts=[TextPart(content=f"Trả lời: {text}")]),
+        ]
+    )
+
+
+class _Repo:
+    """In-memory stand-in for the run queries of ``ConversationRepository``."""
+
+    def __init__(self, conversation_id):
+        self.conversation_id = conversation_id
+        self.runs = {}
+        self.order = []
+        self.fetched = []
+
+    def add(self, text):
+        return self._store(self.conversation_id, _run_messages(text))
+
+    def _store(self, conversation_id, messages):
+        run = SimpleNamespace(id=uuid4(), conversation_id=conversation_id, messages=messages)
+        self.runs[run.id] = run
+        self.order.append(run.id)
+        return run
+
+    async def list_message_run_ids(self, conversation_id):
+        return list(self.order)
+
+    async def list_message_runs_by_ids(self, ids):
+        self.fetched.append(list(ids))
+        return [self.runs[i] for i in ids]
+
+    async def add_message_run(self, conversation, messages):
+        return self._store(conversation.id, messages)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(base, "_history_cache", LRUCache(max_bytes=settings.history_cache_max_bytes))
+    # Short histories: compaction returns them unchanged without a database
+    monkeypatch.setattr(settings, "history_keep_turns", 100)
+    svc = BaseConversationService(session=None)
+    svc.conversation_repo = _Repo(uuid4())
+    return svc
+
+
+def _texts(messages):
+    return [m.parts[0].content for m in messages]
+
+
+def test_new_runs_are_parsed_once(service):
+    repo = service.conversation_repo
+    repo.add("một")
+    first = asyncio.run(service.load_message_history(repo.conversation_id))
+    second_run = repo.add("hai")
+    second = asyncio.run(service.load_message_history(repo.conversation_id))
+    assert _texts(first) == ["một", "Trả lời: một"]
+    assert _texts(second)[2:] == ["hai", "Trả lời: hai"]
+    # Only the run missing from the cache is read the second time
+    assert repo.fetched[-1] == [second_run.id]
+
+
+def test_foreign_run_rebuilds_the_cache(service):
+    repo = service.conversation_repo
+    kept = repo.add("một")
+    rolled_back = repo.add("hai")
+    asyncio.run(service.load_message_history(repo.conversation_id))
+    # The cached run ids are no longer a prefix of the stored ones
+    repo.order.remove(rolled_back.id)
+    other = repo.add("ba")
+    messages = asyncio.run(service.load_message_history(repo.conversation_id))
+    assert _texts(messages) == ["một", "Trả lời: một", "ba", "Trả lời: ba"]
+    assert repo.fetched[-1] == [kept.id, other.id]
+
+
+def test_persisted_run_extends_the_cache_with_the_same_size_estimate(service):
+    repo = service.conversation_repo
+    repo.add("một")
+    asyncio.run(service.load_message_history(repo.conversation_id))
+    conversation = SimpleNamespace(id=repo.conversation_id)
+    asyncio.run(service.persist_message_run(conversation, _run_messages("hai")))
+    fetches = len(repo.fetched)
+    messages = asyncio.run(service.load_message_history(repo.conversation_id))
+    assert len(repo.fetched) == fetches
+    assert _texts(messages)[2:] == ["hai", "Trả lời: hai"]
+
+    extended = base._history_cache.get(repo.conversation_id).size
+    base._history_cache.clear()
+    asyncio.run(service.load_message_history(repo.conversation_id))
+    # Loading both runs from the database gives the same size as load + extend
+    assert base._history_cache.get(repo.conversation_id).size == extended
+
+
+def test_unparseable_persisted_run_invalidates_the_cache(service):
+    repo = service.conversation_repo
+    repo.add("một")
+    asyncio.run(service.load_message_history(repo.conversation_id))
+    conversation = SimpleNamespace(id=repo.conversation_id)
+    asyncio.run(service.persist_message_run(conversation, [{"kind": "nope"}]))
+    assert base._history_cache.get(repo.conversation_id) is None
+
+
+def test_size_estimate_counts_payloads():
+    short = ModelMessagesTypeAdapter.validate_python(_run_messages("x"))
+    long = ModelMessagesTypeAdapter.validate_python(_run_messages("x" * 10_000))
+    assert _estimate_size(long) - _estimate_size(short) >= 2 * 10_000
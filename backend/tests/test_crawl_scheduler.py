@@ -0,0 +1,197 @@
+import asyncio
+from time import monotonic
+from urllib.robotparser import RobotFileParser
+
+import pytest
+from core.services.crawl_scheduler import (
+    HostScheduler,
+    RobotsCache,
+    _RobotsEntry,
+    interleave_by_host,
+    same_host,
+)
+from core.services.http_fetcher import HttpFetcher
+from core.services.web_discovery import WebDiscovery
+from settings import settings
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(settings, "crawl_respect_robots", False)
+    monkeypatch.setattr(settings, "crawl_default_delay_seconds", 0.0)
+    return HostScheduler(HttpFetcher())
+
+
+def test_interleave_by_host_round_robins_and_keeps_host_order():
+    urls = ["https://a.vn/1", "https://a.vn/2", "https://a.vn/3", "https://b.vn/1", "https://c.vn/1"]
+    assert interleave_by_host(urls) == [
+        "https://a.vn/1",
+        "https://b.vn/1",
+        "https://c.vn/1",
+        "https://a.vn/2",
+        "https://a.vn/3",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("a", "b", "expected"),
+    [
+        ("https://www.vnexpress.net/x", "https://vnexpress.net/", True),
+        ("https://VnExpress.net/x", "https://vnexpress.net", True),
+        ("https://e.vnexpress.net/x", "https://vnexpress.net", False),
+        ("https://other.vn/x", "https://vnexpress.net", False),
+    ],
+)
+def test_same_host(a, b, expected):
+    assert same_host(a, b) is expected
+
+
+def test_host_state_is_bounded_and_keeps_busy_hosts(scheduler, monkeypatch):
+    monkeypatch.setattr(settings, "crawl_host_state_max_entries", 3)
+
+    async def scenario():
+        async with scheduler.slot("https://busy.vn/a"):
+            for i in range(5):
+                async with scheduler.slot(f"https://h{i}.vn/"):
+                    pass
+            return list(scheduler._hosts)
+
+    hosts = asyncio.run(scenario())
+    assert len(hosts) == 3
+    # The host with a fetch in flight survives eviction
+    assert "busy.vn" in hosts
+    assert "h4.vn" in hosts
+
+
+def test_new_host_is_not_evicted_when_all_others_are_busy(scheduler, monkeypatch):
+    monkeypatch.setattr(settings, "crawl_host_state_max_entries", 2)
+    monkeypatch.setattr(settings, "crawl_per_host_concurrency", 1)
+
+    async def scenario():
+        async with scheduler.slot("https://a.vn/"), scheduler.slot("https://b.vn/"):
+            first = scheduler._state("new.vn")
+            second = scheduler._state("new.vn")
+            async with scheduler.slot("https://new.vn/1"):
+                # The per-host cap still holds for the new host
+                blocked = asyncio.create_task(_enter(scheduler, "https://new.vn/2"))
+                await asyncio.sleep(0.01)
+                waiting = not blocked.done()
+            await blocked
+            return first is second, waiting, len(scheduler._hosts)
+
+    same, waiting, size = asyncio.run(scenario())
+    assert same
+    assert waiting
+    # Nothing was idle, so the table overshoots instead of dropping live state
+    assert size == 3
+
+
+async def _enter(scheduler, url):
+    async with scheduler.slot(url):
+        pass
+
+
+def test_robots_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "crawl_robots_cache_max_entries", 2)
+    robots = RobotsCache(HttpFetcher())
+    loads: list[str] = []
+
+    async def fake_load(origin):
+        loads.append(origin)
+        return _RobotsEntry(parser=None, expires_at=monotonic() + 3600)
+
+    monkeypatch.setattr(robots, "_load", fake_load)
+
+    async def scenario():
+        for host in ("a", "b", "c", "a"):
+            await robots.get(f"https://{host}.vn/page")
+
+    asyncio.run(scenario())
+    assert robots._entries.stats()["entries"] == 2
+    # "a" was evicted by "c", so it is loaded again
+    assert loads == ["https://a.vn", "https://b.vn", "https://c.vn", "https://a.vn"]
+
+
+@pytest.fixture
+def svc(monkeypatch):
+    # Host pacing must not fetch a real robots.txt; robots checks are patched per test
+    monkeypatch.setattr(settings, "crawl_respect_robots", False)
+    monkeypatch.setattr(settings, "crawl_default_delay_seconds", 0.0)
+    monkeypatch.setattr(settings, "crawl_cache_enabled", False)
+    monkeypatch.setattr(WebDiscovery, "_instance", None)
+    return WebDiscovery()
+
+
+def _page(url):
+    return {"url": url, "title": "t", "description": "", "content": "c",
+            "image_url": "", "metadata": {}}
+
+
+def test_user_fetches_skip_robots(svc, monkeypatch):
+    async def disallow(url):
+        return False
+
+    async def fetch(url, **kwargs):
+        return _page(url)
+
+    monkeypatch.setattr(svc._scheduler, "allowed", disallow)
+    monkeypatch.setattr(svc._http, "fetch", fetch)
+    url = "https://example.com/a"
+
+    polite = asyncio.run(svc.crawl_one(url))
+    user = asyncio.run(svc.crawl_one(url, polite=False))
+
+    assert polite[0]["metadata"] == {"error": "robots_disallowed"}
+    assert user[0]["content"] == "c"
+
+
+def test_discover_links_keeps_only_same_host_links(svc, monkeypatch):
+    html = (
+        "<a href='/tin-1'>1</a>"
+        "<a href='https://www.example.com/tin-2'>2</a>"
+        "<a href='https://facebook.com/share'>x</a>"
+        "<a href='https://cdn.example.com/a.js'>y</a>"
+    )
+
+    async def allow(url):
+        return True
+
+    async def fetch_html(url):
+        return url, html, False
+
+    monkeypatch.setattr(svc._scheduler, "allowed", allow)
+    monkeypatch.setattr(svc._http, "fetch_html", fetch_html)
+    monkeypatch.setattr(settings, "extraction_executor", "inline")
+
+    links = asyncio.run(svc.discover_links("https://example.com/"))
+    assert links == ["https://example.com/tin-1", "https://www.example.com/tin-2"]
+
+
+def test_robots_rules_match_the_crawler_token_not_the_browser_ua(monkeypatch):
+    monkeypatch.setattr(settings, "crawl_robots_user_agent", "OpenAIHayBot")
+    robots = RobotsCache(HttpFetcher())
+    parser = RobotFileParser()
+    parser.parse(
+        [
+            "User-agent: OpenAIHayBot",
+            "Disallow: /private",
+            "Crawl-delay: 7",
+            "",
+            "User-agent: *",
+            "Disallow: /",
+        ]
+    )
+
+    async def fake_load(origin):
+        return _RobotsEntry(parser=parser, expires_at=monotonic() + 3600)
+
+    monkeypatch.setattr(robots, "_load", fake_load)
+
+    async def scenario():
+        return (
+            await robots.can_fetch("https://a.vn/tin-1"),
+            await robots.can_fetch("https://a.vn/private/x"),
+            await robots.crawl_delay("https://a.vn/tin-1"),
+        )
+
+    assert asyncio.run(scenario()) == (True, False, 7.0)
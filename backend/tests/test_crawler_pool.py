@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from core.services.web_discovery import CrawlerPool, _PooledCrawler
+
+
+class _FakeCrawler:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class _Launcher:
+    """Stands in for ``CrawlerPool._launch``; launches finish when released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.started = 0
+        self.fail = False
+
+    async def __call__(self):
+        self.started += 1
+        await self.release.wait()
+        if self.fail:
+            raise OSError("browser did not start")
+        return _PooledCrawler(crawler=_FakeCrawler())
+
+
+def _pool(monkeypatch, size=2):
+    pool = CrawlerPool(size=size, max_pages=100)
+    launcher = _Launcher()
+    monkeypatch.setattr(pool, "_launch", launcher)
+    return pool, launcher
+
+
+def test_launch_does_not_hold_the_pool_lock(monkeypatch):
+    async def scenario():
+        pool, launcher = _pool(monkeypatch)
+        first = asyncio.create_task(pool._checkout())
+        await asyncio.sleep(0)
+        # Other pool operations proceed while the browser starts
+        await asyncio.wait_for(pool._lock.acquire(), timeout=0.1)
+        pool._lock.release()
+        second = asyncio.create_task(pool._checkout())
+        third = asyncio.create_task(pool._checkout())
+        await asyncio.sleep(0.01)
+        pending = (launcher.started, pool._launching, third.done())
+        launcher.release.set()
+        entries = await asyncio.gather(first, second, third)
+        return pending, entries, pool
+
+    (started, launching, third_done), entries, pool = asyncio.run(scenario())
+    # Two slots are reserved; the third caller waits instead of launching more
+    assert (started, launching, third_done) == (2, 2, False)
+    assert len({id(e) for e in entries}) == 2
+    assert sorted(e.leases for e in pool._entries) == [1, 2]
+    assert pool._launching == 0
+
+
+def test_failed_launch_releases_its_slot(monkeypatch):
+    async def scenario():
+        pool, launcher = _pool(monkeypatch, size=1)
+        launcher.fail = True
+        launcher.release.set()
+        with pytest.raises(OSError):
+            await pool._checkout()
+        assert pool._launching == 0
+        launcher.fail = False
+        entry = await pool._checkout()
+        return entry, pool
+
+    entry, pool = asyncio.run(scenario())
+    assert pool._entries == [entry]
+    assert entry.leases == 1
+
+
+def test_close_during_launch_shuts_the_new_browser(monkeypatch):
+    async def scenario():
+        pool, launcher = _pool(monkeypatch, size=1)
+        checkout = asyncio.create_task(pool._checkout())
+        await asyncio.sleep(0)
+        await asyncio.wait_for(pool.close(), timeout=1)
+        launcher.release.set()
+        with pytest.raises(RuntimeError):
+            await checkout
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert pool._entries == []
+    assert pool._launching == 0
+
+
+def test_start_fills_the_pool_without_leases(monkeypatch):
+    async def scenario():
+        pool, launcher = _pool(monkeypatch, size=3)
+        launcher.release.set()
+        await pool.start()
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert [e.leases for e in pool._entries] == [0, 0, 0]
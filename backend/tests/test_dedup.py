@@ -0,0 +1,88 @@
+import asyncio
+import random
+import re
+
+from conftest import RecordingSession, compile_pg
+from core.models import Article
+from core.repositories.article import ArticleRepository
+from core.services.dedup import NearDuplicateFilter, SimHashIndex, hamming, simhash, simhashes
+
+_WORDS = "giá vàng hôm nay tăng mạnh trong nước thế giới nhà đầu tư ngân hàng lãi suất".split()
+
+
+def _article(seed, n=200):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+
+def _flip(fp, bits):
+    for b in bits:
+        fp ^= 1 << b
+    return fp
+
+
+def test_simhash_is_stable_and_ignores_case():
+    text = _article(1)
+    assert simhash(text) == simhash(text.upper())
+    assert simhashes([text, "quá ngắn"]) == [simhash(text), None]
+
+
+def test_small_edits_stay_close_and_different_texts_do_not():
+    text = _article(1)
+    edited = text + " cập nhật lúc 10 giờ"
+    assert hamming(simhash(text), simhash(edited)) <= 3
+    assert hamming(simhash(text), simhash(_article(2))) > 3
+
+
+def test_index_finds_fingerprints_within_distance_in_any_band():
+    index = SimHashIndex(max_distance=3)
+    base = 0x0123_4567_89AB_CDEF
+    index.add("a", base)
+    # One flipped bit in each of the four bands: no band matches exactly for
+    # a 4-bit change, but up to 3 bits always leaves one band intact
+    assert index.near(_flip(base, [0, 20, 40])) == [("a", 3)]
+    assert index.near(_flip(base, [0, 20, 40, 60])) == []
+    index.add("a", 0)
+    assert len(index) == 1
+
+
+def test_index_orders_matches_by_distance():
+    index = SimHashIndex(max_distance=3)
+    index.add("far", _flip(0, [1, 2]))
+    index.add("near", _flip(0, [63]))
+    assert index.near(0) == [("near", 1), ("far", 2)]
+
+
+def test_filter_keeps_longest_and_records_collapsed_urls():
+    text = _article(1)
+    items = [
+        {"url": "https://a.vn/short", "content": text, "metadata": {}},
+        {"url": "https://b.vn/long", "content": text + " thêm", "metadata": {"k": 1}},
+        {"url": "https://c.vn/other", "content": _article(2), "metadata": {}},
+        {"url": "https://d.vn/tiny", "content": "ngắn", "metadata": {}},
+    ]
+    fps = simhashes([i["content"] for i in items])
+    dedup = NearDuplicateFilter()
+    kept = dedup.collapse(items, fps)
+    assert [i["url"] for i in kept] == ["https://b.vn/long", "https://c.vn/other", "https://d.vn/tiny"]
+    assert kept[0]["metadata"]["duplicate_urls"] == ["https://a.vn/short"]
+    assert kept[0]["metadata"]["k"] == 1
+    assert dedup.dropped == 1
+
+
+def test_filter_drops_matches_of_known_articles():
+    text = _article(3)
+    dedup = NearDuplicateFilter(known=[("https://old.vn/a", simhash(text))])
+    kept = dedup.collapse([{"url": "https://new.vn/a", "content": text}], [simhash(text)])
+    assert kept == []
+    assert dedup.dropped == 1
+
+
+def test_upsert_merges_metadata_instead_of_keeping_the_old_value():
+    session = RecordingSession()
+    article = Article(url="https://a.vn/1", title="t", content_text="c", metadata_={"simhash": "00ff"})
+    asyncio.run(ArticleRepository(session).upsert_many([article]))
+    stmt = session.statements[0]
+    update = compile_pg(stmt).split("ON CONFLICT (url) DO UPDATE SET", 1)[1]
+    assert re.search(r"metadata = \(coalesce\(article\.metadata, .+?\) \|\| coalesce\(excluded\.metadata, ", update)
+    assert stmt.compile().params["metadata_m0"] == {"simhash": "00ff"}
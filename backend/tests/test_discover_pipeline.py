@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from core.agents.discover import agent as discover
+from settings import settings
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Fake crawl/select stages that record concurrency and call order."""
+    state = {
+        "crawling": 0,
+        "selecting": 0,
+        "max_crawling": 0,
+        "max_selecting": 0,
+        "overlap": False,
+        "events": [],
+    }
+
+    async def crawl_source(cfg):
+        url = cfg["url"]
+        state["crawling"] += 1
+        state["max_crawling"] = max(state["max_crawling"], state["crawling"])
+        state["overlap"] |= state["selecting"] > 0
+        await asyncio.sleep(0.01)
+        state["crawling"] -= 1
+        if url.endswith("broken"):
+            raise OSError("source down")
+        pages = [] if url.endswith("empty") else [{"url": f"{url}/a", "content": "c"}]
+        return pages, True, {f"{url}/rss": ('"e"', None)}
+
+    async def select_for_source(source_cfg, crawled):
+        state["selecting"] += 1
+        state["max_selecting"] = max(state["max_selecting"], state["selecting"])
+        state["overlap"] |= state["crawling"] > 0
+        await asyncio.sleep(0.02)
+        state["selecting"] -= 1
+        state["events"].append(("select", source_cfg["url"]))
+        return [dict(c, title="chọn") for c in crawled]
+
+    async def finish_incremental(url, fetched, validators):
+        state["events"].append(("finish", url))
+
+    monkeypatch.setattr(discover, "_crawl_source", crawl_source)
+    monkeypatch.setattr(discover, "_select_for_source", select_for_source)
+    monkeypatch.setattr(discover, "_finish_incremental", finish_incremental)
+    monkeypatch.setattr(settings, "discover_dedup_enabled", False)
+    monkeypatch.setattr(settings, "discover_batch_selection", False)
+    monkeypatch.setattr(settings, "discover_crawl_concurrency", 2)
+    monkeypatch.setattr(settings, "discover_select_concurrency", 1)
+    return state
+
+
+def _sources(monkeypatch, names):
+    # Entries that are not dicts with a URL are ignored
+    configs = [{"url": f"https://{n}.vn/{n}"} for n in names] + ["bad", {"url": ""}]
+    monkeypatch.setattr(settings, "discover_sources_config", configs)
+
+
+def test_sources_run_as_a_bounded_overlapping_pipeline(monkeypatch, pipeline):
+    _sources(monkeypatch, ["a", "b", "c", "d", "e"])
+    selected = asyncio.run(discover.discover_best_posts())
+    assert [s["url"] for s in selected] == [f"https://{n}.vn/{n}/a" for n in "abcde"]
+    assert pipeline["max_crawling"] == 2
+    assert pipeline["max_selecting"] == 1
+    # One source's selection runs while another is still crawling
+    assert pipeline["overlap"]
+
+
+def test_failing_source_is_skipped(monkeypatch, pipeline):
+    _sources(monkeypatch, ["a", "broken", "c"])
+    selected = asyncio.run(discover.discover_best_posts())
+    assert [s["url"] for s in selected] == ["https://a.vn/a/a", "https://c.vn/c/a"]
+
+
+def test_pages_are_marked_seen_only_after_selection(monkeypatch, pipeline):
+    _sources(monkeypatch, ["a", "empty"])
+    asyncio.run(discover.discover_best_posts())
+    events = pipeline["events"]
+    assert events.index(("select", "https://a.vn/a")) < events.index(("finish", "https://a.vn/a"))
+    # A source with nothing new still saves its feed validators
+    assert ("finish", "https://empty.vn/empty") in events
+    assert ("select", "https://empty.vn/empty") not in events
@@ -0,0 +1,62 @@
+import asyncio
+from uuid import uuid4
+
+from conftest import RecordingSession, compile_pg
+from core.repositories.article_embedding import ArticleEmbeddingRepository
+from core.services.embeddings import chunk_text
+
+
+def _paragraphs(n, length=300):
+    return "\n\n".join(f"P{i} " + "chữ " * (length // 4) for i in range(n))
+
+
+def test_short_text_is_one_chunk():
+    assert chunk_text("Một đoạn ngắn.\n\n![ảnh](https://i.vn/a.jpg)") == ["Một đoạn ngắn."]
+
+
+def test_chunks_respect_size_and_overlap_on_word_boundary():
+    chunks = chunk_text(_paragraphs(10), max_chars=700, overlap=100, max_chunks=20)
+    assert len(chunks) > 1
+    assert all(len(c) <= 700 + 100 for c in chunks)
+    for prev, nxt in zip(chunks, chunks[1:]):
+        head = nxt.split("\n", 1)[0]
+        # The overlap is a suffix of the previous chunk that starts on a word
+        assert prev.endswith(head)
+        assert len(head) <= 100
+        assert not head.startswith(" ")
+
+
+def test_long_paragraph_is_split_hard():
+    chunks = chunk_text("x" * 3200, max_chars=1000, overlap=0)
+    assert [len(c) for c in chunks] == [1000, 1000, 1000, 200]
+
+
+def test_max_chunks_caps_output():
+    assert len(chunk_text(_paragraphs(50), max_chars=400, max_chunks=3)) == 3
+
+
+def test_failures_back_off_exponentially_then_give_up():
+    session = RecordingSession()
+    repo = ArticleEmbeddingRepository(session)
+    asyncio.run(repo.record_failures("m", [uuid4()], error="boom", base_seconds=900, max_attempts=8))
+    sql = compile_pg(session.statements[0])
+    update = sql.split("DO UPDATE SET", 1)[1]
+    assert "attempts = (article_embedding_failure.attempts + " in update
+    assert "::INTEGER >= %(param_1)s::INTEGER) THEN NULL ELSE now() + make_interval(" in update
+    assert "power(%(power_2)s::INTEGER, article_embedding_failure.attempts)" in update
+    assert "make_interval(" in sql
+
+
+def test_no_text_failures_give_up_immediately():
+    session = RecordingSession()
+    repo = ArticleEmbeddingRepository(session)
+    asyncio.run(repo.record_failures("m", [uuid4()], error="empty", base_seconds=900, max_attempts=1))
+    values = session.statements[0].compile().params
+    assert values["retry_at_m0"] is None
+
+
+def test_unembedded_skips_articles_that_are_backing_off():
+    session = RecordingSession()
+    asyncio.run(ArticleEmbeddingRepository(session).list_unembedded("m", 10))
+    sql = compile_pg(session.statements[0])
+    assert "article_embedding_failure.retry_at IS NULL OR article_embedding_failure.retry_at > now()" in sql
@@ -0,0 +1,53 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from core.services import extraction_pool
+from core.services.extraction import extract_links
+from settings import settings
+
+
+def test_submit_after_shutdown_runs_inline():
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+    result = asyncio.run(extraction_pool._run(executor, lambda: "inline"))
+    assert result == "inline"
+
+
+def test_runs_on_executor_when_available():
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="extract-test")
+
+    def where():
+        import threading
+
+        return threading.current_thread().name
+
+    try:
+        name = asyncio.run(extraction_pool._run(executor, where))
+    finally:
+        executor.shutdown()
+    assert name.startswith("extract-test")
+
+
+def test_link_extraction_resolves_and_dedupes():
+    html = "<a href='/a#top'>a</a><a href='/a'>again</a><a href='mailto:x@y.vn'>m</a>"
+    assert extract_links(html, "https://example.com/list") == ["https://example.com/a"]
+
+
+def test_warm_executor_starts_the_shared_executor(monkeypatch):
+    monkeypatch.setattr(settings, "extraction_executor", "thread")
+    monkeypatch.setattr(settings, "extraction_workers", 2)
+    monkeypatch.setattr(extraction_pool, "_executor", None)
+    try:
+        asyncio.run(extraction_pool.warm_executor())
+        executor = extraction_pool.get_executor()
+        assert isinstance(executor, ThreadPoolExecutor)
+        assert executor._threads
+    finally:
+        extraction_pool.shutdown_executor()
+
+
+def test_warm_executor_is_a_no_op_inline(monkeypatch):
+    monkeypatch.setattr(settings, "extraction_executor", "inline")
+    monkeypatch.setattr(extraction_pool, "_executor", None)
+    asyncio.run(extraction_pool.warm_executor())
+    assert extraction_pool.get_executor() is None
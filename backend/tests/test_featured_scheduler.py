@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime, time
+
+import pytest
+from core.services import scheduler as scheduler_module
+from core.services.scheduler import FeaturedScheduler
+from settings import settings
+
+
+class _Result:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar(self):
+        return self._value
+
+
+class _Conn:
+    def __init__(self, engine):
+        self.engine = engine
+        self.closed = False
+        self.sql = []
+
+    async def execute(self, stmt, params=None):
+        self.sql.append(str(stmt))
+        if self.engine.fail_ping and str(stmt) == "SELECT 1":
+            raise OSError("connection lost")
+        return _Result(self.engine.lock_free)
+
+    async def commit(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+    async def invalidate(self):
+        pass
+
+
+class _Engine:
+    def __init__(self, lock_free):
+        self.lock_free = lock_free
+        self.fail_ping = False
+        self.conns = []
+
+    async def connect(self):
+        conn = _Conn(self)
+        self.conns.append(conn)
+        return conn
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    """Runs one scheduler tick and records which jobs it started."""
+    ran = []
+
+    async def due(self, now):
+        ran.append("due")
+        return None
+
+    async def embed(self):
+        ran.append("embed")
+
+    async def prune(self):
+        ran.append("prune")
+
+    async def stop_after_tick(seconds):
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(FeaturedScheduler, "_due", due)
+    monkeypatch.setattr(FeaturedScheduler, "_embed_pending", embed)
+    monkeypatch.setattr(FeaturedScheduler, "_prune_seen_urls", prune)
+    monkeypatch.setattr(scheduler_module.asyncio, "sleep", stop_after_tick)
+    monkeypatch.setattr(settings, "embedding_enabled", True)
+    return ran
+
+
+def _tick(scheduler):
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(scheduler._loop())
+
+
+def test_follower_skips_every_job(monkeypatch, jobs):
+    engine = _Engine(lock_free=False)
+    monkeypatch.setattr(scheduler_module, "async_engine", engine)
+    scheduler = FeaturedScheduler()
+    _tick(scheduler)
+    assert jobs == []
+    assert not scheduler.is_leader
+    # The connection that lost the election is not kept open
+    assert engine.conns[0].closed
+    assert "pg_try_advisory_lock" in engine.conns[0].sql[0]
+
+
+def test_leader_runs_jobs_and_keeps_its_connection(monkeypatch, jobs):
+    engine = _Engine(lock_free=True)
+    monkeypatch.setattr(scheduler_module, "async_engine", engine)
+    scheduler = FeaturedScheduler()
+    _tick(scheduler)
+    _tick(scheduler)
+    assert jobs == ["due", "embed", "prune"] * 2
+    assert scheduler.is_leader
+    # Leadership is checked on the held connection, not re-acquired
+    assert len(engine.conns) == 1
+    assert not engine.conns[0].closed
+
+
+def test_leader_that_loses_its_connection_runs_a_new_election(monkeypatch, jobs):
+    engine = _Engine(lock_free=True)
+    monkeypatch.setattr(scheduler_module, "async_engine", engine)
+    scheduler = FeaturedScheduler()
+    _tick(scheduler)
+    engine.fail_ping = True
+    engine.lock_free = False
+    _tick(scheduler)
+    assert not scheduler.is_leader
+    assert engine.conns[0].closed
+    assert jobs == ["due", "embed", "prune"]
+
+
+def test_disabled_scheduler_never_starts(monkeypatch):
+    monkeypatch.setattr(settings, "featured_scheduler_enabled", False)
+    scheduler = FeaturedScheduler()
+    scheduler.start()
+    assert scheduler._task is None
+
+
+def test_next_full_run_rolls_over_after_generate_time(monkeypatch):
+    monkeypatch.setattr(settings, "featured_generate_time", time(5, 30))
+    scheduler = FeaturedScheduler()
+    assert scheduler.next_full_run(datetime(2025, 10, 6, 5, 0)) == datetime(2025, 10, 6, 5, 30)
+    assert scheduler.next_full_run(datetime(2025, 10, 6, 5, 30)) == datetime(2025, 10, 7, 5, 30)
@@ -0,0 +1,138 @@
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from api.routers import featured as featured_router
+from core.services import featured
+from core.services.featured import FeaturedSnapshotCache, Snapshot, _encode, _etag
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from settings import settings
+
+_DAY = date(2025, 10, 6)
+_BODY = _encode({"items": [{"title": "Giá vàng"}], "categories": [], "keywords": []})
+
+
+class _FixedSnapshots:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    async def get(self, today, *, refresh=False):
+        return self.snapshot
+
+
+def _client(monkeypatch, snapshot):
+    snapshots = _FixedSnapshots(snapshot)
+    monkeypatch.setattr(featured_router, "get_featured_snapshots", lambda: snapshots)
+    app = FastAPI()
+    app.include_router(featured_router.router)
+    return TestClient(app)
+
+
+def test_snapshot_is_served_with_etag(monkeypatch):
+    snapshot = Snapshot(day=_DAY, body=_BODY, etag=_etag(_BODY))
+    response = _client(monkeypatch, snapshot).get("/api/featured")
+    assert response.status_code == 200
+    assert response.content == _BODY
+    assert response.headers["etag"] == snapshot.etag
+    assert f"max-age={settings.featured_cache_max_age_seconds}" in response.headers["cache-control"]
+
+
+@pytest.mark.parametrize("header", ["{etag}", 'W/{etag}', '"other", {etag}', "*"])
+def test_matching_if_none_match_gets_304(monkeypatch, header):
+    snapshot = Snapshot(day=_DAY, body=_BODY, etag=_etag(_BODY))
+    response = _client(monkeypatch, snapshot).get(
+        "/api/featured", headers={"If-None-Match": header.format(etag=snapshot.etag)}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == snapshot.etag
+
+
+def test_stale_etag_gets_the_body(monkeypatch):
+    snapshot = Snapshot(day=_DAY, body=_BODY, etag=_etag(_BODY))
+    client = _client(monkeypatch, snapshot)
+    response = client.get("/api/featured", headers={"If-None-Match": '"old"'})
+    assert response.status_code == 200
+    assert response.content == _BODY
+
+
+def test_missing_snapshot_returns_empty_payload_uncached(monkeypatch):
+    response = _client(monkeypatch, None).get("/api/featured")
+    assert response.json() == featured.EMPTY_PAYLOAD
+    assert response.headers["cache-control"] == "no-cache"
+    assert "etag" not in response.headers
+
+
+class _Db:
+    """Stands in for the snapshot and suggestion tables read by ``_reload``."""
+
+    def __init__(self, row, last_day):
+        self.row = row
+        self.last_day = last_day
+        self.reads = 0
+        self.published = []
+
+    def patch(self, monkeypatch, cache):
+        db = self
+
+        class _Session:
+            async def __aenter__(self):
+                db.reads += 1
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        class _Snapshots:
+            def __init__(self, session):
+                pass
+
+            async def get_latest(self, today):
+                return db.row
+
+        class _Suggestions:
+            def __init__(self, session):
+                pass
+
+            async def get_last_day(self):
+                return db.last_day
+
+        async def publish(day):
+            db.published.append(day)
+            return Snapshot(day=day, body=b"{}", etag='"new"')
+
+        monkeypatch.setattr(featured, "AsyncSessionLocal", _Session)
+        monkeypatch.setattr(featured, "FeaturedSnapshotRepository", _Snapshots)
+        monkeypatch.setattr(featured, "DailySuggestionRepository", _Suggestions)
+        monkeypatch.setattr(cache, "publish", publish)
+
+
+def test_cache_reuses_the_snapshot_within_its_ttl(monkeypatch):
+    monkeypatch.setattr(settings, "featured_snapshot_ttl_seconds", 60)
+    cache = FeaturedSnapshotCache()
+    row = SimpleNamespace(day=_DAY, payload={"items": []}, etag='"e"')
+    db = _Db(row, last_day=_DAY)
+    db.patch(monkeypatch, cache)
+
+    async def scenario():
+        first = await cache.get(_DAY)
+        second = await cache.get(_DAY)
+        forced = await cache.get(_DAY, refresh=True)
+        return first, second, forced
+
+    first, second, forced = asyncio.run(scenario())
+    assert first == second == forced == Snapshot(day=_DAY, body=b'{"items":[]}', etag='"e"')
+    assert db.reads == 2
+    assert db.published == []
+
+
+def test_cache_builds_a_missing_snapshot_for_the_latest_suggestions(monkeypatch):
+    cache = FeaturedSnapshotCache()
+    older = SimpleNamespace(day=date(2025, 10, 5), payload={}, etag='"old"')
+    db = _Db(older, last_day=_DAY)
+    db.patch(monkeypatch, cache)
+    snapshot = asyncio.run(cache.get(_DAY))
+    assert db.published == [_DAY]
+    assert snapshot.etag == '"new"'
@@ -0,0 +1,128 @@
+import asyncio
+import gzip
+from datetime import datetime, timezone
+
+import pytest
+from core.services.feeds import FeedEntry, FeedPoller, ParsedFeed, parse_feed
+
+_RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+<channel>
+  <atom:link href="https://vnexpress.net/rss" rel="self"/>
+  <item>
+    <title>Gi&#225; v&#224;ng &lt;b&gt;t&#259;ng&lt;/b&gt;</title>
+    <atom:link href="https://vnexpress.net/rss" rel="self"/>
+    <link>https://vnexpress.net/gia-vang.html</link>
+    <description><![CDATA[<a href="x"><img src="https://i.vnecdn.net/a.jpg"></a>M&#244; t&#7843;]]></description>
+    <pubDate>Mon, 06 Oct 2025 08:30:00 +0700</pubDate>
+  </item>
+  <item><title>No link</title></item>
+</channel>
+</rss>"""
+
+_ATOM = b"""<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <title>Atom entry</title>
+    <link rel="edit" href="https://example.com/edit/1"/>
+    <link href="https://example.com/1"/>
+    <summary>Short</summary>
+    <updated>2025-10-06T01:00:00Z</updated>
+  </entry>
+</feed>"""
+
+_URLSET = b"""<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+  <url>
+    <loc>https://example.com/a</loc>
+    <news:news><news:title>News title</news:title>
+      <news:publication_date>2025-10-06</news:publication_date></news:news>
+  </url>
+  <url><loc>https://example.com/b</loc><lastmod>2025-10-05T00:00:00+00:00</lastmod></url>
+</urlset>"""
+
+_INDEX = b"""<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/s1.xml</loc><lastmod>2025-10-01</lastmod></sitemap>
+  <sitemap><loc></loc></sitemap>
+</sitemapindex>"""
+
+
+def test_rss_items_skip_self_links_and_unlinked_items():
+    parsed = parse_feed(_RSS)
+    assert len(parsed.entries) == 1
+    entry = parsed.entries[0]
+    assert entry.url == "https://vnexpress.net/gia-vang.html"
+    assert entry.title == "Giá vàng tăng"
+    assert entry.description == "Mô tả"
+    assert entry.image_url == "https://i.vnecdn.net/a.jpg"
+    assert entry.published_at == datetime(2025, 10, 6, 1, 30, tzinfo=timezone.utc)
+
+
+def test_atom_uses_alternate_link():
+    (entry,) = parse_feed(_ATOM).entries
+    assert entry.url == "https://example.com/1"
+    assert entry.description == "Short"
+    assert entry.published_at == datetime(2025, 10, 6, 1, 0, tzinfo=timezone.utc)
+
+
+def test_urlset_reads_news_extension_and_lastmod():
+    a, b = parse_feed(_URLSET).entries
+    assert (a.url, a.title) == ("https://example.com/a", "News title")
+    assert a.published_at == datetime(2025, 10, 6, tzinfo=timezone.utc)
+    assert b.published_at == datetime(2025, 10, 5, tzinfo=timezone.utc)
+
+
+def test_sitemap_index_lists_children_and_gzip_is_accepted():
+    parsed = parse_feed(gzip.compress(_INDEX))
+    assert parsed.entries == []
+    assert parsed.sitemaps == [("https://example.com/s1.xml", datetime(2025, 10, 1, tzinfo=timezone.utc))]
+
+
+def test_malformed_xml_raises():
+    with pytest.raises(Exception):
+        parse_feed(b"<rss><channel>")
+
+
+def test_poll_source_merges_entries_and_returns_validators_unsaved(monkeypatch):
+    poller = FeedPoller(http=None, scheduler=None)
+    old = FeedEntry(url="https://example.com/old", published_at=datetime(2025, 1, 1, tzinfo=timezone.utc))
+    new = FeedEntry(url="https://example.com/new", published_at=datetime(2025, 6, 1, tzinfo=timezone.utc))
+    feeds = {
+        "https://example.com/rss": ParsedFeed(entries=[old], validators={"https://example.com/rss": ('"a"', None)}),
+        "https://example.com/sitemap.xml": ParsedFeed(
+            entries=[new, old], validators={"https://example.com/sitemap.xml": (None, "Mon")}
+        ),
+    }
+    saved = []
+
+    async def feed_urls(source_url, configured=()):
+        return list(feeds)
+
+    async def fetch(url):
+        return feeds.get(url)
+
+    async def save(validators):
+        saved.append(validators)
+
+    monkeypatch.setattr(poller, "feed_urls", feed_urls)
+    monkeypatch.setattr(poller, "fetch", fetch)
+    monkeypatch.setattr(poller, "save_validators", save)
+
+    polled = asyncio.run(poller.poll_source("https://example.com/"))
+    assert [e.url for e in polled.entries] == ["https://example.com/new", "https://example.com/old"]
+    assert set(polled.validators) == set(feeds)
+    # Saving waits until the caller has marked the entries seen
+    assert saved == []
+
+
+def test_poll_source_without_working_feeds_returns_none(monkeypatch):
+    poller = FeedPoller(http=None, scheduler=None)
+
+    async def feed_urls(source_url, configured=()):
+        return ["https://example.com/rss"]
+
+    async def fetch(url):
+        return None
+
+    monkeypatch.setattr(poller, "feed_urls", feed_urls)
+    monkeypatch.setattr(poller, "fetch", fetch)
+    assert asyncio.run(poller.poll_source("https://example.com/")) is None
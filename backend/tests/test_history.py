@@ -0,0 +1,90 @@
+import asyncio
+from uuid import uuid4
+
+from core.services.history import _with_summary, compact_history, compact_turn, render_turn, split_turns
+from pydantic_ai import BinaryContent
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from settings import settings
+
+_RESULTS = [
+    {"title": f"Bài {i}", "url": f"https://e.vn/{i}", "content": "nội dung " * 500} for i in range(3)
+]
+
+
+def _turn(question, tool_content=None):
+    messages = [ModelRequest(parts=[UserPromptPart(content=question)])]
+    if tool_content is not None:
+        messages += [
+            ModelResponse(parts=[ToolCallPart(tool_name="search", args={"q": question}, tool_call_id="c")]),
+            ModelRequest(parts=[ToolReturnPart(tool_name="search", content=tool_content, tool_call_id="c")]),
+        ]
+    messages.append(ModelResponse(parts=[TextPart(content=f"Trả lời: {question}")]))
+    return messages
+
+
+def test_split_turns_starts_at_user_prompts():
+    first, second = _turn("a", _RESULTS), _turn("b")
+    assert split_turns(first + second) == [first, second]
+    # Leading messages without a prompt still form a turn
+    orphan = [ModelResponse(parts=[TextPart(content="x")])]
+    assert split_turns(orphan + second) == [orphan, second]
+
+
+def test_compact_turn_keeps_references_and_shortens_text():
+    compacted = compact_turn(_turn("a", _RESULTS), max_chars=100)
+    tool_return = compacted[2].parts[0]
+    assert tool_return.content == {
+        "omitted": "content of earlier results",
+        "results": [{"title": r["title"], "url": r["url"]} for r in _RESULTS],
+    }
+    long_text = compact_turn(_turn("a", "x" * 250), max_chars=100)[2].parts[0].content
+    assert long_text == "x" * 100 + "… [150 chars omitted]"
+    assert compact_turn(_turn("a", "ngắn"), max_chars=100)[2].parts[0].content == "ngắn"
+
+
+def test_compact_turn_replaces_attachments_and_leaves_input_alone():
+    image = BinaryContent(data=b"\x89PNG", media_type="image/png")
+    turn = [ModelRequest(parts=[UserPromptPart(content=["Ảnh này là gì?", image])])]
+    compacted = compact_turn(turn, max_chars=100)
+    assert compacted[0].parts[0].content == ["Ảnh này là gì?", "[image/png attachment omitted]"]
+    assert turn[0].parts[0].content[1] is image
+
+
+def test_render_turn_is_a_plain_transcript():
+    text = render_turn(_turn("giá vàng", _RESULTS))
+    assert text.splitlines()[0] == "User: giá vàng"
+    assert 'Tool call search: {"q":"giá vàng"}' in text
+    assert "https://e.vn/0" in text and "nội dung" not in text
+    assert text.splitlines()[-1] == "Assistant: Trả lời: giá vàng"
+
+
+def test_summary_is_prepended_as_system_prompt():
+    messages = _turn("a")
+    merged = _with_summary(messages, "tóm tắt")
+    assert isinstance(merged[0].parts[0], SystemPromptPart)
+    assert merged[0].parts[1:] == messages[0].parts
+    only_response = [ModelResponse(parts=[TextPart(content="x")])]
+    assert len(_with_summary(only_response, "tóm tắt")) == 2
+
+
+def test_compact_history_keeps_recent_turns_verbatim(monkeypatch):
+    monkeypatch.setattr(settings, "history_summary_enabled", False)
+    monkeypatch.setattr(settings, "history_keep_turns", 2)
+    turns = [_turn(f"q{i}", _RESULTS) for i in range(4)]
+    messages = [m for t in turns for m in t]
+
+    compacted = asyncio.run(compact_history(uuid4(), messages))
+    assert len(compacted) == len(messages)
+    assert compacted[-8:] == turns[2] + turns[3]
+    assert "omitted" in compacted[2].parts[0].content
+
+    short = turns[0] + turns[1]
+    assert asyncio.run(compact_history(uuid4(), short)) is short
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from core.services.http_fetcher import DomainFetchPolicy, HttpFetcher, read_capped
+from settings import settings
+
+_PAGE = "<html><body>" + "<p>Nội dung bài viết.</p>" * 2000 + "</body></html>"
+
+
+def _app() -> web.Application:
+    async def page(request: web.Request) -> web.StreamResponse:
+        # Stream in small writes so one read() would return a partial buffer
+        response = web.StreamResponse(headers={"Content-Type": "text/html; charset=utf-8"})
+        await response.prepare(request)
+        body = _PAGE.encode("utf-8")
+        for start in range(0, len(body), 1000):
+            await response.write(body[start : start + 1000])
+            await asyncio.sleep(0)
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+    return app
+
+
+async def _with_server(fn):
+    server = TestServer(_app())
+    await server.start_server()
+    fetcher = HttpFetcher()
+    try:
+        return await fn(fetcher, str(server.make_url("/page")))
+    finally:
+        await fetcher.close()
+        await server.close()
+
+
+def test_read_capped_reads_whole_body_below_cap():
+    async def run(fetcher, url):
+        session = await fetcher.get_session()
+        async with session.get(url) as response:
+            return await read_capped(response, 10 * len(_PAGE.encode()))
+
+    body, truncated = asyncio.run(_with_server(run))
+    assert body == _PAGE.encode("utf-8")
+    assert not truncated
+
+
+def test_read_capped_stops_at_cap():
+    async def run(fetcher, url):
+        session = await fetcher.get_session()
+        async with session.get(url) as response:
+            return await read_capped(response, 5000)
+
+    body, truncated = asyncio.run(_with_server(run))
+    assert len(body) == 5000
+    assert truncated
+
+
+def test_fetch_html_returns_full_page(monkeypatch):
+    monkeypatch.setattr(settings, "http_fetch_max_bytes", 10 * len(_PAGE.encode()))
+    fetched = asyncio.run(_with_server(lambda f, url: f.fetch_html(url)))
+    assert fetched is not None
+    _, html, truncated = fetched
+    assert html == _PAGE
+    assert not truncated
+
+
+def test_truncated_page_escalates_instead_of_extracting(monkeypatch):
+    monkeypatch.setattr(settings, "http_fetch_max_bytes", 4096)
+
+    async def run(fetcher, url):
+        result = await fetcher.fetch(url)
+        return result, fetcher.policy.snapshot()
+
+    result, policy = asyncio.run(_with_server(run))
+    # None sends the caller to the browser; nothing partial can reach the cache
+    assert result is None
+    # A size cap says nothing about whether the host needs a browser
+    assert policy == {}
+
+
+@pytest.mark.parametrize("size", [0, 1, 999])
+def test_read_capped_exact_sizes(size):
+    class _Content:
+        async def iter_chunked(self, n):
+            data = b"x" * size
+            for start in range(0, len(data), 100):
+                yield data[start : start + 100]
+
+    class _Response:
+        content = _Content()
+
+    body, truncated = asyncio.run(read_capped(_Response(), 999))
+    assert len(body) == size
+    assert not truncated
+
+
+def test_domain_policy_is_bounded_and_keeps_recent_hosts(monkeypatch):
+    monkeypatch.setattr(settings, "http_fetch_domain_max_entries", 2)
+    policy = DomainFetchPolicy()
+    for _ in range(2):
+        policy.record("spa.vn", complete=False)
+    policy.record("a.vn", complete=True)
+    # Touching spa.vn keeps it; a.vn is now the least recently used
+    assert policy.needs_browser("spa.vn")
+    policy.record("b.vn", complete=True)
+    assert set(policy.snapshot()) == {"spa.vn", "b.vn"}
+    assert policy.needs_browser("spa.vn")
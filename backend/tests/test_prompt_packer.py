@@ -0,0 +1,61 @@
+import json
+
+from core.services.prompt_packer import estimate_tokens, lead_text, pack_items
+
+
+def _paragraphs(n, word="tin"):
+    return "\n\n".join(f"Đoạn {i}: " + " ".join([word] * 40) for i in range(n))
+
+
+def test_estimate_tokens_uses_chars_per_token():
+    assert estimate_tokens("") == 1
+    assert estimate_tokens("x" * 35) == 11
+
+
+def test_lead_text_strips_images_links_and_noise():
+    text = "![ảnh](https://i.vn/a.jpg)\n\n---\n\nXem [bài gốc](https://vn.vn/a_(b)) nhé.\n\n|  |"
+    assert lead_text(text, 1000) == "Xem bài gốc nhé."
+
+
+def test_lead_text_cuts_last_paragraph_with_ellipsis():
+    out = lead_text(_paragraphs(5), 300)
+    assert len(out) <= 300
+    assert out.endswith("…")
+    assert out.startswith("Đoạn 0:")
+
+
+def test_lead_text_drops_short_remainders():
+    first = "a" * 100
+    assert lead_text(f"{first}\n\n{'b' * 500}", 150) == first
+    assert lead_text("anything", 0) == ""
+
+
+def test_short_texts_are_kept_whole_and_long_ones_share_the_rest():
+    items = [
+        {"title": "ngắn", "content": "Một câu ngắn."},
+        {"title": "dài 1", "content": _paragraphs(30)},
+        {"title": "dài 2", "content": _paragraphs(30)},
+    ]
+    packed = pack_items(items, budget_tokens=800)
+    assert packed.dropped == 0
+    assert packed.tokens <= 800
+    assert packed.items[0]["content"] == "Một câu ngắn."
+    long_a, long_b = (len(i["content"]) for i in packed.items[1:])
+    assert abs(long_a - long_b) < 300
+    assert [i["title"] for i in packed.items] == ["ngắn", "dài 1", "dài 2"]
+    assert json.loads(packed.text) == packed.items
+    assert packed.tokens_saved > 0
+
+
+def test_trailing_items_are_dropped_when_minimum_does_not_fit():
+    items = [{"url": f"https://e.vn/{i}", "content": _paragraphs(10)} for i in range(10)]
+    packed = pack_items(items, budget_tokens=300, min_text_chars=200)
+    assert packed.dropped > 0
+    assert len(packed.items) == 10 - packed.dropped
+    assert [i["url"] for i in packed.items] == [f"https://e.vn/{i}" for i in range(len(packed.items))]
+
+
+def test_max_text_chars_caps_each_item():
+    items = [{"content": _paragraphs(10)}]
+    packed = pack_items(items, budget_tokens=10_000, max_text_chars=400)
+    assert len(packed.items[0]["content"]) <= 400
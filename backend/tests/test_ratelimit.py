@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from core.services import ratelimit
+from core.services.ratelimit import PostgresRateLimiter
+
+
+class _Result:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar(self):
+        return self._value
+
+
+class _Conn:
+    def __init__(self, engine):
+        self._engine = engine
+
+    async def execute(self, stmt, params):
+        self._engine.params.append(params)
+        return _Result(self._engine.wait)
+
+
+class _Begin:
+    def __init__(self, engine):
+        self._engine = engine
+
+    async def __aenter__(self):
+        if self._engine.fail:
+            raise OSError("database down")
+        return _Conn(self._engine)
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Engine:
+    def __init__(self, wait=0.0, fail=False):
+        self.wait = wait
+        self.fail = fail
+        self.params: list[dict] = []
+
+    def begin(self):
+        return _Begin(self)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded: list[float] = []
+
+    async def fake_sleep(seconds):
+        recorded.append(seconds)
+
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+@pytest.mark.parametrize(("burst", "tolerance"), [(1, 0.0), (2, 1.5), (4, 4.5)])
+def test_gcra_tolerance_allows_burst_minus_one_early_calls(burst, tolerance):
+    limiter = PostgresRateLimiter(_Engine(), "k", min_interval=1.5, burst=burst)
+    assert limiter.tolerance == tolerance
+
+
+def test_gcra_tolerance_never_negative():
+    assert PostgresRateLimiter(_Engine(), "k", min_interval=1.0, burst=0).tolerance == 0
+
+
+def test_acquire_sleeps_until_reserved_slot(sleeps):
+    engine = _Engine(wait=0.75)
+    limiter = PostgresRateLimiter(engine, "brave", min_interval=1.0, burst=3)
+    asyncio.run(limiter.acquire())
+    assert sleeps == [0.75]
+    assert engine.params == [{"key": "brave", "interval": 1.0, "tolerance": 2.0}]
+
+
+def test_acquire_does_not_sleep_for_slots_in_the_past(sleeps):
+    asyncio.run(PostgresRateLimiter(_Engine(wait=-0.5), "k", min_interval=1.0).acquire())
+    assert sleeps == []
+
+
+def test_acquire_proceeds_when_database_is_down(sleeps):
+    asyncio.run(PostgresRateLimiter(_Engine(fail=True), "k", min_interval=1.0).acquire())
+    assert sleeps == []
+
+
+def test_reservation_sql_is_gcra():
+    sql = str(PostgresRateLimiter._RESERVE_SQL)
+    # TAT advances by one interval from max(TAT, now); wait is TAT - now - interval - tolerance
+    assert "GREATEST(s.tat, clock_timestamp()) + :interval" in sql
+    assert "- :interval - :tolerance" in sql
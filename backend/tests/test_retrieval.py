@@ -0,0 +1,133 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from core.repositories import ArticleSearchHit
+from core.services import retrieval
+from core.services.retrieval import _local_query, retrieve, search_local
+from core.services.web_discovery import SearchResult
+from settings import settings
+
+
+def _hit(url, score=1.0):
+    return ArticleSearchHit(
+        id=uuid4(),
+        url=url,
+        title="Giá vàng",
+        image_url=None,
+        category=None,
+        published_at=None,
+        fetched_at=datetime(2025, 10, 6, tzinfo=timezone.utc),
+        lang="vi",
+        summary="Giá vàng tăng mạnh.",
+        score=score,
+    )
+
+
+def _web(url):
+    return SearchResult(
+        title="web",
+        url=url,
+        description="",
+        profile={},
+        language="vi",
+        family_friendly=True,
+        type="search_result",
+        subtype="generic",
+        is_live=False,
+        meta_url={},
+    )
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Local hits and web results served to ``retrieve``, with web calls recorded."""
+    state = {"local": [], "web": [], "web_calls": 0}
+
+    async def fake_local(query, count):
+        return state["local"][:count]
+
+    class _Web:
+        async def discover(self, query, count):
+            state["web_calls"] += 1
+            return state["web"]
+
+    monkeypatch.setattr(retrieval, "search_local", fake_local)
+    monkeypatch.setattr(retrieval, "WebDiscovery", _Web)
+    monkeypatch.setattr(settings, "retrieval_local_enabled", True)
+    monkeypatch.setattr(settings, "retrieval_min_results", 3)
+    return state
+
+
+def test_enough_local_hits_skip_web_search(sources):
+    sources["local"] = [_hit(f"https://a.vn/{i}") for i in range(3)]
+    results = asyncio.run(retrieve("giá vàng", count=5))
+    assert [r.url for r in results] == [f"https://a.vn/{i}" for i in range(3)]
+    assert results[0].subtype == "local_article"
+    assert sources["web_calls"] == 0
+
+
+def test_small_counts_need_only_count_local_hits(sources):
+    sources["local"] = [_hit("https://a.vn/1"), _hit("https://a.vn/2")]
+    asyncio.run(retrieve("giá vàng", count=2))
+    assert sources["web_calls"] == 0
+
+
+def test_too_few_local_hits_fall_back_to_web_with_local_first(sources):
+    sources["local"] = [_hit("https://a.vn/1"), _hit("https://a.vn/2")]
+    sources["web"] = [_web("https://a.vn/2"), _web("https://b.vn/1"), _web("https://b.vn/2")]
+    results = asyncio.run(retrieve("giá vàng", count=3))
+    assert sources["web_calls"] == 1
+    # Web duplicates of local hits are dropped and the list is cut to count
+    assert [r.url for r in results] == ["https://a.vn/1", "https://a.vn/2", "https://b.vn/1"]
+
+
+def test_disabled_local_search_goes_straight_to_web(sources, monkeypatch):
+    monkeypatch.setattr(settings, "retrieval_local_enabled", False)
+    sources["local"] = [_hit(f"https://a.vn/{i}") for i in range(5)]
+    sources["web"] = [_web("https://b.vn/1")]
+    assert [r.url for r in asyncio.run(retrieve("q", count=5))] == ["https://b.vn/1"]
+
+
+def test_search_local_drops_weak_matches_and_survives_errors(monkeypatch):
+    monkeypatch.setattr(settings, "retrieval_min_score", 0.5)
+    hits = [_hit("https://a.vn/strong", 0.9), _hit("https://a.vn/weak", 0.2)]
+    queries = []
+
+    class _Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    class _Repo:
+        def __init__(self, session):
+            pass
+
+        async def search(self, query, **kwargs):
+            queries.append(query)
+            if query == "lỗi":
+                raise OSError("database down")
+            return hits
+
+    monkeypatch.setattr(retrieval, "AsyncSessionLocal", _Session)
+    monkeypatch.setattr(retrieval, "ArticleRepository", _Repo)
+    assert [h.url for h in asyncio.run(search_local("tin tức giá vàng hôm nay", 5))] == [
+        "https://a.vn/strong"
+    ]
+    assert queries == ["giá vàng"]
+    assert asyncio.run(search_local("lỗi", 5)) == []
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("tin tức về bão Yagi mới nhất", "bão Yagi"),
+        ("latest news about VinFast", "VinFast"),
+        ("hôm nay", "hôm nay"),
+    ],
+)
+def test_local_query_strips_recency_phrases(query, expected):
+    assert _local_query(query) == expected
@@ -0,0 +1,107 @@
+import asyncio
+
+from conftest import RecordingSession, compile_pg
+from core.services import seen_urls
+from core.services.seen_urls import BloomFilter
+from core.utils import normalize_url
+from settings import settings
+
+
+def test_added_items_are_always_found():
+    bloom = BloomFilter(capacity=1000)
+    urls = [f"https://vnexpress.net/tin-{i}.html" for i in range(1000)]
+    for u in urls:
+        bloom.add(u)
+    assert all(u in bloom for u in urls)
+    assert bloom.count == 1000
+
+
+def test_false_positive_rate_stays_near_target():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    for i in range(5000):
+        bloom.add(f"seen-{i}")
+    false_positives = sum(f"unseen-{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+
+
+def test_sizing_follows_standard_formula():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.001)
+    # m = -n ln p / (ln 2)^2 ~ 14.4 bits per item, k = m/n ln 2 ~ 10
+    assert 143_000 < bloom.n_bits < 144_500
+    assert bloom.n_hashes == 10
+    assert len(bloom._bits) == (bloom.n_bits + 7) // 8
+
+
+def test_tiny_capacity_is_usable():
+    bloom = BloomFilter(capacity=0)
+    bloom.add("x")
+    assert "x" in bloom
+
+
+class _Stream:
+    def __init__(self, rows):
+        self._rows = iter(rows)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._rows)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+class _KnownUrlSession:
+    """Serves counts and streamed URLs the way ``SeenUrlRepository`` reads them."""
+
+    def __init__(self, articles, discovered):
+        self.tables = [articles, discovered]
+        self.streamed = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def scalar(self, stmt):
+        return len(self.tables[0]) if "FROM article" in str(stmt) else len(self.tables[1])
+
+    async def stream_scalars(self, stmt):
+        self.streamed.append(stmt)
+        return _Stream(self.tables[len(self.streamed) - 1])
+
+
+def test_index_loads_streamed_urls(monkeypatch):
+    session = _KnownUrlSession(["https://a.vn/1?utm_source=x"], ["https://a.vn/2"])
+    monkeypatch.setattr(seen_urls, "AsyncSessionLocal", lambda: session)
+    bloom = asyncio.run(seen_urls.SeenUrlIndex()._ensure_loaded())
+    assert bloom.count == 2
+    assert normalize_url("https://a.vn/1") in bloom
+    assert normalize_url("https://a.vn/2") in bloom
+    # Read through server-side cursors in batches, not one list
+    assert all(s.get_execution_options()["yield_per"] == 5000 for s in session.streamed)
+
+
+def test_prune_deletes_by_first_seen(monkeypatch):
+    recording = RecordingSession()
+    recording.commit = lambda: asyncio.sleep(0)
+
+    class _Ctx:
+        async def __aenter__(self):
+            return recording
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(seen_urls, "AsyncSessionLocal", _Ctx)
+    monkeypatch.setattr(settings, "discover_seen_retention_days", 30)
+    asyncio.run(seen_urls.prune_seen_urls())
+    sql = compile_pg(recording.statements[0])
+    assert sql.startswith("DELETE FROM discovered_url WHERE discovered_url.first_seen_at < ")
+
+    monkeypatch.setattr(settings, "discover_seen_retention_days", 0)
+    recording.statements.clear()
+    asyncio.run(seen_urls.prune_seen_urls())
+    assert recording.statements == []
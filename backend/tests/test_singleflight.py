@@ -0,0 +1,109 @@
+import asyncio
+
+from core.services.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = 0
+        release = asyncio.Event()
+
+        async def op():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        waiters = [asyncio.create_task(flight.do("k", op)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+        return calls, results, flight.stats()
+
+    calls, results, stats = asyncio.run(scenario())
+    assert calls == 1
+    assert results == ["result"] * 5
+    assert stats == {"executed": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_sequential_calls_run_again():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def op():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        return [await flight.do("k", op) for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [1, 2]
+
+
+def test_errors_reach_every_waiter():
+    async def scenario():
+        flight = SingleFlight("test")
+
+        async def op():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        return await asyncio.gather(
+            flight.do("k", op), flight.do("k", op), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_cancelled_waiter_leaves_shared_task_running():
+    async def scenario():
+        flight = SingleFlight("test")
+        finished = asyncio.Event()
+
+        async def op():
+            await asyncio.sleep(0.01)
+            finished.set()
+            return "done"
+
+        waiter = asyncio.create_task(flight.do("k", op))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.wait_for(finished.wait(), timeout=1)
+        return finished.is_set()
+
+    assert asyncio.run(scenario())
+
+
+def test_cancel_abandoned_stops_work_once_last_waiter_leaves():
+    async def scenario():
+        flight = SingleFlight("test", cancel_abandoned=True)
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def op():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        first = asyncio.create_task(flight.do("k", op))
+        second = asyncio.create_task(flight.do("k", op))
+        await started.wait()
+
+        first.cancel()
+        await asyncio.sleep(0.01)
+        still_running = not cancelled.is_set()
+
+        second.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        return still_running, flight.stats()["in_flight"]
+
+    still_running, in_flight = asyncio.run(scenario())
+    # One waiter leaving keeps the work alive for the other
+    assert still_running
+    assert in_flight == 0
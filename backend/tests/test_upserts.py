@@ -0,0 +1,67 @@
+import asyncio
+from datetime import date
+from uuid import uuid4
+
+from conftest import RecordingSession, compile_pg
+from core.models import Article, DailySuggestion
+from core.repositories import ArticleRepository, DailySuggestionRepository
+
+
+def _article(url, title="t"):
+    return Article(url=url, title=title, content_text="c")
+
+
+def _upsert_articles(articles):
+    session = RecordingSession()
+    asyncio.run(ArticleRepository(session).upsert_many(articles))
+    return session.statements
+
+
+def test_article_upsert_is_one_statement_filling_empty_fields():
+    (stmt,) = _upsert_articles([_article("https://a.vn/1"), _article("https://a.vn/2")])
+    sql = compile_pg(stmt)
+    update = sql.split("ON CONFLICT (url) DO UPDATE SET", 1)[1]
+    for column in ("title", "author", "image_url", "content_text"):
+        assert f"{column} = coalesce(nullif(article.{column}, " in update
+        assert f"), excluded.{column})" in update
+    assert "published_at = coalesce(article.published_at, excluded.published_at)" in update
+    assert "RETURNING article.id" in update
+    # Only filled columns change on conflict
+    assert "category =" not in update and "fetched_at =" not in update
+
+
+def test_article_upsert_keeps_first_item_per_url():
+    (stmt,) = _upsert_articles(
+        [
+            _article("https://a.vn/1", "first"),
+            _article("https://a.vn/1", "second"),
+            _article("https://a.vn/2"),
+        ]
+    )
+    params = stmt.compile().params
+    assert params["title_m0"] == "first"
+    assert params["url_m1"] == "https://a.vn/2"
+    assert "url_m2" not in params
+
+
+def test_empty_article_upsert_skips_the_database():
+    assert _upsert_articles([]) == []
+
+
+def test_suggestion_upsert_keeps_best_rank_and_first_reason():
+    day, article_id = date(2025, 10, 6), uuid4()
+    suggestions = [
+        DailySuggestion(suggestion_date=day, article_id=article_id, rank=5, reason=None),
+        DailySuggestion(suggestion_date=day, article_id=article_id, rank=2, reason="hot"),
+        DailySuggestion(suggestion_date=day, article_id=uuid4(), rank=3, reason="x"),
+    ]
+    session = RecordingSession()
+    asyncio.run(DailySuggestionRepository(session).upsert_many(suggestions))
+    (stmt,) = session.statements
+    params = stmt.compile().params
+    assert (params["rank_m0"], params["reason_m0"]) == (2, "hot")
+    assert "rank_m2" not in params
+
+    update = compile_pg(stmt).split("ON CONFLICT (suggestion_date, article_id) DO UPDATE SET", 1)[1]
+    assert "rank = least(daily_suggestion.rank, excluded.rank)" in update
+    assert "reason = coalesce(daily_suggestion.reason, excluded.reason)" in update
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from core.services.web_discovery import WebDiscovery
+from settings import settings
+
+
+@pytest.fixture
+def svc(monkeypatch):
+    monkeypatch.setattr(settings, "crawl_cache_enabled", False)
+    monkeypatch.setattr(settings, "crawl_respect_robots", False)
+    monkeypatch.setattr(settings, "crawl_default_delay_seconds", 0.0)
+    monkeypatch.setattr(WebDiscovery, "_instance", None)
+    yield WebDiscovery()
+
+
+def _collect(svc, urls, **kwargs):
+    async def run():
+        return [item async for item in svc.crawl_iter(urls, **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_timed_out_crawl_is_cancelled_and_frees_its_host_slot(svc, monkeypatch):
+    cancelled = []
+
+    async def hanging_fetch(url, **kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+
+    monkeypatch.setattr(svc._http, "fetch", hanging_fetch)
+    url = "https://example.com/a"
+
+    async def run():
+        results = [
+            item async for item in svc.crawl_iter([url], per_url_timeout=0.05, category="news")
+        ]
+        # Checked before asyncio.run tears down leftover tasks
+        await asyncio.sleep(0.01)
+        state = svc._scheduler._hosts["example.com"]
+        return results, list(cancelled), state.semaphore._value
+
+    results, cancelled_before_exit, available = asyncio.run(run())
+
+    assert results[0]["metadata"] == {"error": "timeout"}
+    assert results[0]["category"] == "news"
+    assert cancelled_before_exit == [url]
+    assert available == settings.crawl_per_host_concurrency
+
+
+def test_zero_timeout_is_honoured(svc, monkeypatch):
+    async def slow_crawl(url, **kwargs):
+        await asyncio.sleep(1)
+        return []
+
+    monkeypatch.setattr(svc, "crawl_one", slow_crawl)
+    results = _collect(svc, ["https://example.com/a"], per_url_timeout=0)
+    assert results[0]["metadata"] == {"error": "timeout"}
+
+
+def test_failures_and_stragglers_are_yielded_with_category(svc, monkeypatch):
+    async def crawl(url, **kwargs):
+        if url.endswith("/boom"):
+            raise RuntimeError("boom")
+        if url.endswith("/slow"):
+            await asyncio.sleep(10)
+        return [{"url": url, "title": "t", "description": "", "content": "c",
+                 "image_url": "", "metadata": {}}]
+
+    monkeypatch.setattr(svc, "crawl_one", crawl)
+    results = _collect(
+        svc,
+        ["https://a.example/ok", "https://b.example/boom", "https://c.example/slow"],
+        per_url_timeout=5,
+        deadline=0.1,
+        category="tech",
+    )
+    by_url = {r["url"]: r for r in results}
+    assert by_url["https://a.example/ok"]["content"] == "c"
+    assert by_url["https://b.example/boom"]["metadata"] == {"error": "error"}
+    assert by_url["https://c.example/slow"]["metadata"] == {"error": "deadline_exceeded"}
+    assert {r["category"] for r in results} == {"tech"}